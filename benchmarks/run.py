@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Time the data-pipeline hot paths on synthetic corpora at several sizes.
+
+Everything runs offline against generated data (benchmarks/synthetic.py) in
+a scratch directory. Results go to benchmarks/results/<commit>.json so runs
+from different commits can be diffed or plotted against episode count.
+
+    python benchmarks/run.py                       # 200, 2000, 20000 episodes
+    python benchmarks/run.py --sizes 200 --only find_matches rss_parse
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import consolidate_episodes
+import import_podcasts
+from import_rss_durations import iter_rss_episodes
+from match_youtube_podcasts import find_matches
+from title_dates import extract_date
+
+import synthetic
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+SIZES = (200, 2000, 20000)
+
+# The exhaustive consolidate scores every pair; past this it runs for hours
+EXHAUSTIVE_MAX = 2000
+
+def fresh_copy(template: Path, scratch: Path) -> Path:
+    """A throwaway copy of a database, so every run starts from the same state."""
+    path = scratch / f"run-{template.name}"
+    shutil.copyfile(template, path)
+    return path
+
+def bench_find_matches(corpus: dict, scratch: Path) -> dict:
+    videos = json.loads(corpus["youtube"].read_text())
+    podcasts = json.loads(corpus["podcasts"].read_text())
+    return {
+        "find_matches[greedy]": (None, lambda: find_matches(videos, podcasts, greedy=True)),
+        "find_matches[optimal]": (None, lambda: find_matches(videos, podcasts)),
+    }
+
+def bench_consolidate(corpus: dict, scratch: Path) -> dict:
+    def setup():
+        consolidate_episodes.DB_PATH = str(fresh_copy(corpus["archive_db"], scratch))
+    benchmarks = {"consolidate": (setup, consolidate_episodes.consolidate)}
+    if corpus["n"] <= EXHAUSTIVE_MAX:
+        benchmarks["consolidate[exhaustive]"] = (setup, lambda: consolidate_episodes.consolidate(exhaustive=True))
+    return benchmarks
+
+def bench_import_podcasts(corpus: dict, scratch: Path) -> dict:
+    empty = scratch / "empty.db"
+    synthetic.empty_archive_db(empty)
+    target = {}
+
+    def setup():
+        target["path"] = fresh_copy(empty, scratch)
+
+    return {
+        "import_podcasts": (setup, lambda: import_podcasts.import_podcasts(corpus["source_db"], target["path"])),
+        "import_podcasts[bulk]": (setup, lambda: import_podcasts.import_podcasts(
+            corpus["source_db"], target["path"], bulk=True)),
+    }
+
+def bench_extract_date(corpus: dict, scratch: Path) -> dict:
+    titles = synthetic.date_titles(corpus["n"])
+    return {
+        "extract_date[fix_dates]": (None, lambda: [extract_date(t, estimate=False) for t in titles]),
+        "extract_date[fix_dates_v2]": (None, lambda: [extract_date(t, default_season=2023) for t in titles]),
+    }
+
+def bench_rss_parse(corpus: dict, scratch: Path) -> dict:
+    return {
+        "rss_parse": (None, lambda: sum(1 for _ in iter_rss_episodes(corpus["rss"]))),
+        "rss_parse[gzip]": (None, lambda: sum(1 for _ in iter_rss_episodes(corpus["rss_gz"]))),
+    }
+
+BENCHMARKS = {
+    "find_matches": bench_find_matches,
+    "consolidate": bench_consolidate,
+    "import_podcasts": bench_import_podcasts,
+    "extract_date": bench_extract_date,
+    "rss_parse": bench_rss_parse,
+}
+
+def measure(setup, func, repeat: int) -> dict:
+    """Wall-clock seconds per run; setup and the scripts' own printing are untimed/silenced."""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "runs": timings,
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES),
+                        help=f"episode counts to generate (default: {' '.join(map(str, SIZES))})")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run just these benchmarks")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per benchmark (default: 3)")
+    parser.add_argument("--words", type=int, default=300, help="words per synthetic transcript (default: 300)")
+    parser.add_argument("--out", type=Path, help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--keep", type=Path, help="write the corpora here and leave them behind")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "words_per_transcript": args.words,
+        "results": [],
+    }
+
+    selected = args.only or list(BENCHMARKS)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = args.keep or Path(tmp)
+        for n in args.sizes:
+            print(f"Generating {n} episodes...")
+            started = time.monotonic()
+            corpus = synthetic.generate(base / str(n), n, args.words)
+            corpus["n"] = n
+            print(f"   took {time.monotonic() - started:.1f}s")
+
+            scratch = Path(tmp) / f"scratch-{n}"
+            scratch.mkdir()
+            for group in selected:
+                for name, (setup, func) in BENCHMARKS[group](corpus, scratch).items():
+                    timing = measure(setup, func, args.repeat)
+                    report["results"].append({"benchmark": name, "size": n, **timing})
+                    print(f"   {name:<28}{n:>7}{timing['median'] * 1000:>12.1f}ms")
+
+    out = args.out or RESULTS_DIR / f"{commit}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+    print(f"\n✅ {len(report['results'])} timings written to {out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""Synthetic Swolecast-shaped corpora for the benchmarks.
+
+Everything is generated from a seeded random.Random, so a given size and seed
+always produce the same files. The shapes follow what the scripts read:
+youtube_metadata.json, podcasts_with_duration.json, the archive database
+(episodes / transcripts / transcripts_fts), the source podcast_episodes
+database and the Acast RSS feed.
+"""
+
+import gzip
+import json
+import random
+import sqlite3
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+WORDS = (
+    "the a and of to is that it in you we this he was for on are with they be at one "
+    "have from or had by not but what all were when your can said there use an each "
+    "which she do how their if will up other about out many then them these so some "
+    "her would make like him into time has look two more go see no way could people "
+    "my than first been who now find long down day did get come made may part yeah "
+    "guy think know really right gonna week start sit upside floor ceiling target"
+).split()
+
+PLAYERS = [
+    "Justin Jefferson", "CeeDee Lamb", "Bijan Robinson", "Christian McCaffrey",
+    "Puka Nacua", "Ja'Marr Chase", "Breece Hall", "Jahmyr Gibbs", "Saquon Barkley",
+    "Josh Allen", "Lamar Jackson", "Travis Kelce", "Tyreek Hill", "Garrett Wilson",
+    "Drake London", "Sam LaPorta", "Patrick Mahomes", "Amon-Ra St. Brown",
+]
+
+TEAMS = ["Chiefs", "Bills", "Eagles", "Niners", "Cowboys", "Lions", "Ravens", "Bengals", "Dolphins", "Jets"]
+
+SHOWS = ["Waiver Wire", "Start Sit", "DFS Picks", "Rankings", "Trade Talk", "Best Ball Draft", "NFL Draft Review"]
+
+MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+               "August", "September", "October", "November", "December"]
+
+ARCHIVE_SCHEMA = """
+CREATE TABLE episodes (
+    id TEXT PRIMARY KEY, title TEXT NOT NULL, description TEXT, published_at TEXT,
+    duration_seconds INTEGER, view_count INTEGER DEFAULT 0, like_count INTEGER DEFAULT 0,
+    comment_count INTEGER DEFAULT 0, thumbnail_url TEXT, youtube_url TEXT,
+    has_transcript INTEGER DEFAULT 0, transcript_word_count INTEGER DEFAULT 0,
+    created_at TEXT, updated_at TEXT
+);
+CREATE TABLE transcripts (episode_id TEXT PRIMARY KEY, content TEXT NOT NULL, word_count INTEGER);
+CREATE VIRTUAL TABLE transcripts_fts USING fts5(episode_id, content, tokenize='porter unicode61');
+"""
+
+SOURCE_SCHEMA = """
+CREATE TABLE podcast_episodes (
+    id TEXT PRIMARY KEY, title TEXT, pub_date TEXT, duration_seconds INTEGER,
+    word_count INTEGER, transcript TEXT, players TEXT, topics TEXT, summary TEXT
+);
+"""
+
+
+def transcript(rng: random.Random, words: int) -> str:
+    """Filler speech with player and team names sprinkled in."""
+    out = []
+    for _ in range(words):
+        x = rng.random()
+        if x < 0.01:
+            out.append(rng.choice(PLAYERS))
+        elif x < 0.015:
+            out.append(rng.choice(TEAMS))
+        else:
+            out.append(rng.choice(WORDS))
+        if rng.random() < 0.07:
+            out[-1] += rng.choice([".", ".", "?", "!"])
+    return " ".join(out)
+
+
+def episode_date(rng: random.Random, i: int, n: int) -> datetime:
+    """Roughly weekly episodes spread over six seasons."""
+    base = datetime(2019, 8, 1)
+    return base + timedelta(days=i * 6 * 365 // max(n, 1) + rng.randint(0, 3), hours=rng.randint(8, 22))
+
+
+def episode_title(rng: random.Random, day: datetime) -> str:
+    return (f"Swolecast, {MONTH_NAMES[day.month - 1]} {day.day}, {day.year} - "
+            f"Week {rng.randint(1, 18)} {rng.choice(PLAYERS)} {rng.choice(SHOWS)}")
+
+
+def match_inputs(n: int, seed: int = 1) -> tuple[list, list]:
+    """youtube_metadata.json and podcasts_with_duration.json records."""
+    rng = random.Random(seed)
+    videos, podcasts = [], []
+    for i in range(n):
+        day = episode_date(rng, i, n)
+        duration = rng.choice([None, rng.randint(1800, 9000)])
+        videos.append({
+            "id": f"yt{i:09d}",
+            "title": episode_title(rng, day),
+            "upload_date": None if rng.random() < 0.03 else day.strftime("%Y%m%d"),
+            "duration": duration,
+            "channel": "Swolecast",
+            "view_count": rng.randint(50, 5000),
+            "url": f"https://www.youtube.com/watch?v=yt{i:09d}",
+        })
+        pod_day = day + timedelta(days=rng.randint(-16, 16), hours=rng.randint(0, 23))
+        fmt = rng.choice(["%a, %d %b %Y %H:%M:%S GMT", "%Y-%m-%d"])
+        podcasts.append({
+            "id": f"{rng.getrandbits(96):024x}",
+            "title": episode_title(rng, pod_day),
+            "pub_date": None if rng.random() < 0.03 else pod_day.strftime(fmt),
+            "duration_seconds": (duration or 3600) + rng.randint(-200, 200),
+        })
+    rng.shuffle(podcasts)
+    return videos, podcasts
+
+
+def archive_db(path: Path, n: int, words: int = 300, seed: int = 1):
+    """
+    The app database as the import leaves it: podcast episodes (about 5%
+    imported twice) plus YouTube copies of 60% of them for consolidate to merge.
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(ARCHIVE_SCHEMA)
+    episodes, transcripts = [], []
+    for i in range(n):
+        day = episode_date(rng, i, n)
+        title = episode_title(rng, day)
+        text = transcript(rng, words)
+        pod_id = f"podcast-{i:06d}"
+        episodes.append((pod_id, title, "", day.date().isoformat(), rng.randint(2400, 9000), None, words))
+        transcripts.append((pod_id, text, words))
+        if rng.random() < 0.05:
+            dup_id = f"podcast-dup{i:06d}"
+            episodes.append((dup_id, title, "", day.date().isoformat(), None, None, words))
+            transcripts.append((dup_id, text, words))
+        if rng.random() < 0.6:
+            yt_id = f"yt{i:09d}"
+            yt_title = (title.replace("Swolecast, ", "Swolecast LIVE: ") if rng.random() < 0.5
+                        else f"{title} | Fantasy Football")
+            published = day.date().isoformat() if rng.random() < 0.7 else None
+            episodes.append((yt_id, yt_title, "", published, None,
+                             f"https://www.youtube.com/watch?v={yt_id}", words))
+            transcripts.append((yt_id, text, words))
+    conn.executemany("""
+        INSERT INTO episodes (id, title, description, published_at, duration_seconds,
+                              youtube_url, has_transcript, transcript_word_count)
+        VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+    """, episodes)
+    conn.executemany("INSERT INTO transcripts VALUES (?, ?, ?)", transcripts)
+    conn.execute("INSERT INTO transcripts_fts (episode_id, content) SELECT episode_id, content FROM transcripts")
+    conn.commit()
+    conn.close()
+
+
+def empty_archive_db(path: Path):
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(ARCHIVE_SCHEMA)
+    conn.close()
+
+
+def source_db(path: Path, n: int, words: int = 300, seed: int = 3):
+    """The cleaned podcast database import_podcasts.py reads from."""
+    rng = random.Random(seed)
+    path = Path(path)
+    path.unlink(missing_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SOURCE_SCHEMA)
+    rows = []
+    for i in range(n):
+        day = episode_date(rng, i, n)
+        rows.append((
+            f"{rng.getrandbits(96):024x}", episode_title(rng, day), day.date().isoformat(),
+            rng.randint(2400, 9000), words, transcript(rng, words),
+            json.dumps(rng.sample(PLAYERS, 3)), json.dumps(rng.sample(SHOWS, 2)), "summary",
+        ))
+    conn.executemany("INSERT INTO podcast_episodes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def rss_feed(path: Path, n: int, description_words: int = 120, seed: int = 5, compress: bool = False):
+    """An Acast-style feed, newest item first."""
+    rng = random.Random(seed)
+    items = []
+    for i in reversed(range(n)):
+        day = episode_date(rng, i, n)
+        episode_id = f"{rng.getrandbits(96):024x}"
+        duration = rng.randint(1800, 9000)
+        items.append(
+            f"<item><title>{episode_title(rng, day)}</title>"
+            f"<description>{transcript(rng, description_words)}</description>"
+            f"<pubDate>{day.strftime('%a, %d %b %Y %H:%M:%S GMT')}</pubDate>"
+            f"<itunes:duration>{duration // 3600}:{duration % 3600 // 60:02d}:{duration % 60:02d}</itunes:duration>"
+            f'<enclosure url="https://sphinx.acast.com/p/open/s/swolecast/e/{episode_id}/media.mp3" '
+            f'type="audio/mpeg"/></item>'
+        )
+    body = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd">'
+        f"<channel><title>Swolecast</title>{''.join(items)}</channel></rss>"
+    ).encode("utf-8")
+    opener = gzip.open if compress else open
+    with opener(path, "wb") as f:
+        f.write(body)
+
+
+def date_titles(n: int, seed: int = 7) -> list:
+    """Titles in every shape the date extractors handle, plus ones they can't."""
+    rng = random.Random(seed)
+    titles = []
+    for i in range(n):
+        day = date(2019, 1, 1) + timedelta(days=rng.randint(0, 6 * 365))
+        kind = rng.randrange(6)
+        if kind == 0:
+            titles.append(f"Swolecast, {MONTH_NAMES[day.month - 1]} {day.day}, {day.year} - {rng.choice(SHOWS)}")
+        elif kind == 1:
+            titles.append(f"Swolecast {day.isoformat()} {rng.choice(PLAYERS)}")
+        elif kind == 2:
+            titles.append(f"{day.year} Week {rng.randint(1, 18)} {rng.choice(SHOWS)} LIVE")
+        elif kind == 3:
+            titles.append(f"{day.year} NFL Draft Review with {rng.choice(PLAYERS)}")
+        elif kind == 4:
+            titles.append(f"{rng.choice(['Wild Card', 'Divisional', 'Super Bowl'])} Preview {day.year}")
+        else:
+            titles.append(f"{rng.choice(PLAYERS)} {rng.choice(SHOWS)} Q&A")
+    return titles
+
+
+def generate(out_dir: Path, n: int, words: int = 300) -> dict:
+    """Write the whole corpus for one size into out_dir; returns the paths."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "youtube": out_dir / "youtube_metadata.json",
+        "podcasts": out_dir / "podcasts_with_duration.json",
+        "archive_db": out_dir / "swolecast.db",
+        "source_db": out_dir / "source.db",
+        "rss": out_dir / "rss.xml",
+        "rss_gz": out_dir / "rss.xml.gz",
+    }
+    videos, podcasts = match_inputs(n)
+    paths["youtube"].write_text(json.dumps(videos))
+    paths["podcasts"].write_text(json.dumps(podcasts))
+    archive_db(paths["archive_db"], n, words)
+    source_db(paths["source_db"], n, words)
+    rss_feed(paths["rss"], n)
+    rss_feed(paths["rss_gz"], n, compress=True)
+    return paths
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write a synthetic corpus to disk.")
+    parser.add_argument("out_dir", type=Path)
+    parser.add_argument("-n", type=int, default=2000, help="episodes (default: 2000)")
+    parser.add_argument("--words", type=int, default=300, help="words per transcript (default: 300)")
+    args = parser.parse_args()
+    for name, path in generate(args.out_dir, args.n, args.words).items():
+        print(f"   {name}: {path} ({path.stat().st_size / 1e6:.1f}MB)")
@@ -4,40 +4,182 @@ Consolidate podcast and YouTube episodes into single entries.
 Podcasts are the source of truth for dates; YouTube provides video URLs.
 """
 
+import argparse
+import re
 import sqlite3
+import sys
+from collections import defaultdict
 from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from fts_schema import fts_is_external, has_fts
+from instrumentation import phase, profiled
 
 DB_PATH = "data/swolecast.db"
 
-def similarity(a, b):
-    """Calculate string similarity ratio."""
-    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+WEEK_PATTERN = re.compile(r'week\s*(\d+)')
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
 
-def consolidate():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+# Words on nearly every title say nothing about which episode it is
+STOPWORDS = {
+    'swolecast', 'live', 'the', 'a', 'an', 'and', 'of', 'to', 'in', 'on', 'for',
+    'with', 'vs', 'fantasy', 'football', 'nfl', 'episode', 'show', 'podcast',
+}
+
+# Similarity is only computed for this many best-blocked podcasts per video
+TOP_K = 20
+
+# Title similarity plus date/week boosts must exceed this to merge
+MATCH_THRESHOLD = 0.6
+
+# Transcripts at least this similar (scripts/near_duplicates.py) are one episode
+NEAR_DUPLICATE_JACCARD = 0.7
+
+def title_blocks(title: str, published_at: str | None) -> tuple[set, str | None, str | None]:
+    """
+    Blocking keys for a title: its tokens, their trigrams, the publish day and
+    week number. Returns (blocks, day, week).
+    """
+    title_lower = title.lower()
+    blocks = set()
+    for token in TOKEN_PATTERN.findall(title_lower):
+        if token in STOPWORDS:
+            continue
+        blocks.add(f"t:{token}")
+        padded = f" {token} "
+        blocks.update(f"g:{padded[i:i + 3]}" for i in range(len(padded) - 2))
+    
+    day = published_at[:10] if published_at else None
+    week_match = WEEK_PATTERN.search(title_lower)
+    week = week_match.group(1) if week_match else None
+    if day:
+        blocks.add(f"d:{day}")
+    if week:
+        blocks.add(f"w:{week}")
+    return blocks, day, week
+
+class TitleIndex:
+    """Inverted index from blocking keys to podcasts, for top-k candidate lookup."""
     
-    # Step 1: Remove exact duplicate podcasts (keep one with most data)
+    # Day and week agreement carry score boosts, so they rank candidates too
+    WEIGHTS = {"d": 4.0, "w": 3.0, "t": 2.0, "g": 0.25}
+    
+    def __init__(self, podcasts):
+        self.podcasts = []
+        self.postings = defaultdict(list)
+        for i, pod in enumerate(podcasts):
+            pod_title = pod['title'].lower()
+            blocks, day, week = title_blocks(pod['title'], pod['published_at'])
+            # b2j for the podcast title is built once and reused for every video
+            matcher = SequenceMatcher(None, '', pod_title)
+            self.podcasts.append({"row": pod, "day": day, "week": week, "matcher": matcher})
+            for block in blocks:
+                self.postings[block].append(i)
+        
+        # Blocks shared by many podcasts (the year, common trigrams) barely narrow
+        # anything down but dominate lookup cost, so only selective ones are kept
+        limit = max(TOP_K * 2, int(4 * len(podcasts) ** 0.5))
+        self.postings = {b: ids for b, ids in self.postings.items() if len(ids) <= limit}
+    
+    def candidates(self, blocks: set, top_k: int = TOP_K) -> list:
+        """Podcast positions sharing the most weighted blocks with a title."""
+        overlap = defaultdict(float)
+        for block in blocks:
+            weight = self.WEIGHTS[block[0]]
+            for i in self.postings.get(block, ()):
+                overlap[i] += weight
+        return sorted(overlap, key=lambda i: (-overlap[i], i))[:top_k]
+
+def index_stats(cursor) -> dict:
+    """Row counts, plus on-disk bytes of the FTS index when dbstat is available."""
+    stats = {}
+    tables = ("episodes", "transcripts", "transcripts_fts") if has_fts(cursor) else ("episodes", "transcripts")
+    for table in tables:
+        stats[f"{table}_rows"] = cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    try:
+        stats["fts_bytes"] = cursor.execute(
+            "SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name LIKE 'transcripts_fts%'"
+        ).fetchone()[0]
+    except sqlite3.OperationalError:  # SQLite built without dbstat
+        stats["fts_bytes"] = None
+    return stats
+
+def delete_doomed(cursor) -> int:
+    """
+    Delete every episode listed in temp.doomed_episodes and its transcript in
+    set-based statements, then empty the list. FTS rows are swept once at the
+    end of the run (see consolidate) rather than rescanning the index here;
+    external-content indexes are updated by trigger as transcripts go.
+    """
+    cursor.execute("""
+        DELETE FROM transcripts
+        WHERE episode_id IN (SELECT id FROM doomed_episodes)
+    """)
+    deleted = cursor.execute("""
+        DELETE FROM episodes
+        WHERE id IN (SELECT id FROM doomed_episodes)
+    """).rowcount
+    cursor.execute("DELETE FROM doomed_episodes")
+    return deleted
+
+def has_near_duplicates(cursor) -> bool:
+    row = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'transcript_duplicates'"
+    ).fetchone()
+    return row is not None
+
+def fold_near_duplicates(cursor, min_jaccard: float) -> int:
+    """
+    Delete episodes whose transcript scripts/near_duplicates.py found to be a
+    copy of another episode's, moving a YouTube link to the episode kept if
+    it has none. Rows for episodes already gone are skipped.
+    """
+    cursor.execute("""
+        INSERT OR IGNORE INTO doomed_episodes (id)
+        SELECT d.episode_id FROM transcript_duplicates d
+        JOIN episodes e ON e.id = d.episode_id
+        JOIN episodes k ON k.id = d.keep_id
+        WHERE d.jaccard >= ?
+    """, (min_jaccard,))
+    cursor.execute("""
+        UPDATE episodes SET youtube_url = (
+            SELECT COALESCE(e.youtube_url, 'https://www.youtube.com/watch?v=' || e.id)
+            FROM transcript_duplicates d
+            JOIN doomed_episodes x ON x.id = d.episode_id
+            JOIN episodes e ON e.id = d.episode_id
+            WHERE d.keep_id = episodes.id
+              AND (e.youtube_url IS NOT NULL OR e.id NOT LIKE 'podcast%')
+            ORDER BY d.jaccard DESC
+            LIMIT 1
+        )
+        WHERE youtube_url IS NULL AND id IN (
+            SELECT d.keep_id FROM transcript_duplicates d
+            JOIN doomed_episodes x ON x.id = d.episode_id
+            JOIN episodes e ON e.id = d.episode_id
+            WHERE e.youtube_url IS NOT NULL OR e.id NOT LIKE 'podcast%'
+        )
+    """)
+    return delete_doomed(cursor)
+
+def consolidate_in_transaction(cursor, exhaustive: bool, min_jaccard: float):
+    # Step 1: Remove exact duplicate podcasts (keep the first imported)
     print("Step 1: Removing duplicate podcasts...")
     cursor.execute("""
-        SELECT title, GROUP_CONCAT(id) as ids, COUNT(*) as cnt 
-        FROM episodes 
-        WHERE id LIKE 'podcast%' 
-        GROUP BY title 
-        HAVING cnt > 1
+        INSERT INTO doomed_episodes (id)
+        SELECT id FROM (
+            SELECT id, ROW_NUMBER() OVER (PARTITION BY title ORDER BY rowid) AS n
+            FROM episodes
+            WHERE id LIKE 'podcast%'
+        )
+        WHERE n > 1
     """)
-    
-    duplicates_removed = 0
-    for row in cursor.fetchall():
-        ids = row['ids'].split(',')
-        # Keep the first, delete the rest
-        for dup_id in ids[1:]:
-            cursor.execute("DELETE FROM episodes WHERE id = ?", (dup_id,))
-            cursor.execute("DELETE FROM transcripts WHERE episode_id = ?", (dup_id,))
-            duplicates_removed += 1
+    duplicates_removed = delete_doomed(cursor)
     
     print(f"   Removed {duplicates_removed} duplicate podcasts")
+    if has_near_duplicates(cursor):
+        folded = fold_near_duplicates(cursor, min_jaccard)
+        print(f"   Folded {folded} near-duplicate transcripts into the episodes they copy")
     
     # Step 2: Get all podcasts with dates
     cursor.execute("""
@@ -58,53 +200,68 @@ def consolidate():
     
     matched = 0
     youtube_to_delete = []
+    youtube_links = []
+    
+    index = TitleIndex(podcasts)
     
     for yt in youtube_vids:
         yt_title = yt['title'].lower()
+        yt_blocks, yt_day, yt_week = title_blocks(yt['title'], yt['published_at'])
         best_match = None
         best_score = 0
+        best_position = len(podcasts)
         
-        for pod in podcasts:
-            pod_title = pod['title'].lower()
+        if exhaustive:
+            positions = range(len(index.podcasts))
+        else:
+            positions = index.candidates(yt_blocks)
+        
+        for i in positions:
+            pod = index.podcasts[i]
+            same_day = yt_day is not None and yt_day == pod["day"]
+            same_week = yt_week is not None and yt_week == pod["week"]
+            
+            # Skip the full similarity when even its upper bound can't beat the
+            # current best (or the match threshold)
+            matcher = pod["matcher"]
+            matcher.set_seq1(yt_title)
+            bar = max(best_score, MATCH_THRESHOLD) - 0.3 * same_day - 0.2 * same_week - 1e-9
+            if matcher.real_quick_ratio() < bar or matcher.quick_ratio() < bar:
+                continue
             
             # Check for title similarity
-            score = similarity(yt_title, pod_title)
+            score = matcher.ratio()
             
             # Boost score if dates match
-            if yt['published_at'] and pod['published_at']:
-                if yt['published_at'][:10] == pod['published_at'][:10]:
-                    score += 0.3
+            if same_day:
+                score += 0.3
             
             # Boost if both contain same week number
-            import re
-            yt_week = re.search(r'week\s*(\d+)', yt_title)
-            pod_week = re.search(r'week\s*(\d+)', pod_title)
-            if yt_week and pod_week and yt_week.group(1) == pod_week.group(1):
+            if same_week:
                 score += 0.2
             
-            if score > best_score:
+            # Ties go to the podcast listed first (newest), as in a full scan
+            if score > best_score or (score == best_score and i < best_position):
                 best_score = score
-                best_match = pod
+                best_match = pod["row"]
+                best_position = i
         
         # If good match found, update podcast with YouTube URL and mark YT for deletion
-        if best_score > 0.6 and best_match:
+        if best_score > MATCH_THRESHOLD and best_match:
             yt_url = yt['youtube_url'] or f"https://www.youtube.com/watch?v={yt['id']}"
-            cursor.execute(
-                "UPDATE episodes SET youtube_url = ? WHERE id = ?",
-                (yt_url, best_match['id'])
-            )
-            youtube_to_delete.append(yt['id'])
+            youtube_links.append((yt_url, best_match['id']))
+            youtube_to_delete.append((yt['id'],))
             matched += 1
             if matched <= 10:
                 print(f"   ✓ {yt['title'][:40]}... → {best_match['title'][:30]}... (score: {best_score:.2f})")
     
     print(f"\n   Matched {matched} YouTube videos to podcasts")
+    cursor.executemany("UPDATE episodes SET youtube_url = ? WHERE id = ?", youtube_links)
     
     # Step 4: Delete matched YouTube entries (they're now linked to podcasts)
     print(f"\nStep 3: Removing {len(youtube_to_delete)} merged YouTube entries...")
-    for yt_id in youtube_to_delete:
-        cursor.execute("DELETE FROM episodes WHERE id = ?", (yt_id,))
-        cursor.execute("DELETE FROM transcripts WHERE episode_id = ?", (yt_id,))
+    cursor.executemany("INSERT OR IGNORE INTO doomed_episodes (id) VALUES (?)", youtube_to_delete)
+    delete_doomed(cursor)
     
     # Step 5: For remaining YouTube videos without dates, try to extract from title
     cursor.execute("""
@@ -114,8 +271,43 @@ def consolidate():
     """)
     remaining = cursor.fetchall()
     print(f"\nStep 4: {len(remaining)} YouTube videos remaining without matches")
+
+def consolidate(exhaustive: bool = False, min_jaccard: float = NEAR_DUPLICATE_JACCARD):
+    # Transactions are managed explicitly: the whole run commits or nothing does
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
     
-    conn.commit()
+    before = index_stats(cursor)
+    cursor.execute("CREATE TEMP TABLE doomed_episodes (id TEXT PRIMARY KEY)")
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        with phase("match"):
+            consolidate_in_transaction(cursor, exhaustive, min_jaccard)
+        
+        # One pass drops FTS rows for everything deleted above (and any orphaned
+        # by earlier runs), then the index segments are merged
+        with phase("fts sweep"):
+            if not has_fts(conn) or fts_is_external(conn):
+                # The index mirrors transcripts via triggers (or is gone, with
+                # compressed transcripts); deleting the orphaned transcripts is
+                # what removes their index entries and segments
+                cursor.execute("""
+                    DELETE FROM transcripts
+                    WHERE episode_id NOT IN (SELECT id FROM episodes)
+                """)
+            else:
+                cursor.execute("""
+                    DELETE FROM transcripts_fts
+                    WHERE episode_id NOT IN (SELECT id FROM episodes)
+                """)
+            if has_fts(conn):
+                cursor.execute("INSERT INTO transcripts_fts(transcripts_fts) VALUES ('optimize')")
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    after = index_stats(cursor)
     
     # Final stats
     cursor.execute("SELECT COUNT(*) FROM episodes")
@@ -130,7 +322,19 @@ def consolidate():
     print(f"   With dates: {with_dates}")
     print(f"   With YouTube URLs: {with_youtube}")
     
+    print(f"\n   {'':<22}{'before':>12}{'after':>12}")
+    for key in before:
+        print(f"   {key:<22}{str(before[key]):>12}{str(after[key]):>12}")
+    
     conn.close()
 
 if __name__ == "__main__":
-    consolidate()
+    with profiled("consolidate_episodes"):
+        parser = argparse.ArgumentParser(description="Consolidate podcast and YouTube episodes.")
+        parser.add_argument("--exhaustive", action="store_true",
+                            help="score every podcast for every video instead of the blocked top-k")
+        parser.add_argument("--min-jaccard", type=float, default=NEAR_DUPLICATE_JACCARD,
+                            help="fold near-duplicate transcripts at least this similar "
+                                 f"(default: {NEAR_DUPLICATE_JACCARD})")
+        args = parser.parse_args()
+        consolidate(exhaustive=args.exhaustive, min_jaccard=args.min_jaccard)
@@ -1,95 +1,27 @@
 #!/usr/bin/env python3
 """Fix missing dates by extracting from titles or estimating from patterns."""
 
+import argparse
 import sqlite3
-import re
-from datetime import datetime, timedelta
+import sys
+from pathlib import Path
 
-DB_PATH = "data/swolecast.db"
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from instrumentation import profiled
+from title_dates import extract_date
 
-MONTHS = {
-    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
-    'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12,
-}
+DB_PATH = "data/swolecast.db"
 
-# NFL season week patterns - map week numbers to approximate dates
-NFL_WEEKS_2023 = {
-    'week 1': '2023-09-07', 'week 2': '2023-09-14', 'week 3': '2023-09-21',
-    'week 4': '2023-09-28', 'week 5': '2023-10-05', 'week 6': '2023-10-12',
-    'week 7': '2023-10-19', 'week 8': '2023-10-26', 'week 9': '2023-11-02',
-    'week 10': '2023-11-09', 'week 11': '2023-11-16', 'week 12': '2023-11-23',
-    'week 13': '2023-11-30', 'week 14': '2023-12-07', 'week 15': '2023-12-14',
-    'week 16': '2023-12-21', 'week 17': '2023-12-28', 'week 18': '2024-01-04',
-    'wild card': '2024-01-13', 'divisional': '2024-01-20', 
-    'conference': '2024-01-28', 'super bowl': '2024-02-11',
-}
+# Season assumed for "Week N" titles that don't name a year
+DEFAULT_SEASON = 2023
 
-NFL_WEEKS_2024 = {
-    'week 1': '2024-09-05', 'week 2': '2024-09-12', 'week 3': '2024-09-19',
-    'week 4': '2024-09-26', 'week 5': '2024-10-03', 'week 6': '2024-10-10',
-    'week 7': '2024-10-17', 'week 8': '2024-10-24', 'week 9': '2024-10-31',
-    'week 10': '2024-11-07', 'week 11': '2024-11-14', 'week 12': '2024-11-21',
-    'week 13': '2024-11-28', 'week 14': '2024-12-05', 'week 15': '2024-12-12',
-    'week 16': '2024-12-19', 'week 17': '2024-12-26', 'week 18': '2025-01-02',
-    'wild card': '2025-01-11', 'divisional': '2025-01-18',
-    'conference': '2025-01-26', 'super bowl': '2025-02-09',
-}
+# Best ball coverage started in 2024, so undated best-ball weeks are that season
+BEST_BALL_SEASON = 2024
 
-def extract_date(title):
-    title_lower = title.lower()
-    
-    # Pattern: "Month DD, YYYY" or "Month D, YYYY"
-    pattern1 = r'(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec)\s+(\d{1,2}),?\s+(\d{4})'
-    match = re.search(pattern1, title_lower)
-    if match:
-        month = MONTHS.get(match.group(1))
-        day = int(match.group(2))
-        year = int(match.group(3))
-        return f"{year}-{month:02d}-{day:02d}"
-    
-    # Check for NFL week patterns with year context
-    if '2024' in title or 'best ball' in title_lower:
-        weeks = NFL_WEEKS_2024
-    else:
-        weeks = NFL_WEEKS_2023
-    
-    for pattern, date in weeks.items():
-        if pattern in title_lower:
-            return date
-    
-    # Pattern: "2023 NFL" or "2024 NFL" with DFS
-    if '2023 dfs' in title_lower or '2023 fantasy' in title_lower:
-        # Late 2023 season content
-        return '2023-10-01'
-    if '2024 dfs' in title_lower or '2024 fantasy' in title_lower:
-        return '2024-10-01'
-    
-    # Draft content
-    if 'nfl draft' in title_lower:
-        if '2024' in title or '2024' in title_lower:
-            return '2024-04-25'
-        elif '2023' in title:
-            return '2023-04-27'
-    
-    # Best ball content
-    if 'best ball' in title_lower:
-        if '2024' in title:
-            return '2024-06-01'
-        elif '2023' in title:
-            return '2023-06-01'
-    
-    # Free agency
-    if 'free agency' in title_lower:
-        if '2024' in title:
-            return '2024-03-13'
-        elif '2023' in title:
-            return '2023-03-15'
-    
-    return None
+def season_for(title, default_season):
+    return BEST_BALL_SEASON if 'best ball' in title.lower() else default_season
 
-def fix_dates():
+def fix_dates(default_season: int = DEFAULT_SEASON):
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     cursor = conn.cursor()
@@ -103,18 +35,16 @@ def fix_dates():
     episodes = cursor.fetchall()
     print(f"Episodes without dates: {len(episodes)}")
     
-    fixed = 0
+    updates = []
     for ep in episodes:
-        date = extract_date(ep['title'])
+        date = extract_date(ep['title'], default_season=season_for(ep['title'], default_season))
         if date:
-            cursor.execute(
-                "UPDATE episodes SET published_at = ? WHERE id = ?",
-                (date, ep['id'])
-            )
+            updates.append((date, ep['id']))
             print(f"  ✓ {date}: {ep['title'][:50]}")
-            fixed += 1
     
+    cursor.executemany("UPDATE episodes SET published_at = ? WHERE id = ?", updates)
     conn.commit()
+    fixed = len(updates)
     
     # Show remaining
     cursor.execute("""
@@ -139,4 +69,10 @@ def fix_dates():
     conn.close()
 
 if __name__ == "__main__":
-    fix_dates()
+    with profiled("fix_dates_v2"):
+        parser = argparse.ArgumentParser(description=__doc__)
+        parser.add_argument("--season", type=int, default=DEFAULT_SEASON,
+                            help=f"season for week/playoff titles without a year (default: {DEFAULT_SEASON}; "
+                                 f"best ball titles use {BEST_BALL_SEASON})")
+        args = parser.parse_args()
+        fix_dates(args.season)
@@ -5,6 +5,11 @@ not the shorter podcast audio uploads.
 """
 
 import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from instrumentation import profiled
 
 DB_PATH = "data/swolecast.db"
 UPLOADS_DB = "/Users/davidkitchen-ai/clawd/projects/swolecast-db/swolecast_uploads.db"
@@ -67,4 +72,5 @@ def fix_links():
     conn.close()
 
 if __name__ == "__main__":
-    fix_links()
+    with profiled("fix_youtube_links"):
+        fix_links()
@@ -3,37 +3,224 @@
 Import podcast transcripts from swolecast-archive into the Vercel project database.
 """
 
+import argparse
 import sqlite3
 import json
+import sys
+import time
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+from fts_schema import create_triggers, drop_triggers, fts_is_external, has_fts, restore_triggers
+from instrumentation import phase, profiled
+import transcript_codec
+import transcript_segments
+
 # Source: our cleaned podcast data
 SOURCE_DB = Path.home() / "clawd/projects/swolecast-db/swolecast.db"
 # Target: the Vercel project database
 TARGET_DB = Path(__file__).parent / "data/swolecast.db"
 
-def import_podcasts():
-    source = sqlite3.connect(SOURCE_DB)
+# Loader settings for --bulk; the previous values are restored afterwards
+BULK_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -262144,  # 256 MiB
+}
+
+INSERT_EPISODE = """
+    INSERT OR REPLACE INTO episodes 
+    (id, title, description, published_at, duration_seconds, 
+     has_transcript, transcript_word_count, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
+"""
+
+INSERT_TRANSCRIPT = """
+    INSERT OR REPLACE INTO transcripts (episode_id, content, word_count)
+    VALUES (?, ?, ?)
+"""
+
+# Used once scripts/compress_transcripts.py has stored a dictionary
+INSERT_COMPRESSED_TRANSCRIPT = """
+    INSERT OR REPLACE INTO transcripts (episode_id, content, word_count, codec, dict_id)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+def episode_row(p, ep_id: str, now: str) -> tuple:
+    return (
+        ep_id,
+        p['title'],
+        p['summary'] or '',
+        p['pub_date'],
+        p['duration_seconds'] or 0,
+        p['word_count'] or 0,
+        now,
+        now
+    )
+
+def transcript_insert(target):
+    """
+    INSERT statement and row builder for transcripts: plain text, or
+    compressed with the latest dictionary if the database uses one.
+    """
+    latest = transcript_codec.latest_dictionary(target)
+    if latest is None:
+        return INSERT_TRANSCRIPT, lambda p, ep_id: (ep_id, p['transcript'], p['word_count'])
+    dict_id, dictionary = latest
+    return INSERT_COMPRESSED_TRANSCRIPT, lambda p, ep_id: (
+        ep_id, transcript_codec.compress(p['transcript'], dictionary),
+        p['word_count'], transcript_codec.CODEC, dict_id
+    )
+
+def bulk_load(target, podcasts, existing: set, batch_size: int) -> int:
+    """
+    Insert new episodes and transcripts with batched executemany under loader
+    pragmas, then index all of them in a single FTS statement at the end.
+    Everything from dropping the sync triggers to recreating them is one
+    transaction, so a failed load leaves the triggers in place.
+    """
+    indexed = has_fts(target)
+    external = fts_is_external(target)
+    segmented = transcript_segments.has_segments(target)
+    insert_transcript, transcript_row = transcript_insert(target)
+    saved = {name: target.execute(f"PRAGMA {name}").fetchone()[0] for name in BULK_PRAGMAS}
+    for name, value in BULK_PRAGMAS.items():
+        target.execute(f"PRAGMA {name} = {value}")
+    # Implicit transactions only start at the first INSERT, so the DDL below
+    # would otherwise commit on its own
+    isolation_level, target.isolation_level = target.isolation_level, None
+    
+    imported = 0
+    target.execute("BEGIN IMMEDIATE")
+    try:
+        target.execute("CREATE TEMP TABLE imported_ids (id TEXT PRIMARY KEY)")
+        if external:
+            # Sync triggers would index row by row; the rebuild below covers it
+            drop_triggers(target)
+        if segmented:
+            transcript_segments.drop_triggers(target)
+        episodes, transcripts, segments = [], [], []
+        now = datetime.now().isoformat()
+        
+        def flush():
+            target.executemany(INSERT_EPISODE, episodes)
+            target.executemany(insert_transcript, transcripts)
+            if segments:
+                target.executemany(transcript_segments.INSERT_SEGMENT, segments)
+            target.executemany("INSERT OR IGNORE INTO imported_ids (id) VALUES (?)",
+                               [(row[0],) for row in episodes])
+            episodes.clear()
+            transcripts.clear()
+            segments.clear()
+        
+        for p in podcasts:
+            ep_id = f"podcast-{p['id'][:20]}" if not p['id'].startswith('podcast-') else p['id']
+            if ep_id in existing:
+                continue
+            episodes.append(episode_row(p, ep_id, now))
+            transcripts.append(transcript_row(p, ep_id))
+            if segmented:
+                segments.extend(transcript_segments.segment_rows(ep_id, p['transcript']))
+            imported += 1
+            if len(episodes) >= batch_size:
+                flush()
+                print(f"  Loaded {imported}...")
+        flush()
+        
+        # No per-row FTS writes during the load: index in one pass at the end
+        with phase("index"):
+            if external:
+                target.execute("INSERT INTO transcripts_fts(transcripts_fts) VALUES ('rebuild')")
+                create_triggers(target)
+            elif indexed:
+                # A contentful table would rebuild from its own (stale) copy, so
+                # index just the new transcripts and merge the segments instead
+                target.execute("""
+                    INSERT INTO transcripts_fts (episode_id, content)
+                    SELECT episode_id, content FROM transcripts
+                    WHERE episode_id IN (SELECT id FROM imported_ids)
+                """)
+                target.execute("INSERT INTO transcripts_fts(transcripts_fts) VALUES ('optimize')")
+            if segmented:
+                target.execute("INSERT INTO segments_fts(segments_fts) VALUES ('rebuild')")
+                transcript_segments.create_triggers(target)
+        target.execute("COMMIT")
+    except BaseException:
+        target.execute("ROLLBACK")
+        raise
+    finally:
+        target.execute("DROP TABLE IF EXISTS temp.imported_ids")
+        for name, value in saved.items():
+            target.execute(f"PRAGMA {name} = {value}")
+        target.isolation_level = isolation_level
+    return imported
+
+def import_podcasts(source_db: Path = SOURCE_DB, target_db: Path = TARGET_DB,
+                    bulk: bool = False, batch_size: int = 500):
+    started = time.monotonic()
+    source = sqlite3.connect(source_db)
     source.row_factory = sqlite3.Row
     
-    target = sqlite3.connect(TARGET_DB)
+    target = sqlite3.connect(target_db)
     target.row_factory = sqlite3.Row
+    # INSERT OR REPLACE must fire the FTS delete trigger for the replaced row
+    target.execute("PRAGMA recursive_triggers = ON")
+    # A failed --bulk load used to leave the sync triggers dropped
+    if fts_is_external(target) and restore_triggers(target):
+        target.commit()
+        print("Restored the transcripts_fts sync triggers and rebuilt the index")
+    if transcript_segments.has_segments(target):
+        # Adds any segment columns newer than the table, and the sync
+        # triggers if they went missing
+        transcript_segments.create_schema(target)
+        target.commit()
     
     # Get existing episode IDs
     existing = set(row[0] for row in target.execute("SELECT id FROM episodes").fetchall())
     print(f"Existing episodes: {len(existing)}")
     
     # Get podcast episodes from source
-    podcasts = source.execute("""
-        SELECT id, title, pub_date, duration_seconds, word_count, transcript, 
-               players, topics, summary
-        FROM podcast_episodes
-        WHERE transcript IS NOT NULL AND transcript != ''
-    """).fetchall()
+    with phase("read source"):
+        podcasts = source.execute("""
+            SELECT id, title, pub_date, duration_seconds, word_count, transcript, 
+                   players, topics, summary
+            FROM podcast_episodes
+            WHERE transcript IS NOT NULL AND transcript != ''
+        """).fetchall()
     
     print(f"Podcasts to import: {len(podcasts)}")
+    if not transcript_segments.has_segments(target):
+        print("No transcript_segments table; run scripts/backfill_segments.py to enable segment search")
+    
+    with phase("load"):
+        if bulk:
+            imported = bulk_load(target, podcasts, existing, batch_size)
+        else:
+            imported = import_rows(target, podcasts, existing)
+    elapsed = time.monotonic() - started
+    
+    # Get final stats
+    total = target.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+    with_trans = target.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+    total_words = target.execute("SELECT SUM(word_count) FROM transcripts").fetchone()[0]
+    
+    print(f"\n✅ Import complete!")
+    print(f"   New episodes: {imported}")
+    print(f"   Total episodes: {total}")
+    print(f"   With transcripts: {with_trans}")
+    print(f"   Total words: {total_words:,}")
+    print(f"   Took {elapsed:.2f}s ({imported / elapsed:,.0f} rows/s)")
     
+    source.close()
+    target.close()
+
+def import_rows(target, podcasts, existing: set) -> int:
+    """Insert one episode at a time, writing its FTS row as it goes."""
+    indexed = has_fts(target)
+    external = fts_is_external(target)
+    segmented = transcript_segments.has_segments(target)
+    insert_transcript, transcript_row = transcript_insert(target)
     imported = 0
     for p in podcasts:
         # Create a unique ID for podcast episodes
@@ -43,53 +230,36 @@ def import_podcasts():
             continue
         
         # Insert into episodes table
-        target.execute("""
-            INSERT OR REPLACE INTO episodes 
-            (id, title, description, published_at, duration_seconds, 
-             has_transcript, transcript_word_count, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, 1, ?, ?, ?)
-        """, (
-            ep_id,
-            p['title'],
-            p['summary'] or '',
-            p['pub_date'],
-            p['duration_seconds'] or 0,
-            p['word_count'] or 0,
-            datetime.now().isoformat(),
-            datetime.now().isoformat()
-        ))
+        target.execute(INSERT_EPISODE, episode_row(p, ep_id, datetime.now().isoformat()))
         
         # Insert into transcripts table
-        target.execute("""
-            INSERT OR REPLACE INTO transcripts (episode_id, content, word_count)
-            VALUES (?, ?, ?)
-        """, (ep_id, p['transcript'], p['word_count']))
+        target.execute(insert_transcript, transcript_row(p, ep_id))
+        
+        # Insert into FTS (external-content indexes are fed by trigger)
+        if indexed and not external:
+            target.execute("""
+                INSERT INTO transcripts_fts (episode_id, content)
+                VALUES (?, ?)
+            """, (ep_id, p['transcript']))
         
-        # Insert into FTS
-        target.execute("""
-            INSERT INTO transcripts_fts (episode_id, content)
-            VALUES (?, ?)
-        """, (ep_id, p['transcript']))
+        # Split into search segments (indexed by trigger)
+        if segmented:
+            transcript_segments.write_segments(target, ep_id, p['transcript'])
         
         imported += 1
         if imported % 50 == 0:
             print(f"  Imported {imported}...")
     
     target.commit()
-    
-    # Get final stats
-    total = target.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
-    with_trans = target.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
-    total_words = target.execute("SELECT SUM(word_count) FROM transcripts").fetchone()[0]
-    
-    print(f"\n✅ Import complete!")
-    print(f"   New episodes: {imported}")
-    print(f"   Total episodes: {total}")
-    print(f"   With transcripts: {with_trans}")
-    print(f"   Total words: {total_words:,}")
-    
-    source.close()
-    target.close()
+    return imported
 
 if __name__ == "__main__":
-    import_podcasts()
+    with profiled("import_podcasts"):
+        parser = argparse.ArgumentParser(description="Import podcast transcripts into the archive database.")
+        parser.add_argument("--source", type=Path, default=SOURCE_DB, help="source podcast database")
+        parser.add_argument("--target", type=Path, default=TARGET_DB, help="archive database to import into")
+        parser.add_argument("--bulk", action="store_true",
+                            help="batched load with loader pragmas and one FTS pass at the end")
+        parser.add_argument("--batch-size", type=int, default=500, help="rows per executemany batch (default: 500)")
+        args = parser.parse_args()
+        import_podcasts(args.source, args.target, bulk=args.bulk, batch_size=args.batch_size)
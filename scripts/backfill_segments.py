@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Create transcript_segments/segments_fts and segment existing transcripts."""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from instrumentation import profiled
+import transcript_codec
+import transcript_segments
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+def segment_bytes(conn) -> int:
+    row = conn.execute("""
+        SELECT COALESCE(SUM(pgsize), 0) FROM dbstat
+        WHERE name LIKE 'segments_fts%' OR name = 'transcript_segments'
+           OR name LIKE 'sqlite_autoindex_transcript_segments%'
+    """).fetchone()
+    return row[0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="re-segment every transcript, not just those without segments")
+    parser.add_argument("--size", type=int, default=transcript_segments.SEGMENT_CHARS,
+                        help=f"target segment length in characters (default: {transcript_segments.SEGMENT_CHARS})")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    transcript_segments.create_schema(conn)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Index everything in one pass at the end instead of row by row
+        transcript_segments.drop_triggers(conn)
+        if args.rebuild:
+            conn.execute("DELETE FROM transcript_segments")
+        todo = conn.execute(f"""
+            SELECT t.episode_id, {transcript_codec.text_sql(conn)} FROM transcripts t
+            WHERE NOT EXISTS (
+                SELECT 1 FROM transcript_segments s WHERE s.episode_id = t.episode_id
+            )
+        """).fetchall()
+        print(f"Segmenting {len(todo)} transcripts...")
+
+        written = 0
+        for i, (episode_id, content) in enumerate(todo, 1):
+            rows = transcript_segments.segment_rows(episode_id, content, args.size)
+            conn.executemany(transcript_segments.INSERT_SEGMENT, rows)
+            written += len(rows)
+            if i % 100 == 0:
+                print(f"  {i}/{len(todo)} transcripts, {written} segments")
+
+        conn.execute("INSERT INTO segments_fts(segments_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO segments_fts(segments_fts) VALUES ('optimize')")
+        transcript_segments.create_triggers(conn)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    total, avg_len = conn.execute(
+        "SELECT COUNT(*), COALESCE(AVG(LENGTH(text)), 0) FROM transcript_segments"
+    ).fetchone()
+    size = segment_bytes(conn)
+    conn.close()
+
+    print(f"\n✅ Segments ready!")
+    print(f"   New segments: {written}")
+    print(f"   Total segments: {total} (avg {avg_len:.0f} chars)")
+    print(f"   Table + index size: {size / 1e6:.1f}MB")
+    print(f"   Took {time.monotonic() - started:.2f}s")
+
+if __name__ == "__main__":
+    with profiled("backfill_segments"):
+        main()
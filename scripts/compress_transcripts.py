@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Store transcripts as dictionary-compressed zlib blobs (or back as plain text).
+
+Needs transcript_segments (scripts/backfill_segments.py): search moves to
+segments_fts and transcripts_fts is dropped, since an FTS index can't read
+compressed rows. Use --benchmark to compare layouts without changing anything.
+"""
+
+import argparse
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import transcript_codec
+import transcript_segments
+from fts_schema import drop_triggers, fts_sql
+from instrumentation import profiled
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+def transcript_rows(conn) -> list:
+    """(rowid, episode_id, plain text) for every transcript."""
+    return conn.execute(f"""
+        SELECT rowid, episode_id, {transcript_codec.text_sql(conn)}
+        FROM transcripts
+    """).fetchall()
+
+def decode_micros(blobs: list, decode, runs: int) -> float:
+    """Median microseconds to turn one stored row back into text."""
+    timings = []
+    for _ in range(runs):
+        for blob in blobs:
+            started = time.perf_counter()
+            decode(blob)
+            timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e6
+
+def benchmark(rows: list, dict_size: int, runs: int):
+    texts = [text for _, _, text in rows]
+    started = time.monotonic()
+    dictionary = transcript_codec.train_dictionary(texts, dict_size)
+    train_seconds = time.monotonic() - started
+
+    plain = [text.encode("utf-8") for text in texts]
+    layouts = {
+        "plain": (plain, lambda blob: blob.decode("utf-8")),
+        "zlib": ([transcript_codec.compress(text) for text in texts],
+                 transcript_codec.decompress),
+        "zlib+dict": ([transcript_codec.compress(text, dictionary) for text in texts],
+                      lambda blob: transcript_codec.decompress(blob, dictionary)),
+    }
+
+    plain_bytes = sum(len(blob) for blob in plain)
+    print(f"\n{len(texts)} transcripts, dictionary {len(dictionary)} bytes trained in {train_seconds:.2f}s")
+    print(f"\n{'layout':<12}{'bytes':>14}{'ratio':>8}{'decode p50 µs':>16}{'MB/s':>8}")
+    for name, (blobs, decode) in layouts.items():
+        stored = sum(len(blob) for blob in blobs) + (len(dictionary) if name == "zlib+dict" else 0)
+        micros = decode_micros(blobs, decode, runs)
+        mb_per_s = (plain_bytes / len(texts)) / micros if micros else 0
+        print(f"{name:<12}{stored:>14,}{plain_bytes / stored:>8.2f}{micros:>16.1f}{mb_per_s:>8.0f}")
+
+def compress_all(conn, rows: list, dict_size: int, level: int):
+    texts = [text for _, _, text in rows]
+    print(f"Training a {dict_size}-byte dictionary on {len(texts)} transcripts...")
+    dictionary = transcript_codec.train_dictionary(texts, dict_size)
+    dict_id = transcript_codec.save_dictionary(conn, dictionary)
+
+    conn.executemany(
+        "UPDATE transcripts SET content = ?, codec = ?, dict_id = ? WHERE rowid = ?",
+        [(transcript_codec.compress(text, dictionary, level), transcript_codec.CODEC, dict_id, rowid)
+         for rowid, _, text in rows]
+    )
+
+    # Check every row round-trips before committing
+    mismatched = 0
+    originals = {rowid: text for rowid, _, text in rows}
+    for rowid, text in conn.execute("SELECT rowid, transcript_text(content, codec, dict_id) FROM transcripts"):
+        if originals[rowid] != text:
+            mismatched += 1
+    return mismatched
+
+def decompress_all(conn, rows: list):
+    conn.executemany(
+        "UPDATE transcripts SET content = ?, codec = NULL, dict_id = NULL WHERE rowid = ?",
+        [(text, rowid) for rowid, _, text in rows]
+    )
+    conn.execute("DELETE FROM transcript_dicts")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="report size and decode latency per layout without changing the database")
+    parser.add_argument("--decompress", action="store_true", help="convert back to plain-text rows")
+    parser.add_argument("--dict-size", type=int, default=transcript_codec.DICT_SIZE,
+                        help=f"dictionary size in bytes (default: {transcript_codec.DICT_SIZE})")
+    parser.add_argument("--level", type=int, default=transcript_codec.LEVEL,
+                        help=f"zlib level (default: {transcript_codec.LEVEL})")
+    parser.add_argument("--runs", type=int, default=5, help="decode passes for --benchmark (default: 5)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        benchmark(transcript_rows(conn), args.dict_size, args.runs)
+        return
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    if not args.decompress and not transcript_segments.has_segments(conn):
+        print("❌ No transcript_segments table; run scripts/backfill_segments.py first "
+              "so search keeps working without transcripts_fts", file=sys.stderr)
+        sys.exit(1)
+
+    size_before = args.db.stat().st_size
+    transcript_codec.ensure_schema(conn)
+    rows = transcript_rows(conn)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if args.decompress:
+            decompress_all(conn, rows)
+        else:
+            if fts_sql(conn):
+                print("Dropping transcripts_fts (search is served by segments_fts)...")
+                drop_triggers(conn)
+                conn.execute("DROP TABLE transcripts_fts")
+            mismatched = compress_all(conn, rows, args.dict_size, args.level)
+            if mismatched:
+                raise RuntimeError(f"{mismatched} transcripts did not round-trip")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    print("Vacuuming...")
+    conn.execute("VACUUM")
+    conn.close()
+    size_after = args.db.stat().st_size
+
+    print(f"\n✅ {'Decompressed' if args.decompress else 'Compressed'} {len(rows)} transcripts")
+    print(f"   File size: {size_before / 1e6:.1f}MB → {size_after / 1e6:.1f}MB")
+    if args.decompress:
+        print("   transcripts_fts is not recreated; segments_fts keeps serving search")
+
+if __name__ == "__main__":
+    with profiled("compress_transcripts"):
+        main()
@@ -0,0 +1,244 @@
+"""Player and team mentions in transcripts.
+
+A gazetteer maps every way a show refers to a player or team (full name,
+nickname, abbreviation, city) to one entity. Transcripts are scanned for all
+of those aliases at once, and each hit is stored in `entity_mentions` as
+(entity_id, episode_id, char_offset). The primary key answers "every episode
+about X" and per-entity counts; the episode index answers "who comes up in
+this episode". Both are plain index range scans.
+
+`entity_scans` records which gazetteer each transcript was last scanned
+with, so scripts/index_entities.py only rescans new transcripts until the
+gazetteer changes. Deleting a transcript deletes its mentions by trigger.
+"""
+
+import hashlib
+import json
+import re
+
+# Same word rule as title_dates.PhraseMatcher: case and punctuation between
+# words don't matter ("Amon-Ra St. Brown" == "amon ra st brown")
+WORD = re.compile(r"[a-z0-9]+")
+
+TEAMS = {
+    "Arizona Cardinals": ["Cardinals", "Arizona"],
+    "Atlanta Falcons": ["Falcons", "Atlanta"],
+    "Baltimore Ravens": ["Ravens", "Baltimore"],
+    "Buffalo Bills": ["Bills", "Buffalo"],
+    "Carolina Panthers": ["Panthers", "Carolina"],
+    "Chicago Bears": ["Bears", "Chicago"],
+    "Cincinnati Bengals": ["Bengals", "Cincinnati", "Cincy"],
+    "Cleveland Browns": ["Browns", "Cleveland"],
+    "Dallas Cowboys": ["Cowboys", "Dallas"],
+    "Denver Broncos": ["Broncos", "Denver"],
+    "Detroit Lions": ["Lions", "Detroit"],
+    "Green Bay Packers": ["Packers", "Green Bay"],
+    "Houston Texans": ["Texans", "Houston"],
+    "Indianapolis Colts": ["Colts", "Indianapolis", "Indy"],
+    "Jacksonville Jaguars": ["Jaguars", "Jags", "Jacksonville"],
+    "Kansas City Chiefs": ["Chiefs", "Kansas City"],
+    "Las Vegas Raiders": ["Raiders", "Las Vegas", "Oakland Raiders"],
+    "Los Angeles Chargers": ["Chargers", "Bolts"],
+    "Los Angeles Rams": ["Rams"],
+    "Miami Dolphins": ["Dolphins", "Miami", "Fins"],
+    "Minnesota Vikings": ["Vikings", "Minnesota", "Vikes"],
+    "New England Patriots": ["Patriots", "Pats", "New England"],
+    "New Orleans Saints": ["Saints", "New Orleans"],
+    "New York Giants": ["Giants"],
+    "New York Jets": ["Jets"],
+    "Philadelphia Eagles": ["Eagles", "Philadelphia", "Philly"],
+    "Pittsburgh Steelers": ["Steelers", "Pittsburgh"],
+    "San Francisco 49ers": ["49ers", "Niners", "Forty Niners", "San Francisco"],
+    "Seattle Seahawks": ["Seahawks", "Seattle"],
+    "Tampa Bay Buccaneers": ["Buccaneers", "Bucs", "Tampa Bay", "Tampa"],
+    "Tennessee Titans": ["Titans", "Tennessee"],
+    "Washington Commanders": ["Commanders", "Washington"],
+}
+
+# Nicknames and surnames the shows actually use; a surname only goes in when
+# it isn't an everyday word or shared with another fantasy-relevant player
+PLAYERS = {
+    "Amon-Ra St. Brown": ["St. Brown", "Sun God", "ARSB"],
+    "Bijan Robinson": ["Bijan"],
+    "Brandon Aiyuk": ["Aiyuk"],
+    "Breece Hall": ["Breece"],
+    "Brock Purdy": ["Purdy", "Mr. Irrelevant"],
+    "CeeDee Lamb": ["CeeDee"],
+    "Christian McCaffrey": ["McCaffrey", "CMC"],
+    "Cooper Kupp": ["Kupp"],
+    "Davante Adams": ["Davante"],
+    "De'Von Achane": ["Achane"],
+    "Derrick Henry": ["King Henry"],
+    "Drake London": [],
+    "Garrett Wilson": [],
+    "Jahmyr Gibbs": ["Gibbs"],
+    "Ja'Marr Chase": ["Ja'Marr"],
+    "Jalen Hurts": [],
+    "Jonathan Taylor": [],
+    "Josh Allen": [],
+    "Justin Jefferson": ["JJettas", "Jefferson"],
+    "Kyren Williams": ["Kyren"],
+    "Lamar Jackson": ["Lamar"],
+    "Marvin Harrison Jr.": ["MHJ", "Marvin Harrison"],
+    "Nico Collins": [],
+    "Patrick Mahomes": ["Mahomes"],
+    "Puka Nacua": ["Puka", "Nacua"],
+    "Sam LaPorta": ["LaPorta"],
+    "Saquon Barkley": ["Saquon"],
+    "Stefon Diggs": ["Diggs"],
+    "Travis Kelce": ["Kelce"],
+    "Tyreek Hill": ["Cheetah", "Tyreek"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entity_aliases (
+    alias TEXT PRIMARY KEY,
+    entity_id INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entity_mentions (
+    entity_id INTEGER NOT NULL,
+    episode_id TEXT NOT NULL,
+    char_offset INTEGER NOT NULL,
+    PRIMARY KEY (entity_id, episode_id, char_offset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entity_mentions_episode ON entity_mentions(episode_id, entity_id);
+CREATE TABLE IF NOT EXISTS entity_scans (
+    episode_id TEXT PRIMARY KEY,
+    gazetteer TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS transcripts_entities_ad AFTER DELETE ON transcripts BEGIN
+    DELETE FROM entity_mentions WHERE episode_id = old.episode_id;
+    DELETE FROM entity_scans WHERE episode_id = old.episode_id;
+END;
+"""
+
+INSERT_MENTION = "INSERT OR IGNORE INTO entity_mentions (entity_id, episode_id, char_offset) VALUES (?, ?, ?)"
+
+
+def normalize(alias: str) -> str:
+    return " ".join(WORD.findall(alias.lower()))
+
+
+def has_entities(conn) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'entity_mentions'").fetchone()
+    return row is not None
+
+
+def create_schema(conn):
+    conn.executescript(SCHEMA)
+
+
+def source_players(value) -> list:
+    """Player names from a source `players` column (a JSON list or comma-separated)."""
+    if not value:
+        return []
+    try:
+        names = json.loads(value)
+    except ValueError:
+        names = value.split(",")
+    if isinstance(names, str):
+        names = [names]
+    return [name.strip() for name in names if isinstance(name, str) and name.strip()]
+
+
+def build_gazetteer(extra_players=()) -> tuple[dict, dict]:
+    """
+    ({name: kind}, {normalized alias: name}) for the built-in teams and
+    players plus `extra_players`. Every name is an alias of itself. An alias
+    that two entities claim is dropped rather than guessed at, and no alias
+    can shadow another entity's full name.
+    """
+    kinds = {}
+    claims = {}
+    for kind, table in (("team", TEAMS), ("player", PLAYERS)):
+        for name, aliases in table.items():
+            kinds[name] = kind
+            for alias in aliases:
+                claims.setdefault(normalize(alias), set()).add(name)
+    aliases = {normalize(name): name for name in kinds}
+    for name in extra_players:
+        # Another spelling of a known name ("AMON-RA ST BROWN") folds into it
+        alias = normalize(name)
+        if alias and alias not in aliases:
+            kinds[name] = "player"
+            aliases[alias] = name
+    for alias, names in claims.items():
+        if alias and alias not in aliases and len(names) == 1:
+            aliases[alias] = next(iter(names))
+    return kinds, aliases
+
+
+def gazetteer_hash(aliases: dict) -> str:
+    return hashlib.sha256(json.dumps(sorted(aliases.items())).encode("utf-8")).hexdigest()[:16]
+
+
+def save_gazetteer(conn, kinds: dict, aliases: dict) -> dict:
+    """Upsert entities and aliases; returns {name: entity_id}. Ids never change once assigned."""
+    conn.executemany(
+        "INSERT INTO entities (name, kind) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET kind = excluded.kind",
+        sorted(kinds.items())
+    )
+    ids = {name: entity_id for entity_id, name in conn.execute("SELECT id, name FROM entities")}
+    conn.execute("DELETE FROM entity_aliases")
+    conn.executemany(
+        "INSERT INTO entity_aliases (alias, entity_id) VALUES (?, ?)",
+        sorted((alias, ids[name]) for alias, name in aliases.items())
+    )
+    return ids
+
+
+class Gazetteer:
+    """
+    Finds every alias in a text in one left-to-right pass.
+
+    The aliases go into a trie keyed by word, so each word of the text costs
+    one dict lookup unless it starts an alias; only then does the scan walk
+    forward, and it takes the longest alias that fits ("Amon-Ra St. Brown",
+    not "St. Brown"; "Kansas City Chiefs", not "Chiefs"). Tokenizing is a
+    single regex pass, so this stays fast with thousands of aliases where an
+    alternation regex slows down with every one added.
+    """
+
+    def __init__(self, aliases: dict):
+        self.trie = {}
+        for alias, value in aliases.items():
+            node = self.trie
+            for word in alias.split():
+                node = node.setdefault(word, {})
+            node[""] = value
+
+    def find(self, text: str) -> list:
+        """(char_offset, value) for each non-overlapping alias in `text`."""
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters lowercase to two; keep offsets into `text`
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        words = [(m.start(), m.group()) for m in WORD.finditer(lowered)]
+        trie = self.trie
+        found = []
+        i, n = 0, len(words)
+        while i < n:
+            node = trie.get(words[i][1])
+            if node is None:
+                i += 1
+                continue
+            best = (i + 1, node[""]) if "" in node else None
+            j = i + 1
+            while j < n:
+                node = node.get(words[j][1])
+                if node is None:
+                    break
+                j += 1
+                if "" in node:
+                    best = (j, node[""])
+            if best is None:
+                i += 1
+            else:
+                found.append((words[i][0], best[1]))
+                i = best[0]
+        return found
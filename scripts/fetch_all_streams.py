@@ -1,93 +1,116 @@
 #!/usr/bin/env python3
 """Fetch all livestream metadata from Swolecast channel with real dates."""
 
+import argparse
 import json
 import subprocess
 import sys
+import time
 from pathlib import Path
 
+from fetch_jobs import open_job_store
+from instrumentation import profiled
+from youtube_fetch import YTDLP, add_fetch_arguments, fetch_all, timing_stats
+
 OUTPUT_PATH = Path(__file__).parent.parent / "data/youtube_metadata.json"
 CHANNEL_STREAMS_URL = "https://www.youtube.com/channel/UCRUA9P6vB_O9sEKrEluPETQ/streams"
 
-def get_video_ids():
-    """Get all video IDs from the channel's streams tab."""
-    result = subprocess.run(
-        ["yt-dlp", "--flat-playlist", "--print", "id", CHANNEL_STREAMS_URL],
-        capture_output=True,
-        text=True,
-        timeout=120
+def get_video_ids(known: set | None = None, stop_after: int = 0):
+    """
+    Get video IDs from the channel's streams tab, newest first.
+    With `known` and `stop_after`, stop reading the listing (and kill
+    yt-dlp) once `stop_after` known IDs in a row have gone by.
+    """
+    command = [YTDLP, "--flat-playlist", "--print", "id"]
+    if stop_after:
+        # Emit entries as each page arrives instead of after the full crawl
+        command.append("--lazy-playlist")
+    process = subprocess.Popen(
+        command + [CHANNEL_STREAMS_URL],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
     )
-    if result.returncode != 0:
-        print(f"Error getting video list: {result.stderr}", file=sys.stderr)
+    
+    ids = []
+    known_run = 0
+    stopped_early = False
+    try:
+        for line in process.stdout:
+            video_id = line.strip()
+            if not video_id:
+                continue
+            ids.append(video_id)
+            if stop_after and known is not None:
+                known_run = known_run + 1 if video_id in known else 0
+                if known_run >= stop_after:
+                    stopped_early = True
+                    break
+        if stopped_early:
+            process.kill()
+        _, stderr = process.communicate(timeout=120)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        print("Error getting video list: yt-dlp timed out", file=sys.stderr)
         return []
     
-    ids = [line.strip() for line in result.stdout.strip().split('\n') if line.strip()]
+    if not stopped_early and process.returncode != 0:
+        print(f"Error getting video list: {stderr}", file=sys.stderr)
+        return []
+    
+    if stopped_early:
+        print(f"Stopped listing after {known_run} already-known videos")
     return ids
 
-def fetch_video_metadata(video_id: str) -> dict | None:
-    """Fetch metadata for a single video."""
-    try:
-        result = subprocess.run(
-            ["yt-dlp", "--dump-json", f"https://www.youtube.com/watch?v={video_id}"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                "id": video_id,
-                "title": data.get("title"),
-                "upload_date": data.get("upload_date"),  # YYYYMMDD format
-                "duration": data.get("duration"),
-                "channel": data.get("channel"),
-                "view_count": data.get("view_count"),
-                "url": f"https://www.youtube.com/watch?v={video_id}"
-            }
-    except Exception as e:
-        print(f"  Error fetching {video_id}: {e}", file=sys.stderr)
-    return None
-
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_fetch_arguments(parser)
+    parser.add_argument("--incremental", action="store_true",
+                        help="stop scanning the channel at a run of already-known videos")
+    parser.add_argument("--known-run", type=int, default=10,
+                        help="consecutive known IDs that end an incremental scan (default: 10)")
+    parser.add_argument("--ttl-days", type=float, default=0,
+                        help="refetch videos whose metadata is older than this; 0 never refreshes (default: 0)")
+    args = parser.parse_args()
+
+    # Resume from the job store; the JSON file is only an export
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    store = open_job_store(OUTPUT_PATH)
+    
     print("Fetching video IDs from channel...")
-    video_ids = get_video_ids()
+    if args.incremental:
+        video_ids = get_video_ids(store.known_ids(), args.known_run)
+    else:
+        video_ids = get_video_ids()
     print(f"Found {len(video_ids)} videos")
     
-    # Load existing progress
-    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    existing = {}
-    if OUTPUT_PATH.exists():
-        with open(OUTPUT_PATH) as f:
-            existing = {v["id"]: v for v in json.load(f)}
-        print(f"Loaded {len(existing)} existing entries")
-    
-    results = list(existing.values())
-    processed_ids = set(existing.keys())
-    new_count = 0
+    new_ids = store.enqueue(video_ids)
+    if args.ttl_days > 0:
+        stale = store.mark_stale(args.ttl_days)
+        print(f"Refreshing {stale} videos older than {args.ttl_days:g} days")
+    pending = store.pending(args.max_attempts)
+    print(f"{new_ids} new videos, {len(pending)} to fetch "
+          f"(concurrency {args.concurrency}, {args.rate}/s)...")
     
-    for i, video_id in enumerate(video_ids):
-        if video_id in processed_ids:
-            continue
-        
-        print(f"[{i+1}/{len(video_ids)}] Fetching {video_id}...")
-        metadata = fetch_video_metadata(video_id)
-        
-        if metadata:
-            results.append(metadata)
-            processed_ids.add(video_id)
-            new_count += 1
-            
-            # Save progress every 10 videos
-            if new_count % 10 == 0:
-                with open(OUTPUT_PATH, "w") as f:
-                    json.dump(results, f, indent=2)
-                print(f"  Saved {len(results)} videos")
+    fetched = []
+    started = time.monotonic()
+    for done, result in enumerate(fetch_all(pending, args), 1):
+        store.record(result)
+        fetched.append(result)
+        status = "ok" if result["metadata"] else f"FAILED: {result['error']}"
+        print(f"[{done}/{len(pending)}] {result['id']} {result['elapsed']:.1f}s "
+              f"x{result['attempts']} {status}")
     
-    # Final save
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(results, f, indent=2)
+    total = store.export_json(OUTPUT_PATH)
+    counts = store.counts()
+    store.close()
     
-    print(f"\nDone! Added {new_count} new videos. Total: {len(results)}")
+    fetched_count = sum(1 for r in fetched if r["metadata"])
+    print(f"\nDone! Fetched {fetched_count} videos ({new_ids} new). Total: {total}")
+    print(f"Jobs: {counts}")
+    print(f"Timing: {json.dumps(timing_stats(fetched, time.monotonic() - started))}")
 
 if __name__ == "__main__":
-    main()
+    with profiled("fetch_all_streams"):
+        main()
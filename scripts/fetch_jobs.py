@@ -0,0 +1,135 @@
+"""Resumable SQLite job store for the YouTube metadata fetch scripts.
+
+Each video ID is one row, updated in place as results arrive, so a run costs
+one small write per video and a crash loses at most the in-flight fetches.
+`youtube_metadata.json` is exported from the store at the end of a run.
+"""
+
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+JOBS_PATH = Path(__file__).parent.parent / "data/fetch_jobs.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fetch_jobs (
+    video_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,     -- runs that tried this video
+    last_error TEXT,
+    metadata TEXT,                           -- JSON, same shape as youtube_metadata.json
+    fetched_at TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_fetch_jobs_status ON fetch_jobs(status);
+"""
+
+
+class FetchJobStore:
+    """Pending/done/failed state, attempt counts and last error per video ID."""
+
+    def __init__(self, path: Path = JOBS_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        # WAL keeps per-result commits cheap and the file readable mid-run
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM fetch_jobs LIMIT 1").fetchone() is None
+
+    def import_json(self, path: Path) -> int:
+        """Seed the store from a legacy youtube_metadata.json checkpoint."""
+        with open(path) as f:
+            videos = json.load(f)
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany("""
+                INSERT OR IGNORE INTO fetch_jobs
+                (video_id, status, attempts, metadata, updated_at)
+                VALUES (?, 'done', 1, ?, ?)
+            """, [(v["id"], json.dumps(v), now) for v in videos])
+        return len(videos)
+
+    def enqueue(self, video_ids: list) -> int:
+        """Add unseen IDs as pending; returns how many were new."""
+        before = self.conn.total_changes
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO fetch_jobs (video_id, updated_at) VALUES (?, ?)",
+                [(video_id, now) for video_id in video_ids]
+            )
+        return self.conn.total_changes - before
+
+    def known_ids(self) -> set:
+        """Every ID the store has seen, fetched or not."""
+        return {row[0] for row in self.conn.execute("SELECT video_id FROM fetch_jobs")}
+
+    def mark_stale(self, ttl_days: float) -> int:
+        """Requeue fetched videos whose metadata is older than `ttl_days`."""
+        cutoff = (datetime.now() - timedelta(days=ttl_days)).isoformat()
+        with self.conn:
+            cursor = self.conn.execute("""
+                UPDATE fetch_jobs SET status = 'pending', attempts = 0, updated_at = ?
+                WHERE status = 'done' AND (fetched_at IS NULL OR fetched_at < ?)
+            """, (datetime.now().isoformat(), cutoff))
+        return cursor.rowcount
+
+    def pending(self, max_attempts: int = 5) -> list:
+        """IDs still to fetch: pending, or failed with attempts left, oldest first."""
+        rows = self.conn.execute("""
+            SELECT video_id FROM fetch_jobs
+            WHERE status = 'pending' OR (status = 'failed' AND attempts < ?)
+            ORDER BY rowid
+        """, (max_attempts,)).fetchall()
+        return [row[0] for row in rows]
+
+    def record(self, result: dict):
+        """Store one fetch result (as yielded by youtube_fetch.fetch_many) as one attempt."""
+        now = datetime.now().isoformat()
+        with self.conn:
+            if result["metadata"]:
+                self.conn.execute("""
+                    UPDATE fetch_jobs
+                    SET status = 'done', attempts = attempts + 1, last_error = NULL,
+                        metadata = ?, fetched_at = ?, updated_at = ?
+                    WHERE video_id = ?
+                """, (json.dumps(result["metadata"]), now, now, result["id"]))
+            else:
+                self.conn.execute("""
+                    UPDATE fetch_jobs
+                    SET status = 'failed', attempts = attempts + 1, last_error = ?, updated_at = ?
+                    WHERE video_id = ?
+                """, (result["error"], now, result["id"]))
+
+    def counts(self) -> dict:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM fetch_jobs GROUP BY status")
+        return dict(rows.fetchall())
+
+    def export_json(self, path: Path) -> int:
+        """Write every fetched video to `path` atomically; returns the count."""
+        rows = self.conn.execute(
+            "SELECT metadata FROM fetch_jobs WHERE metadata IS NOT NULL ORDER BY rowid"
+        ).fetchall()
+        videos = [json.loads(row[0]) for row in rows]
+        tmp_path = Path(f"{path}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(videos, f, indent=2)
+        os.replace(tmp_path, path)
+        return len(videos)
+
+
+def open_job_store(export_path: Path) -> FetchJobStore:
+    """Open the job store, seeding it from an existing export on first use."""
+    store = FetchJobStore()
+    if store.is_empty() and Path(export_path).exists():
+        imported = store.import_json(export_path)
+        print(f"Seeded job store with {imported} videos from {export_path}")
+    return store
@@ -1,80 +1,54 @@
 #!/usr/bin/env python3
 """Fetch real metadata (dates, durations) for all YouTube videos using yt-dlp."""
 
+import argparse
 import json
-import subprocess
-import sys
+import time
 from pathlib import Path
-from datetime import datetime
+
+from fetch_jobs import open_job_store
+from instrumentation import profiled
+from youtube_fetch import add_fetch_arguments, fetch_all, timing_stats
 
 STREAMS_PATH = Path(__file__).parent.parent.parent / "swolecast-streams/public/data/streams.json"
 OUTPUT_PATH = Path(__file__).parent.parent / "data/youtube_metadata.json"
 
-def fetch_video_metadata(video_id: str) -> dict | None:
-    """Fetch metadata for a single video."""
-    try:
-        result = subprocess.run(
-            ["yt-dlp", "--dump-json", f"https://www.youtube.com/watch?v={video_id}"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        if result.returncode == 0:
-            data = json.loads(result.stdout)
-            return {
-                "id": video_id,
-                "title": data.get("title"),
-                "upload_date": data.get("upload_date"),  # YYYYMMDD format
-                "duration": data.get("duration"),
-                "channel": data.get("channel"),
-                "view_count": data.get("view_count"),
-                "url": f"https://www.youtube.com/watch?v={video_id}"
-            }
-    except Exception as e:
-        print(f"  Error fetching {video_id}: {e}", file=sys.stderr)
-    return None
-
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_fetch_arguments(parser)
+    args = parser.parse_args()
+
     # Load existing streams
     with open(STREAMS_PATH) as f:
         streams = json.load(f)
     
     print(f"Found {len(streams)} videos to process")
     
-    # Check for existing progress
+    # Resume from the job store; the JSON file is only an export
     OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    existing = {}
-    if OUTPUT_PATH.exists():
-        with open(OUTPUT_PATH) as f:
-            existing = {v["id"]: v for v in json.load(f)}
-        print(f"Loaded {len(existing)} existing entries")
-    
-    results = list(existing.values())
-    processed_ids = set(existing.keys())
+    store = open_job_store(OUTPUT_PATH)
+    store.enqueue([stream["id"] for stream in streams])
+    pending = store.pending(args.max_attempts)
+    print(f"Fetching {len(pending)} videos "
+          f"(concurrency {args.concurrency}, {args.rate}/s)...")
     
-    for i, stream in enumerate(streams):
-        video_id = stream["id"]
-        if video_id in processed_ids:
-            continue
-            
-        print(f"[{i+1}/{len(streams)}] Fetching {video_id}...")
-        metadata = fetch_video_metadata(video_id)
-        
-        if metadata:
-            results.append(metadata)
-            processed_ids.add(video_id)
-            
-            # Save progress every 10 videos
-            if len(results) % 10 == 0:
-                with open(OUTPUT_PATH, "w") as f:
-                    json.dump(results, f, indent=2)
-                print(f"  Saved {len(results)} videos")
+    fetched = []
+    started = time.monotonic()
+    for done, result in enumerate(fetch_all(pending, args), 1):
+        store.record(result)
+        fetched.append(result)
+        status = "ok" if result["metadata"] else f"FAILED: {result['error']}"
+        print(f"[{done}/{len(pending)}] {result['id']} {result['elapsed']:.1f}s "
+              f"x{result['attempts']} {status}")
     
-    # Final save
-    with open(OUTPUT_PATH, "w") as f:
-        json.dump(results, f, indent=2)
+    total = store.export_json(OUTPUT_PATH)
+    counts = store.counts()
+    store.close()
     
-    print(f"\nDone! Saved {len(results)} videos to {OUTPUT_PATH}")
+    print(f"\nDone! Saved {total} videos to {OUTPUT_PATH}")
+    print(f"Jobs: {counts}")
+    print(f"Timing: {json.dumps(timing_stats(fetched, time.monotonic() - started))}")
 
 if __name__ == "__main__":
-    main()
+    with profiled("fetch_youtube_metadata"):
+        main()
@@ -0,0 +1,73 @@
+"""Layout of the transcripts_fts full-text index.
+
+Older databases keep their own copy of every transcript inside transcripts_fts.
+After scripts/migrate_fts_external.py the index is an external-content FTS5
+table that reads text from `transcripts` and is kept in sync by the triggers
+below, so writers must touch `transcripts` only.
+"""
+
+import re
+
+TRIGGERS = {
+    "transcripts_fts_ai": """
+        CREATE TRIGGER IF NOT EXISTS transcripts_fts_ai AFTER INSERT ON transcripts BEGIN
+            INSERT INTO transcripts_fts (rowid, episode_id, content)
+            VALUES (new.rowid, new.episode_id, new.content);
+        END
+    """,
+    "transcripts_fts_ad": """
+        CREATE TRIGGER IF NOT EXISTS transcripts_fts_ad AFTER DELETE ON transcripts BEGIN
+            INSERT INTO transcripts_fts (transcripts_fts, rowid, episode_id, content)
+            VALUES ('delete', old.rowid, old.episode_id, old.content);
+        END
+    """,
+    "transcripts_fts_au": """
+        CREATE TRIGGER IF NOT EXISTS transcripts_fts_au AFTER UPDATE ON transcripts BEGIN
+            INSERT INTO transcripts_fts (transcripts_fts, rowid, episode_id, content)
+            VALUES ('delete', old.rowid, old.episode_id, old.content);
+            INSERT INTO transcripts_fts (rowid, episode_id, content)
+            VALUES (new.rowid, new.episode_id, new.content);
+        END
+    """,
+}
+
+
+def fts_sql(conn) -> str:
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'transcripts_fts'"
+    ).fetchone()
+    return row[0] if row else ""
+
+
+def has_fts(conn) -> bool:
+    """False once scripts/compress_transcripts.py has handed search to segments_fts."""
+    return fts_sql(conn) != ""
+
+
+def fts_is_external(conn) -> bool:
+    """True when transcripts_fts indexes `transcripts` instead of holding its own copy."""
+    return re.search(r"content\s*=\s*['\"]?transcripts\b", fts_sql(conn)) is not None
+
+
+def create_triggers(conn):
+    for sql in TRIGGERS.values():
+        conn.execute(sql)
+
+
+def drop_triggers(conn):
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def restore_triggers(conn) -> bool:
+    """
+    Recreate any missing sync triggers on an external-content index and
+    rebuild it, since writes made without them never reached it. True if
+    anything was missing.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    if set(TRIGGERS) <= existing:
+        return False
+    conn.execute("INSERT INTO transcripts_fts(transcripts_fts) VALUES ('rebuild')")
+    create_triggers(conn)
+    return True
@@ -2,15 +2,22 @@
 """Import durations and mp3 URLs from RSS feed into podcast data."""
 
 import xml.etree.ElementTree as ET
+import argparse
+import gzip
 import json
 import re
 from pathlib import Path
 from datetime import datetime
 
+from instrumentation import profiled
+
 RSS_PATH = "/tmp/swolecast_rss.xml"
 PODCASTS_PATH = Path(__file__).parent.parent.parent / "swolecast-streams/public/data/podcasts.json"
 OUTPUT_PATH = Path(__file__).parent.parent / "data/podcasts_with_duration.json"
 
+ITUNES_DURATION = "{http://www.itunes.com/dtds/podcast-1.0.dtd}duration"
+GZIP_MAGIC = b"\x1f\x8b"
+
 def parse_duration(duration_str: str) -> int:
     """Convert duration string (H:MM:SS or MM:SS) to seconds."""
     if not duration_str:
@@ -41,35 +48,79 @@ def extract_episode_id(url: str) -> str:
         return match.group(1)
     return None
 
-def main():
-    # Parse RSS
-    tree = ET.parse(RSS_PATH)
-    root = tree.getroot()
-    channel = root.find('channel')
-    items = channel.findall('item')
+def open_feed(path):
+    """Open an RSS feed for binary reading, transparently gunzipping it."""
+    with open(path, "rb") as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    return gzip.open(path, "rb") if compressed else open(path, "rb")
+
+def rss_episode(item) -> dict:
+    """Fields we keep from one <item> element."""
+    title = item.find('title').text if item.find('title') is not None else ''
+    pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ''
+    duration = item.find(ITUNES_DURATION)
+    duration_seconds = parse_duration(duration.text) if duration is not None else 0
+    enclosure = item.find('enclosure')
+    mp3_url = enclosure.get('url') if enclosure is not None else None
+    episode_id = extract_episode_id(mp3_url) if mp3_url else None
     
-    ns = {'itunes': 'http://www.itunes.com/dtds/podcast-1.0.dtd'}
+    return {
+        "id": episode_id,
+        "title": title,
+        "pub_date": pub_date,
+        "pub_date_simple": parse_rss_date(pub_date),
+        "duration_seconds": duration_seconds,
+        "mp3_url": mp3_url
+    }
+
+def iter_rss_episodes(path, known_ids: set = None):
+    """
+    Stream episodes from the feed one <item> at a time, clearing each element
+    once it is read so memory stays flat however long the back catalog is.
+    With `known_ids`, stop at the first item whose Acast ID is already known
+    (feeds list newest first, so everything after it has been seen too).
+    """
+    with open_feed(path) as f:
+        channel = None
+        for event, elem in ET.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elem.tag == "channel":
+                    channel = elem
+                continue
+            if elem.tag != "item":
+                continue
+            episode = rss_episode(elem)
+            elem.clear()
+            if channel is not None:
+                channel.remove(elem)
+            if known_ids is not None and episode["id"] in known_ids:
+                return
+            yield episode
+
+def load_previous_output() -> list:
+    if not OUTPUT_PATH.exists():
+        return []
+    with open(OUTPUT_PATH) as f:
+        return json.load(f)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rss", default=RSS_PATH, help=f"RSS feed, optionally gzipped (default: {RSS_PATH})")
+    parser.add_argument("--incremental", action="store_true",
+                        help="read only the head of the feed, stopping at the first episode already "
+                             "in the previous output, and keep earlier durations")
+    args = parser.parse_args()
     
-    print(f"Parsing {len(items)} RSS episodes...")
+    previous = load_previous_output() if args.incremental else []
+    known_ids = None
+    if args.incremental:
+        known_ids = {extract_episode_id(p["mp3_url"]) for p in previous if p.get("mp3_url")}
+        known_ids.discard(None)
+        print(f"Incremental: {len(known_ids)} RSS episodes already known")
     
-    rss_episodes = []
-    for item in items:
-        title = item.find('title').text if item.find('title') is not None else ''
-        pub_date = item.find('pubDate').text if item.find('pubDate') is not None else ''
-        duration = item.find('itunes:duration', ns)
-        duration_seconds = parse_duration(duration.text) if duration is not None else 0
-        enclosure = item.find('enclosure')
-        mp3_url = enclosure.get('url') if enclosure is not None else None
-        episode_id = extract_episode_id(mp3_url) if mp3_url else None
-        
-        rss_episodes.append({
-            "id": episode_id,
-            "title": title,
-            "pub_date": pub_date,
-            "pub_date_simple": parse_rss_date(pub_date),
-            "duration_seconds": duration_seconds,
-            "mp3_url": mp3_url
-        })
+    # Parse RSS
+    print(f"Parsing RSS episodes from {args.rss}...")
+    rss_episodes = list(iter_rss_episodes(args.rss, known_ids))
     
     print(f"Extracted {len(rss_episodes)} episodes from RSS")
     
@@ -79,6 +130,18 @@ def main():
     
     print(f"Loaded {len(podcasts)} existing podcasts")
     
+    # Carry over what earlier runs matched; only new RSS items are matched below
+    carried = 0
+    if previous:
+        previous_by_id = {p.get("id"): p for p in previous if p.get("mp3_url")}
+        for podcast in podcasts:
+            earlier = previous_by_id.get(podcast.get("id"))
+            if earlier and not podcast.get("mp3_url"):
+                podcast["duration_seconds"] = earlier.get("duration_seconds", 0)
+                podcast["mp3_url"] = earlier["mp3_url"]
+                carried += 1
+        print(f"Kept RSS data for {carried} podcasts from the previous run")
+    
     # Build lookup by ID and by date+title similarity
     rss_by_id = {e["id"]: e for e in rss_episodes if e["id"]}
     rss_by_date = {}
@@ -151,4 +214,5 @@ def main():
         print(f"  {p.get('title', '')[:50]} - {p.get('duration_seconds', 0)}s")
 
 if __name__ == "__main__":
-    main()
+    with profiled("import_rss_durations"):
+        main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Index player and team mentions in every transcript (see entities.py).
+
+The gazetteer is the built-in teams and players plus every name in the
+source database's `players` column. Transcripts are scanned in parallel,
+one process per core; each process opens the archive read-only and decodes
+its own transcripts. Only transcripts not yet scanned with this gazetteer
+are scanned, unless --rebuild.
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from multiprocessing import Pool
+from pathlib import Path
+
+import entities
+from instrumentation import phase, profiled
+import transcript_codec
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+# Where import_podcasts.py imports from
+SOURCE_DB = Path.home() / "clawd/projects/swolecast-db/swolecast.db"
+
+_worker = {}
+
+def source_names(path: Path) -> list:
+    """Every player named in the source database, or none if it isn't there."""
+    if not path.exists():
+        print(f"No source database at {path}; using the built-in gazetteer only")
+        return []
+    source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = source.execute("SELECT players FROM podcast_episodes WHERE players IS NOT NULL").fetchall()
+    except sqlite3.OperationalError:  # no players column
+        rows = []
+    source.close()
+    names = set()
+    for (value,) in rows:
+        names.update(entities.source_players(value))
+    return sorted(names)
+
+def init_worker(db_path: str, aliases: dict):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    _worker["conn"] = conn
+    _worker["text_sql"] = transcript_codec.text_sql(conn)
+    _worker["gazetteer"] = entities.Gazetteer(aliases)
+
+def scan(episode_ids: list) -> list:
+    """INSERT_MENTION rows for a batch of transcripts."""
+    conn, gazetteer = _worker["conn"], _worker["gazetteer"]
+    rows = []
+    for episode_id, content in conn.execute(
+        f"SELECT episode_id, {_worker['text_sql']} FROM transcripts "
+        f"WHERE episode_id IN ({', '.join('?' * len(episode_ids))})",
+        episode_ids
+    ):
+        rows.extend((entity_id, episode_id, offset) for offset, entity_id in gazetteer.find(content or ""))
+    return rows
+
+def scan_all(db_path: Path, aliases: dict, todo: list, workers: int, batch: int) -> list:
+    batches = [todo[i:i + batch] for i in range(0, len(todo), batch)]
+    if workers <= 1 or len(batches) <= 1:
+        init_worker(str(db_path), aliases)
+        return [row for ids in batches for row in scan(ids)]
+    rows = []
+    with Pool(workers, initializer=init_worker, initargs=(str(db_path), aliases)) as pool:
+        for i, found in enumerate(pool.imap_unordered(scan, batches), 1):
+            rows.extend(found)
+            if i % 20 == 0:
+                print(f"  {min(i * batch, len(todo))}/{len(todo)} transcripts, {len(rows)} mentions")
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--source", type=Path, default=SOURCE_DB, help="source podcast database (for player names)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="scanning processes (default: one per core)")
+    parser.add_argument("--batch", type=int, default=50, help="transcripts per work unit (default: 50)")
+    parser.add_argument("--rebuild", action="store_true", help="rescan every transcript")
+    parser.add_argument("--top", type=int, default=10, help="most-mentioned entities to list (default: 10)")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    kinds, names = entities.build_gazetteer(source_names(args.source))
+    gazetteer = entities.gazetteer_hash(names)
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    entities.create_schema(conn)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        ids = entities.save_gazetteer(conn, kinds, names)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    aliases = {alias: ids[name] for alias, name in names.items()}
+
+    if args.rebuild:
+        todo = [row[0] for row in conn.execute("SELECT episode_id FROM transcripts")]
+    else:
+        todo = [row[0] for row in conn.execute("""
+            SELECT t.episode_id FROM transcripts t
+            LEFT JOIN entity_scans s ON s.episode_id = t.episode_id
+            WHERE s.gazetteer IS NOT ?
+        """, (gazetteer,))]
+    total = conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+    print(f"Gazetteer: {len(kinds)} entities, {len(aliases)} aliases")
+    print(f"Scanning {len(todo)} of {total} transcripts with {args.workers} workers...")
+
+    with phase("scan"):
+        rows = scan_all(args.db, aliases, todo, args.workers, args.batch)
+
+    with phase("write"):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if len(todo) == total:
+                conn.execute("DELETE FROM entity_mentions")
+                conn.execute("DELETE FROM entity_scans")
+            else:
+                conn.executemany("DELETE FROM entity_mentions WHERE episode_id = ?", ((e,) for e in todo))
+            # Primary key order, so the inserts append to the table's b-tree
+            rows.sort()
+            conn.executemany(entities.INSERT_MENTION, rows)
+            conn.executemany(
+                "INSERT OR REPLACE INTO entity_scans (episode_id, gazetteer) VALUES (?, ?)",
+                ((episode_id, gazetteer) for episode_id in todo)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    mentions = conn.execute("SELECT COUNT(*) FROM entity_mentions").fetchone()[0]
+    top = conn.execute("""
+        SELECT e.name, COUNT(*) AS mentions, COUNT(DISTINCT m.episode_id) AS episodes
+        FROM entity_mentions m JOIN entities e ON e.id = m.entity_id
+        GROUP BY m.entity_id ORDER BY mentions DESC LIMIT ?
+    """, (args.top,)).fetchall()
+    conn.close()
+
+    print(f"\n✅ Entity index ready!")
+    print(f"   Scanned: {len(todo)} transcripts")
+    print(f"   New mentions: {len(rows)}")
+    print(f"   Total mentions: {mentions}")
+    for name, count, episodes in top:
+        print(f"   {name}: {count} mentions in {episodes} episodes")
+    print(f"   Took {time.monotonic() - started:.2f}s")
+
+if __name__ == "__main__":
+    with profiled("index_entities"):
+        main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Count terms per episode and per month for trend queries (see term_counts.py).
+
+Only episodes whose transcript text or publish month changed since the last
+run are recounted, so after an import this touches just the new episodes.
+The first run (or --rebuild) loads everything with the triggers off and
+totals the months in one pass at the end.
+"""
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from instrumentation import profiled
+import term_counts
+import transcript_codec
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--rebuild", action="store_true", help="recount every transcript")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    term_counts.create_schema(conn)
+    scans = {row[0]: (row[1], row[2]) for row in conn.execute(
+        "SELECT episode_id, text_hash, month FROM term_scans"
+    )}
+    bulk = args.rebuild or not scans
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if bulk:
+            # Months are totalled in one GROUP BY at the end instead of row by row
+            term_counts.drop_triggers(conn)
+            for table in ("episode_terms", "term_months", "term_scans"):
+                conn.execute(f"DELETE FROM {table}")
+            scans = {}
+        term_ids = term_counts.TermIds(conn)
+
+        seen = counted = rows = 0
+        for episode_id, content, published_at in conn.execute(f"""
+            SELECT t.episode_id, {transcript_codec.text_sql(conn)}, e.published_at
+            FROM transcripts t LEFT JOIN episodes e ON e.id = t.episode_id
+        """):
+            seen += 1
+            content = content or ""
+            state = (term_counts.text_hash(content), term_counts.month_of(published_at))
+            if scans.get(episode_id) == state:
+                continue
+            if episode_id in scans:
+                conn.execute("DELETE FROM episode_terms WHERE episode_id = ?", (episode_id,))
+            counts = term_counts.count_terms(content)
+            ids = term_ids.lookup(counts)
+            conn.executemany(term_counts.INSERT_EPISODE_TERM, (
+                (episode_id, ids[term], state[1], count) for term, count in counts.items()
+            ))
+            conn.execute(
+                "INSERT OR REPLACE INTO term_scans (episode_id, text_hash, month) VALUES (?, ?, ?)",
+                (episode_id, *state)
+            )
+            counted += 1
+            rows += len(counts)
+            if counted % 500 == 0:
+                print(f"  {counted} episodes counted, {rows} term rows")
+
+        if bulk:
+            conn.execute(term_counts.REBUILD_MONTHS)
+            term_counts.create_triggers(conn)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    terms, months, series = conn.execute("""
+        SELECT (SELECT COUNT(*) FROM terms),
+               (SELECT COUNT(DISTINCT month) FROM term_scans WHERE month IS NOT NULL),
+               (SELECT COUNT(*) FROM term_months)
+    """).fetchone()
+    undated = conn.execute("SELECT COUNT(*) FROM term_scans WHERE month IS NULL").fetchone()[0]
+    conn.close()
+
+    print(f"\n✅ Term counts ready!")
+    print(f"   Counted: {counted} of {seen} transcripts ({rows} term rows)")
+    print(f"   Terms: {terms}")
+    print(f"   Months: {months} ({series} term/month rows)")
+    if undated:
+        print(f"   Undated episodes (no trend rows): {undated}")
+    print(f"   Took {time.monotonic() - started:.2f}s")
+
+if __name__ == "__main__":
+    with profiled("index_terms"):
+        main()
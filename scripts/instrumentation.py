@@ -0,0 +1,285 @@
+"""Opt-in profiling for the ingest scripts.
+
+Every script runs its entry point inside `profiled()`. Profiling is off
+unless the command line has --profile (or --profile=DIR) or SWOLECAST_PROFILE
+is set (to 1, or to a directory). Then the run gets:
+
+- a cProfile of the main thread, saved as .prof and summarized in the report
+- wall and CPU time for the whole run and for each `phase()` block
+- the latency of every subprocess the script starts
+- SQLite time per statement, from execute until its rows are fetched, and
+  how many statements each one ran (from a trace callback, so every
+  executemany row, trigger statement and FTS lookup made while fetching
+  counts)
+
+and a JSON report lands in data/profiles/ (or DIR). --profile also sets
+SWOLECAST_PROFILE, so scripts started by pipeline.py are profiled as well.
+With profiling off, `profiled()` and `phase()` do nothing.
+"""
+
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+ENV_VAR = "SWOLECAST_PROFILE"
+
+DEFAULT_DIR = Path(__file__).parent.parent / "data/profiles"
+
+# Rows kept in the report; the .prof file has everything
+TOP_FUNCTIONS = 40
+TOP_STATEMENTS = 50
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())[:200]
+
+
+class Session:
+    """What one profiled run has collected so far."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.phases = defaultdict(lambda: {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+        self.subprocesses = []
+        self.statements = defaultdict(lambda: {"executes": 0, "statements": 0, "seconds": 0.0})
+        self.local = threading.local()
+
+    def phase_stack(self) -> list:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def trace(self, expanded_sql: str):
+        # The trace sees SQL with its parameters filled in; charge it to the
+        # execute or fetch call that is running, if any, so rows of one
+        # executemany and the trigger statements they fire add up under one
+        # entry
+        sql = getattr(self.local, "sql", None) or normalize_sql(expanded_sql)
+        self.statements[sql]["statements"] += 1
+
+    @contextlib.contextmanager
+    def timing(self, key: str, execute: bool = True):
+        """Charge the block to a normalized statement; fetches add time, not executes."""
+        outer, self.local.sql = getattr(self.local, "sql", None), key
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.statements[key]
+            if execute:
+                entry["executes"] += 1
+            entry["seconds"] += time.perf_counter() - started
+            self.local.sql = outer
+
+
+_session: Session | None = None
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """Time a block of a script as a named phase (nested phases join with '/')."""
+    session = _session
+    if session is None:
+        yield
+        return
+    stack = session.phase_stack()
+    stack.append(name)
+    entry = session.phases["/".join(stack)]
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        entry["calls"] += 1
+        entry["wall_seconds"] += time.perf_counter() - wall
+        entry["cpu_seconds"] += time.process_time() - cpu
+        stack.pop()
+
+
+class TimedCursor(sqlite3.Cursor):
+    # execute() only runs a query to its first row; the rest is stepped as
+    # it is fetched, so fetches are charged to the statement too
+    _profile_key = None
+
+    def execute(self, sql, *args):
+        self._profile_key = normalize_sql(sql)
+        with _timing(self._profile_key):
+            return super().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        self._profile_key = None
+        with _timing(normalize_sql(sql)):
+            return super().executemany(sql, *args)
+
+    def executescript(self, sql):
+        self._profile_key = None
+        with _timing(normalize_sql(sql)):
+            return super().executescript(sql)
+
+    def fetchone(self):
+        with _fetching(self._profile_key):
+            return super().fetchone()
+
+    def fetchmany(self, *args):
+        with _fetching(self._profile_key):
+            return super().fetchmany(*args)
+
+    def fetchall(self):
+        with _fetching(self._profile_key):
+            return super().fetchall()
+
+    def __next__(self):
+        with _fetching(self._profile_key):
+            return super().__next__()
+
+
+class TimedConnection(sqlite3.Connection):
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, *args):
+        return self.cursor().execute(sql, *args)
+
+    def executemany(self, sql, *args):
+        return self.cursor().executemany(sql, *args)
+
+    def executescript(self, sql):
+        return self.cursor().executescript(sql)
+
+
+def _timing(key: str):
+    return _session.timing(key) if _session is not None else contextlib.nullcontext()
+
+
+def _fetching(key: str | None):
+    if _session is None or key is None:
+        return contextlib.nullcontext()
+    return _session.timing(key, execute=False)
+
+
+class TimedPopen(subprocess.Popen):
+    def __init__(self, args, *rest, **kwargs):
+        self._profile_started = time.perf_counter()
+        self._profile_recorded = False
+        super().__init__(args, *rest, **kwargs)
+
+    def wait(self, timeout=None):
+        returncode = super().wait(timeout)
+        if not self._profile_recorded and _session is not None:
+            self._profile_recorded = True
+            args = self.args if isinstance(self.args, str) else " ".join(map(str, self.args))
+            _session.subprocesses.append({
+                "args": args[:300],
+                "seconds": time.perf_counter() - self._profile_started,
+                "returncode": returncode,
+            })
+        return returncode
+
+
+def requested_dir() -> Path | None:
+    """
+    Where reports should go, or None when profiling is off. Removes
+    --profile[=DIR] from sys.argv so the script's own parser never sees it.
+    """
+    target = None
+    for arg in list(sys.argv[1:]):
+        if arg == "--profile" or arg.startswith("--profile="):
+            sys.argv.remove(arg)
+            target = arg.partition("=")[2] or "1"
+    if target is None:
+        target = os.environ.get(ENV_VAR, "")
+    if target in ("", "0"):
+        return None
+    return DEFAULT_DIR if target == "1" else Path(target)
+
+
+def profile_rows(profiler: cProfile.Profile) -> list:
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": function,
+            "location": "built-in" if filename == "~" else f"{filename}:{line}",
+            "calls": calls,
+            "tottime": tottime,
+            "cumtime": cumtime,
+        })
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:TOP_FUNCTIONS]
+
+
+def report(session: Session, profiler: cProfile.Profile, wall: float, cpu: float, out_dir: Path) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"{session.name}-{datetime.now():%Y%m%d-%H%M%S}-{os.getpid()}"
+    prof_path = out_dir / f"{stem}.prof"
+    profiler.dump_stats(prof_path)
+
+    statements = sorted(
+        ({"sql": sql, **entry} for sql, entry in session.statements.items()),
+        key=lambda row: (row["seconds"], row["statements"]), reverse=True
+    )
+
+    data = {
+        "script": session.name,
+        "argv": sys.argv,
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        "phases": [{"name": name, **entry} for name, entry in session.phases.items()],
+        "subprocesses": session.subprocesses,
+        "sqlite": {
+            "statements": sum(row["statements"] for row in statements),
+            "execute_seconds": sum(row["seconds"] for row in statements),
+            "top": statements[:TOP_STATEMENTS],
+        },
+        "functions": profile_rows(profiler),
+        "profile_path": str(prof_path),
+    }
+    report_path = out_dir / f"{stem}.json"
+    report_path.write_text(json.dumps(data, indent=2))
+    return report_path
+
+
+@contextlib.contextmanager
+def profiled(name: str):
+    """Run a script's entry point, profiled if --profile or SWOLECAST_PROFILE asks for it."""
+    global _session
+    out_dir = requested_dir()
+    if out_dir is None or _session is not None:
+        yield
+        return
+
+    # Child scripts (pipeline stages) inherit the setting
+    os.environ[ENV_VAR] = str(out_dir)
+    session = _session = Session(name)
+    original_connect, original_popen = sqlite3.connect, subprocess.Popen
+
+    def connect(*args, **kwargs):
+        kwargs.setdefault("factory", TimedConnection)
+        conn = original_connect(*args, **kwargs)
+        conn.set_trace_callback(session.trace)
+        return conn
+
+    sqlite3.connect = connect
+    subprocess.Popen = TimedPopen
+    profiler = cProfile.Profile()
+    wall, cpu = time.perf_counter(), time.process_time()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        sqlite3.connect, subprocess.Popen = original_connect, original_popen
+        _session = None
+        path = report(session, profiler, wall, cpu, out_dir)
+        print(f"\n⏱  Profile: {path} ({wall:.2f}s wall, {cpu:.2f}s CPU)", file=sys.stderr)
@@ -1,17 +1,35 @@
 #!/usr/bin/env python3
 """Match YouTube videos to podcast episodes using duration + date proximity."""
 
+import argparse
 import json
+import sys
+from bisect import bisect_left, bisect_right
 from pathlib import Path
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from instrumentation import profiled
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+except ImportError:  # optimal assignment needs numpy + scipy; greedy works without
+    np = None
+
 # Paths
 YOUTUBE_PATH = Path(__file__).parent.parent / "data/youtube_metadata.json"
 PODCASTS_PATH = Path(__file__).parent.parent / "data/podcasts_with_duration.json"
 OUTPUT_PATH = Path(__file__).parent.parent / "data/matched_episodes.json"
 REPORT_PATH = Path(__file__).parent.parent / "data/match_report.txt"
 
+# Videos and podcasts further apart than this are never paired
+MAX_DATE_DIFF_DAYS = 14
+MIN_COMBINED_SCORE = 0.5
+
+EPOCH = datetime(1970, 1, 1)
+
 def parse_youtube_date(date_str: str) -> datetime | None:
     """Parse YYYYMMDD format."""
     if not date_str or len(date_str) != 8:
@@ -112,52 +130,60 @@ def date_match_score(yt_date: datetime, pod_date: datetime) -> float:
     
     return 0.0
 
-def find_matches(youtube_videos: list, podcasts: list) -> tuple[list, list, list]:
-    """
-    Find matches between YouTube videos and podcasts.
-    Returns: (matches, unmatched_youtube, unmatched_podcasts)
-    """
+def greedy_matches(youtube_videos: list, podcasts: list, yt_dates: list, pod_dates: list) -> list:
+    """Score candidate pairs one at a time and take the best-scoring ones first."""
     matches = []
     matched_yt_ids = set()
     matched_pod_ids = set()
     
-    # Parse dates upfront
-    yt_with_dates = []
-    for yt in youtube_videos:
-        yt_date = parse_youtube_date(yt.get("upload_date"))
-        yt_with_dates.append({**yt, "_date": yt_date})
+    # Dated podcasts sorted by date, so each video's candidates are a bisect window
+    dated_pods = sorted((date, i) for i, date in enumerate(pod_dates) if date)
+    sorted_pod_dates = [date for date, _ in dated_pods]
+    
+    # timedelta.days floors, so widen the window by a day and apply the exact
+    # HARD FILTER below; anything further out can't pass it
+    window = timedelta(days=MAX_DATE_DIFF_DAYS + 1)
     
-    pod_with_dates = []
-    for pod in podcasts:
-        pod_date = parse_podcast_date(pod.get("pub_date"))
-        pod_with_dates.append({**pod, "_date": pod_date})
+    # Records are copied (with their parsed "_date") only once they're a candidate
+    yt_records = {}
+    pod_records = {}
     
     # Sort by confidence: try high-confidence matches first
     candidates = []
-    for yt in yt_with_dates:
-        for pod in pod_with_dates:
+    for y, yt in enumerate(youtube_videos):
+        yt_date = yt_dates[y]
+        if not yt_date:
+            continue
+        
+        lo = bisect_left(sorted_pod_dates, yt_date - window)
+        hi = bisect_right(sorted_pod_dates, yt_date + window)
+        # Visit in original podcast order so score ties break the same way
+        for p in sorted(i for _, i in dated_pods[lo:hi]):
+            pod = podcasts[p]
+            pod_date = pod_dates[p]
+            
+            # HARD FILTER: Must be within 14 days to be considered
+            date_diff = abs((yt_date - pod_date).days)
+            if date_diff > MAX_DATE_DIFF_DAYS:
+                continue
+            
             dur_score = duration_match_score(
                 yt.get("duration"), 
                 pod.get("duration_seconds")
             )
-            date_score = date_match_score(yt.get("_date"), pod.get("_date"))
-            
-            # Calculate date difference for hard filter
-            date_diff = 9999
-            if yt.get("_date") and pod.get("_date"):
-                date_diff = abs((yt["_date"] - pod["_date"]).days)
-            
-            # HARD FILTER: Must be within 14 days to be considered
-            if date_diff > 14:
-                continue
+            date_score = date_match_score(yt_date, pod_date)
             
             # Combined score (duration is more reliable)
             combined_score = (dur_score * 0.7) + (date_score * 0.3)
             
-            if combined_score >= 0.5:  # Minimum threshold
+            if combined_score >= MIN_COMBINED_SCORE:  # Minimum threshold
+                if y not in yt_records:
+                    yt_records[y] = {**yt, "_date": yt_date}
+                if p not in pod_records:
+                    pod_records[p] = {**pod, "_date": pod_date}
                 candidates.append({
-                    "youtube": yt,
-                    "podcast": pod,
+                    "youtube": yt_records[y],
+                    "podcast": pod_records[p],
                     "dur_score": dur_score,
                     "date_score": date_score,
                     "combined_score": combined_score,
@@ -180,6 +206,137 @@ def find_matches(youtube_videos: list, podcasts: list) -> tuple[list, list, list
         matched_yt_ids.add(yt_id)
         matched_pod_ids.add(pod_id)
     
+    return matches
+
+def score_pairs(youtube_videos: list, podcasts: list, yt_dates: list, pod_dates: list) -> dict:
+    """
+    Vectorized duration_match_score / date_match_score for every pair inside the
+    date window (a sparse band of the full video x podcast matrix).
+    Returns parallel arrays for the pairs passing the hard filter and threshold.
+    """
+    def seconds(dates):
+        return np.array([(d - EPOCH).total_seconds() if d else np.nan for d in dates], dtype=float)
+    
+    def durations(values):
+        return np.array([v or 0 for v in values], dtype=float)
+    
+    yt_ts = seconds(yt_dates)
+    pod_ts = seconds(pod_dates)
+    
+    # Candidate band: bisect each video's window into the date-sorted podcasts
+    dated = np.flatnonzero(~np.isnan(pod_ts))
+    dated = dated[np.argsort(pod_ts[dated], kind="stable")]
+    sorted_ts = pod_ts[dated]
+    window = (MAX_DATE_DIFF_DAYS + 1) * 86400
+    has_date = ~np.isnan(yt_ts)
+    lo = np.where(has_date, np.searchsorted(sorted_ts, yt_ts - window, "left"), 0)
+    hi = np.where(has_date, np.searchsorted(sorted_ts, yt_ts + window, "right"), 0)
+    counts = hi - lo
+    yt_idx = np.repeat(np.arange(len(youtube_videos)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pod_idx = dated[np.repeat(lo, counts) + offsets]
+    
+    # Same flooring as timedelta.days, then the HARD FILTER
+    date_diff = np.abs(np.floor((yt_ts[yt_idx] - pod_ts[pod_idx]) / 86400))
+    date_score = np.select(
+        [date_diff == 0, date_diff <= 3, date_diff <= 7, date_diff <= 14, date_diff <= 30],
+        [1.0, 0.9, 0.7, 0.4, 0.2],
+        0.0
+    )
+    
+    yt_dur = durations(yt.get("duration") for yt in youtube_videos)[yt_idx]
+    pod_dur = durations(pod.get("duration_seconds") for pod in podcasts)[pod_idx]
+    dur_diff = np.abs(yt_dur - pod_dur)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = dur_diff / np.maximum(yt_dur, pod_dur)
+    dur_score = np.select(
+        [dur_diff <= 10, ratio <= 0.01, ratio <= 0.03, ratio <= 0.05, ratio <= 0.10],
+        [1.0, 0.95, 0.8, 0.6, 0.3],
+        0.0
+    )
+    dur_score[(yt_dur == 0) | (pod_dur == 0)] = 0.0
+    
+    combined = (dur_score * 0.7) + (date_score * 0.3)
+    keep = (date_diff <= MAX_DATE_DIFF_DAYS) & (combined >= MIN_COMBINED_SCORE)
+    return {
+        "yt_idx": yt_idx[keep],
+        "pod_idx": pod_idx[keep],
+        "dur_score": dur_score[keep],
+        "date_score": date_score[keep],
+        "combined_score": combined[keep],
+        "date_diff": date_diff[keep].astype(int),
+    }
+
+def optimal_matches(youtube_videos: list, podcasts: list, yt_dates: list, pod_dates: list) -> list:
+    """
+    Assign videos to podcasts maximizing the total combined score.
+    
+    Solved as a min-cost full bipartite matching on a sparse matrix: every
+    video gets a private "unmatched" column and every podcast a private
+    "unmatched" row at cost 1, so a real pair (cost 2 - score) is only used
+    when it beats leaving both sides unmatched.
+    """
+    pairs = score_pairs(youtube_videos, podcasts, yt_dates, pod_dates)
+    n_yt, n_pod = len(youtube_videos), len(podcasts)
+    yt_idx, pod_idx = pairs["yt_idx"], pairs["pod_idx"]
+    if not len(yt_idx):
+        return []
+    
+    yt_all = np.arange(n_yt)
+    pod_all = np.arange(n_pod)
+    rows = np.concatenate([yt_idx, yt_all, n_yt + pod_all, n_yt + pod_idx])
+    cols = np.concatenate([pod_idx, n_pod + yt_all, pod_all, n_pod + yt_idx])
+    costs = np.concatenate([
+        2.0 - pairs["combined_score"],  # real pairs
+        np.ones(n_yt),                  # video left unmatched
+        np.ones(n_pod),                 # podcast left unmatched
+        np.full(len(yt_idx), 1e-9),     # pairs the unmatched slots of a real pair
+    ])
+    size = n_yt + n_pod
+    row_ind, col_ind = min_weight_full_bipartite_matching(
+        csr_matrix((costs, (rows, cols)), shape=(size, size))
+    )
+    
+    pair_index = {(int(y), int(p)): k for k, (y, p) in enumerate(zip(yt_idx, pod_idx))}
+    matches = []
+    for y, p in zip(row_ind, col_ind):
+        if y >= n_yt or p >= n_pod:
+            continue
+        k = pair_index[(int(y), int(p))]
+        yt = youtube_videos[y]
+        pod = podcasts[p]
+        matches.append({
+            "youtube": {**yt, "_date": yt_dates[y]},
+            "podcast": {**pod, "_date": pod_dates[p]},
+            "dur_score": float(pairs["dur_score"][k]),
+            "date_score": float(pairs["date_score"][k]),
+            "combined_score": float(pairs["combined_score"][k]),
+            "dur_diff": abs((yt.get("duration") or 0) - (pod.get("duration_seconds") or 0)),
+            "date_diff": int(pairs["date_diff"][k])
+        })
+    
+    matches.sort(key=lambda x: x["combined_score"], reverse=True)
+    return matches
+
+def find_matches(youtube_videos: list, podcasts: list, greedy: bool = False) -> tuple[list, list, list]:
+    """
+    Find matches between YouTube videos and podcasts.
+    Uses optimal assignment when numpy/scipy are installed; `greedy=True`
+    (or missing deps) keeps the original best-first greedy matching.
+    Returns: (matches, unmatched_youtube, unmatched_podcasts)
+    """
+    # Parse dates upfront
+    yt_dates = [parse_youtube_date(yt.get("upload_date")) for yt in youtube_videos]
+    pod_dates = [parse_podcast_date(pod.get("pub_date")) for pod in podcasts]
+    
+    if greedy or np is None:
+        matches = greedy_matches(youtube_videos, podcasts, yt_dates, pod_dates)
+    else:
+        matches = optimal_matches(youtube_videos, podcasts, yt_dates, pod_dates)
+    
+    matched_yt_ids = {match["youtube"]["id"] for match in matches}
+    matched_pod_ids = {match["podcast"]["id"] for match in matches}
+    
     # Find unmatched
     unmatched_youtube = [yt for yt in youtube_videos if yt["id"] not in matched_yt_ids]
     unmatched_podcasts = [pod for pod in podcasts if pod["id"] not in matched_pod_ids]
@@ -187,6 +344,14 @@ def find_matches(youtube_videos: list, podcasts: list) -> tuple[list, list, list
     return matches, unmatched_youtube, unmatched_podcasts
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--greedy", action="store_true",
+                        help="use best-first greedy matching instead of optimal assignment")
+    args = parser.parse_args()
+    
+    if not args.greedy and np is None:
+        print("numpy/scipy not installed; falling back to greedy matching", file=sys.stderr)
+    
     # Load data
     with open(YOUTUBE_PATH) as f:
         youtube_videos = json.load(f)
@@ -198,7 +363,7 @@ def main():
     print(f"Loaded {len(podcasts)} podcasts")
     
     # Find matches
-    matches, unmatched_yt, unmatched_pod = find_matches(youtube_videos, podcasts)
+    matches, unmatched_yt, unmatched_pod = find_matches(youtube_videos, podcasts, greedy=args.greedy)
     
     print(f"\nResults:")
     print(f"  ✅ Matched: {len(matches)}")
@@ -284,4 +449,5 @@ def main():
         print(f"   Duration diff: {match['dur_diff']}s | Date diff: {match['date_diff']} days")
 
 if __name__ == "__main__":
-    main()
+    with profiled("match_youtube_podcasts"):
+        main()
@@ -5,6 +5,8 @@ import json
 from pathlib import Path
 from collections import defaultdict
 
+from instrumentation import profiled
+
 MATCHED_PATH = Path(__file__).parent.parent / "data/matched_episodes.json"
 OUTPUT_PATH = Path(__file__).parent.parent / "data/episodes_final.json"
 
@@ -69,4 +71,5 @@ def main():
             break
 
 if __name__ == "__main__":
-    main()
+    with profiled("merge_duplicates"):
+        main()
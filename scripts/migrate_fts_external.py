@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Convert transcripts_fts to an external-content FTS5 table over transcripts."""
+
+import argparse
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+from fts_schema import create_triggers, fts_is_external, fts_sql, has_fts
+from instrumentation import profiled
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+# Used to check that search results survive the migration unchanged
+SAMPLE_QUERIES = [
+    "mahomes", "kelce", "jefferson", "chase", "mccaffrey", "bijan",
+    "zero rb", "best ball", "waiver wire", "sleeper", "dfs", "rookie",
+    "trade", "injury", "breakout", "super bowl", "draft", "league winner",
+]
+
+def search_query(query: str) -> str:
+    """Same term handling as searchEpisodes() in src/lib/search.ts."""
+    terms = re.sub(r"[^\w\s]", " ", query).split()
+    return " OR ".join(terms)
+
+def search_snapshot(conn, queries: list) -> dict:
+    """Ranked (episode id, bm25) results per query, through the app's search SQL."""
+    snapshot = {}
+    for query in queries:
+        rows = conn.execute("""
+            SELECT e.id, fts.rank
+            FROM transcripts_fts fts
+            JOIN transcripts t ON t.episode_id = fts.episode_id
+            JOIN episodes e ON e.id = fts.episode_id
+            WHERE transcripts_fts MATCH ?
+            ORDER BY rank
+            LIMIT 50
+        """, (search_query(query),)).fetchall()
+        snapshot[query] = [(episode_id, round(rank, 6)) for episode_id, rank in rows]
+    return snapshot
+
+def used_bytes(conn) -> int:
+    """Bytes of live pages (file size minus the freelist)."""
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return (page_count - freelist) * page_size
+
+def external_fts_sql(old_sql: str) -> str:
+    """
+    CREATE statement for the external-content table, keeping the old column
+    definitions and options (tokenizer, prefix indexes) as they were.
+    """
+    args = old_sql[old_sql.index("(") + 1:old_sql.rindex(")")]
+    parts = [p.strip() for p in re.split(r",(?=(?:[^'\"]|'[^']*'|\"[^\"]*\")*$)", args)]
+    kept = [p for p in parts if not re.match(r"(content|content_rowid)\s*=", p, re.I)]
+    kept += ["content='transcripts'", "content_rowid='rowid'"]
+    return f"CREATE VIRTUAL TABLE transcripts_fts USING fts5({', '.join(kept)})"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="database to migrate")
+    parser.add_argument("--queries", type=Path,
+                        help="file of search queries to verify, one per line (default: built-in sample)")
+    args = parser.parse_args()
+
+    queries = SAMPLE_QUERIES
+    if args.queries:
+        queries = [line.strip() for line in open(args.queries) if line.strip()]
+
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    if not has_fts(conn):
+        print("No transcripts_fts (transcripts are compressed; search uses segments_fts), nothing to do")
+        return
+    if fts_is_external(conn):
+        print("transcripts_fts is already an external-content table, nothing to do")
+        return
+
+    old_sql = fts_sql(conn)
+    new_sql = external_fts_sql(old_sql)
+    size_before = args.db.stat().st_size
+    used_before = used_bytes(conn)
+    before = search_snapshot(conn, queries)
+
+    print(f"Old: {old_sql}")
+    print(f"New: {new_sql}")
+
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("DROP TABLE transcripts_fts")
+    conn.execute(new_sql)
+    conn.execute("INSERT INTO transcripts_fts(transcripts_fts) VALUES ('rebuild')")
+    create_triggers(conn)
+
+    # Compare inside the transaction so a mismatch leaves the DB untouched
+    after = search_snapshot(conn, queries)
+    changed = [q for q in queries if before[q] != after[q]]
+    if changed:
+        conn.execute("ROLLBACK")
+        print(f"❌ Search results changed for {len(changed)} queries, rolled back:", file=sys.stderr)
+        for query in changed[:10]:
+            print(f"   {query!r}: {len(before[query])} → {len(after[query])} results", file=sys.stderr)
+        sys.exit(1)
+    conn.execute("INSERT INTO transcripts_fts(transcripts_fts) VALUES ('integrity-check')")
+    conn.execute("COMMIT")
+
+    print(f"✓ {len(queries)} sample queries return identical ranked results")
+    print("Vacuuming...")
+    conn.execute("VACUUM")
+    size_after = args.db.stat().st_size
+    conn.close()
+
+    print(f"\n✅ Migration complete!")
+    print(f"   File size: {size_before / 1e6:.1f}MB → {size_after / 1e6:.1f}MB")
+    print(f"   Live pages before: {used_before / 1e6:.1f}MB "
+          f"(saved {(used_before - size_after) / 1e6:.1f}MB, "
+          f"{100 * (used_before - size_after) / used_before:.0f}%)")
+
+if __name__ == "__main__":
+    with profiled("migrate_fts_external"):
+        main()
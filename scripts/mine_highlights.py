@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Mine quotable moments from every transcript into the highlights table.
+
+Each transcript is split into sentences, and each sentence is scored on:
+- length (punchy, not a ramble)
+- exclamations
+- player/team mentions (entities.py)
+- topic and bold-take phrases
+- phrases the episode keeps coming back to
+- how little filler it has
+
+Each episode's best few sentences become highlights, tagged by topic and
+attributed to a host when the transcript has speaker labels ("Dave: ...").
+
+Transcripts are mined across a process pool. The parent hands out batches
+of episode ids only, and each worker reads and decodes its own batch, so
+memory stays flat however large the archive is. Each batch's results
+replace that batch's highlights in a short transaction. --since mines just
+the episodes imported since a date, or since the last run.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import sys
+import time
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
+
+import entities
+from instrumentation import phase, profiled
+import term_counts
+import transcript_codec
+import transcript_segments
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+# Keep in sync with src/lib/highlights.ts
+HOSTS = ("Dave", "Davis", "Pete", "Dan")
+
+# "Dave:", "**Dave:**" or "[12:30] Dave:" at the start of a line
+SPEAKER = re.compile(r"^[ \t]*(?:[\[(][\d:]+[\])][ \t]*)?(?:\*\*)?([A-Z][a-z]+)(?:\*\*)?[ \t]*:(?:\*\*)?[ \t]*", re.M)
+
+# A sentence runs to its closing punctuation or the end of the line
+SENTENCE = re.compile(r"[^.!?\n]+[.!?]*")
+
+MIN_WORDS = 6
+MAX_WORDS = 40
+IDEAL_WORDS = 16
+
+PER_EPISODE = 5
+MIN_SCORE = 1.0
+
+FILLER = frozenset({"uh", "um", "uhh", "umm", "hmm", "er"})
+
+# normalized phrase -> tag; "bold-takes" phrases also score extra
+TAG_PHRASES = {
+    "best ball": "best-ball",
+    "zero rb": "zero-rb", "hero rb": "draft-strategy", "robust rb": "draft-strategy",
+    "draft": "draft-strategy", "adp": "draft-strategy", "mock draft": "draft-strategy",
+    "nfl draft": "draft-review", "draft class": "draft-review",
+    "rookie": "rookies", "rookies": "rookies",
+    "dynasty": "dynasty",
+    "waiver": "waiver-wire", "waivers": "waiver-wire", "waiver wire": "waiver-wire",
+    "trade": "trades", "trades": "trades", "trade deadline": "trades",
+    "sleeper": "sleepers", "sleepers": "sleepers",
+    "bust": "busts", "busts": "busts",
+    "dfs": "dfs", "draftkings": "dfs", "fanduel": "dfs",
+    "injury": "injuries", "injured": "injuries",
+    "start sit": "start-sit", "start or sit": "start-sit",
+    "target share": "analytics", "air yards": "analytics", "yards per route run": "analytics",
+    "analytics": "analytics", "algorithm": "analytics",
+    "hot take": "hot-takes",
+    "league winner": "bold-takes", "write it down": "bold-takes", "guarantee": "bold-takes",
+    "i m telling you": "bold-takes", "hill i die on": "bold-takes", "mark my words": "bold-takes",
+    "lock it in": "bold-takes", "bold prediction": "bold-takes",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS highlights (
+    id INTEGER PRIMARY KEY,
+    episode_id TEXT NOT NULL,
+    char_offset INTEGER NOT NULL,
+    quote TEXT NOT NULL,
+    host TEXT,
+    score REAL NOT NULL,
+    timestamp_seconds INTEGER,
+    UNIQUE (episode_id, char_offset)
+);
+CREATE INDEX IF NOT EXISTS idx_highlights_score ON highlights(score DESC);
+CREATE INDEX IF NOT EXISTS idx_highlights_host ON highlights(host, score DESC);
+CREATE TABLE IF NOT EXISTS highlight_tags (
+    tag TEXT NOT NULL,
+    highlight_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, highlight_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_highlight_tags_highlight ON highlight_tags(highlight_id);
+CREATE TABLE IF NOT EXISTS highlight_scans (
+    episode_id TEXT PRIMARY KEY,
+    mined_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS highlights_ad AFTER DELETE ON highlights BEGIN
+    DELETE FROM highlight_tags WHERE highlight_id = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS transcripts_highlights_ad AFTER DELETE ON transcripts BEGIN
+    DELETE FROM highlights WHERE episode_id = old.episode_id;
+    DELETE FROM highlight_scans WHERE episode_id = old.episode_id;
+END;
+"""
+
+_worker = {}
+
+def entity_kinds(conn) -> dict:
+    """normalized alias -> 'player'/'team', from the entity index if built, else the built-in gazetteer."""
+    if entities.has_entities(conn):
+        return dict(conn.execute(
+            "SELECT a.alias, e.kind FROM entity_aliases a JOIN entities e ON e.id = a.entity_id"
+        ))
+    kinds, aliases = entities.build_gazetteer()
+    return {alias: kinds[name] for alias, name in aliases.items()}
+
+def init_worker(db_path: str):
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    _worker["conn"] = conn
+    _worker["text_sql"] = transcript_codec.text_sql(conn)
+    _worker["entities"] = entities.Gazetteer(entity_kinds(conn))
+    _worker["tags"] = entities.Gazetteer(TAG_PHRASES)
+
+def sentences(content: str):
+    """Yield (char_offset, sentence, speaker) with speaker labels and timestamps taken out."""
+    # Any label ends the previous speaker's turn; only hosts get credit
+    labels = [(m.start(), m.end(), m.group(1) if m.group(1) in HOSTS else None)
+              for m in SPEAKER.finditer(content)]
+    starts = [start for start, _, _ in labels]
+    for line_match in re.finditer(r"[^\n]+", content):
+        line_start = line_match.start()
+        i = bisect_right(starts, line_start) - 1
+        speaker = labels[i][2] if i >= 0 else None
+        skip = labels[i][1] if i >= 0 and labels[i][0] == line_start else line_start
+        for match in SENTENCE.finditer(content, skip, line_match.end()):
+            text = transcript_segments.TIMESTAMP.sub("", match.group()).strip()
+            if text:
+                yield match.start() + len(match.group()) - len(match.group().lstrip()), text, speaker
+
+def trigrams(words: list) -> list:
+    return [" ".join(words[i:i + 3]) for i in range(len(words) - 2)
+            if not all(word in term_counts.STOPWORDS for word in words[i:i + 3])]
+
+def score_sentence(text: str, words: list, repeats: Counter, entity_hits: list, tag_hits: list) -> float:
+    n = len(words)
+    score = max(0.0, 1 - abs(n - IDEAL_WORDS) / (MAX_WORDS - IDEAL_WORDS))
+    score += 0.5 * min(text.count("!"), 2)
+    score += 0.4 * min(len(entity_hits), 2)
+    score += 0.3 * min(len(set(tag_hits)), 2)
+    if "bold-takes" in tag_hits:
+        score += 0.8
+    # A phrase said three or more times is a running bit (or the intro, which
+    # the filler/length checks usually catch)
+    repeat = max((repeats[gram] for gram in trigrams(words)), default=1)
+    score += 0.3 * min(max(repeat - 2, 0), 3)
+    score -= 0.15 * sum(word in FILLER for word in words)
+    return score
+
+def episode_highlights(episode_id: str, content: str, per_episode: int) -> list:
+    """(episode_id, char_offset, quote, host, score, timestamp_seconds, tags) for one transcript."""
+    entity_finder, tag_finder = _worker["entities"], _worker["tags"]
+    offsets, seconds = transcript_segments.timestamps(content)
+    candidates = []
+    repeats = Counter()
+    for offset, text, speaker in sentences(content):
+        words = term_counts.WORD.findall(text.lower())
+        grams = trigrams(words)
+        repeats.update(set(grams))
+        if MIN_WORDS <= len(words) <= MAX_WORDS:
+            candidates.append((offset, text, speaker, words))
+
+    scored = []
+    seen = set()
+    for offset, text, speaker, words in candidates:
+        if text in seen:
+            continue
+        seen.add(text)
+        entity_hits = [kind for _, kind in entity_finder.find(text)]
+        tag_hits = [tag for _, tag in tag_finder.find(text)]
+        score = score_sentence(text, words, repeats, entity_hits, tag_hits)
+        if score < MIN_SCORE:
+            continue
+        tags = set(tag_hits)
+        if "player" in entity_hits:
+            tags.add("player-analysis")
+        if text.count("!") >= 2:
+            tags.add("hot-takes")
+        i = bisect_right(offsets, offset)
+        timestamp = seconds[i - 1] if i else None
+        scored.append((episode_id, offset, text, speaker, round(score, 3), timestamp, sorted(tags)))
+    scored.sort(key=lambda row: -row[4])
+    return scored[:per_episode]
+
+def mine(task: tuple) -> tuple[list, list]:
+    """(episode ids, highlight rows) for a batch of transcripts."""
+    episode_ids, per_episode = task
+    rows = []
+    for episode_id, content in _worker["conn"].execute(
+        f"SELECT episode_id, {_worker['text_sql']} FROM transcripts "
+        f"WHERE episode_id IN ({', '.join('?' * len(episode_ids))})",
+        episode_ids
+    ):
+        rows.extend(episode_highlights(episode_id, content or "", per_episode))
+    return episode_ids, rows
+
+def write_batch(conn, episode_ids: list, rows: list, mined_at: str):
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany("DELETE FROM highlights WHERE episode_id = ?", ((e,) for e in episode_ids))
+        for episode_id, offset, quote, host, score, timestamp, tags in rows:
+            highlight_id = conn.execute("""
+                INSERT INTO highlights (episode_id, char_offset, quote, host, score, timestamp_seconds)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (episode_id, offset, quote, host, score, timestamp)).lastrowid
+            conn.executemany(
+                "INSERT INTO highlight_tags (tag, highlight_id) VALUES (?, ?)",
+                ((tag, highlight_id) for tag in tags)
+            )
+        conn.executemany(
+            "INSERT OR REPLACE INTO highlight_scans (episode_id, mined_at) VALUES (?, ?)",
+            ((e, mined_at) for e in episode_ids)
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+def since_timestamp(conn, since: str) -> str:
+    """An ISO timestamp from --since; 'last' means when the previous run started."""
+    if since != "last":
+        try:
+            return datetime.fromisoformat(since).isoformat()
+        except ValueError:
+            print(f"❌ --since wants an ISO date/time or 'last', not {since!r}", file=sys.stderr)
+            sys.exit(1)
+    row = conn.execute("SELECT MAX(mined_at) FROM highlight_scans").fetchone()
+    return row[0] or ""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--since", help="only episodes imported since this ISO date/time, or 'last' run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="mining processes (default: one per core)")
+    parser.add_argument("--batch", type=int, default=25, help="transcripts per work unit (default: 25)")
+    parser.add_argument("--per-episode", type=int, default=PER_EPISODE,
+                        help=f"highlights kept per episode (default: {PER_EPISODE})")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    mined_at = datetime.now().isoformat(timespec="seconds")
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    conn.executescript(SCHEMA)
+
+    if args.since:
+        since = since_timestamp(conn, args.since)
+        todo = [row[0] for row in conn.execute("""
+            SELECT t.episode_id FROM transcripts t
+            JOIN episodes e ON e.id = t.episode_id
+            LEFT JOIN highlight_scans s ON s.episode_id = t.episode_id
+            WHERE e.created_at >= ? OR s.episode_id IS NULL
+        """, (since,))]
+        print(f"Mining {len(todo)} episodes imported since {since or 'the start'}...")
+    else:
+        todo = [row[0] for row in conn.execute("SELECT episode_id FROM transcripts")]
+        print(f"Mining {len(todo)} episodes with {args.workers} workers...")
+
+    batches = [(todo[i:i + args.batch], args.per_episode) for i in range(0, len(todo), args.batch)]
+    written = done = 0
+    with phase("mine"):
+        if args.workers <= 1 or len(batches) <= 1:
+            init_worker(str(args.db))
+            results = map(mine, batches)
+            pool = None
+        else:
+            pool = Pool(args.workers, initializer=init_worker, initargs=(str(args.db),))
+            results = pool.imap_unordered(mine, batches)
+        try:
+            for i, (episode_ids, rows) in enumerate(results, 1):
+                write_batch(conn, episode_ids, rows, mined_at)
+                written += len(rows)
+                done += len(episode_ids)
+                if i % 20 == 0:
+                    print(f"  {done}/{len(todo)} episodes, {written} highlights")
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    total, episodes = conn.execute("SELECT COUNT(*), COUNT(DISTINCT episode_id) FROM highlights").fetchone()
+    tags = conn.execute("""
+        SELECT tag, COUNT(*) FROM highlight_tags GROUP BY tag ORDER BY COUNT(*) DESC LIMIT 8
+    """).fetchall()
+    best = conn.execute("SELECT quote, score FROM highlights ORDER BY score DESC LIMIT 3").fetchall()
+    conn.close()
+
+    print(f"\n✅ Highlights ready!")
+    print(f"   Mined: {len(todo)} episodes ({written} highlights)")
+    print(f"   Total: {total} highlights from {episodes} episodes")
+    print(f"   Top tags: {', '.join(f'{tag} ({count})' for tag, count in tags) or 'none'}")
+    for quote, score in best:
+        print(f"   {score:.2f}  {quote[:90]}")
+    print(f"   Took {time.monotonic() - started:.2f}s")
+
+if __name__ == "__main__":
+    with profiled("mine_highlights"):
+        main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Find transcripts that are near-duplicates of each other, whatever their titles.
+
+Every transcript becomes a set of overlapping word 5-grams (shingles) and a
+MinHash signature of that set; the share of signature slots two transcripts
+agree on estimates the Jaccard similarity of their shingle sets. Signatures
+are cut into bands and hashed into buckets (LSH), so only transcripts that
+share a bucket are ever compared and the run stays roughly linear in the
+archive size. Pairs above --min-jaccard are joined into clusters.
+
+Each cluster keeps one episode (a podcast if there is one, else the first
+imported) and the rest go into transcript_duplicates with their estimated
+Jaccard against it; consolidate_episodes.py folds them into the keeper.
+Needs numpy.
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+import zlib
+from collections import defaultdict
+from pathlib import Path
+
+from instrumentation import phase, profiled
+import transcript_codec
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+WORD = re.compile(r"[a-z0-9]+")
+
+SHINGLE_WORDS = 5
+
+# 32 bands of 4 rows: a pair becomes a candidate with probability
+# 1 - (1 - J^4)^32: about 0.5 at J = 0.38, over 0.999 from J = 0.7
+BANDS = 32
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+MIN_JACCARD = 0.7
+
+# Transcripts with fewer distinct shingles than this ("[Music]", a one-line
+# placeholder) aren't signed: any two of them would look like duplicates
+MIN_SHINGLES = 50
+
+# Buckets with more members than this are linked as a star rather than every pair
+MAX_BUCKET_MEMBERS = 20
+
+# Permutations are multiply-shift hashes ((a*x + b) mod 2^64) >> 32 of the
+# 32-bit shingle hashes, with a odd; uint64 arithmetic wraps for free
+SEED = 1
+
+# Shingles hashed per block when signing, so a long transcript can't blow up
+# the (permutations x shingles) working array
+SIGN_BLOCK = 8192
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_duplicates (
+    episode_id TEXT PRIMARY KEY,
+    keep_id TEXT NOT NULL,
+    jaccard REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_transcript_duplicates_keep ON transcript_duplicates(keep_id);
+"""
+
+class MinHasher:
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(0, 2**64 - 1, size=(num_perm, 1), dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self.b = rng.integers(0, 2**64 - 1, size=(num_perm, 1), dtype=np.uint64, endpoint=True)
+        self.word_hashes = {}
+
+    def shingles(self, text: str) -> "np.ndarray":
+        """Distinct 32-bit hashes of the text's word n-grams (none if it is shorter than one)."""
+        cache = self.word_hashes
+        words = WORD.findall(text.lower())
+        if len(words) < SHINGLE_WORDS:
+            return np.zeros(0, dtype=np.uint64)
+        for word in set(words).difference(cache):
+            cache[word] = zlib.crc32(word.encode("utf-8"))
+        hashes = np.fromiter(map(cache.__getitem__, words), dtype=np.uint64, count=len(words))
+        # Polynomial hash of each window, kept to 32 bits (uint64 wraps)
+        combined = np.zeros(len(hashes) - SHINGLE_WORDS + 1, dtype=np.uint64)
+        for i in range(SHINGLE_WORDS):
+            combined = combined * np.uint64(1000003) + hashes[i:len(hashes) - SHINGLE_WORDS + 1 + i]
+        return np.unique(combined & np.uint64(0xFFFFFFFF))
+
+    def signature(self, shingles) -> "np.ndarray":
+        signature = np.full(len(self.a), np.iinfo(np.uint64).max, dtype=np.uint64)
+        for start in range(0, len(shingles), SIGN_BLOCK):
+            block = shingles[start:start + SIGN_BLOCK]
+            np.minimum(signature, ((self.a * block + self.b) >> np.uint64(32)).min(axis=1), out=signature)
+        return signature
+
+def candidate_pairs(signatures: "np.ndarray", bands: int, rows: int) -> set:
+    """Index pairs that share at least one band bucket."""
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        chunk = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        for i, key in enumerate(map(bytes, chunk)):
+            buckets[key].append(i)
+        for members in buckets.values():
+            if len(members) > MAX_BUCKET_MEMBERS:
+                # Dozens of copies of one transcript: linking each to the
+                # first already puts them in one cluster
+                pairs.update((members[0], m) for m in members[1:])
+                continue
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    pairs.add((members[x], members[y]))
+    return pairs
+
+def estimated_jaccard(signatures: "np.ndarray", i: int, j: int) -> float:
+    return float(np.mean(signatures[i] == signatures[j]))
+
+def clusters(n: int, pairs) -> list:
+    """Connected components (union-find) of the given index pairs, singletons left out."""
+    parent = list(range(n))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        ri, rj = root(i), root(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    groups = defaultdict(list)
+    for i in range(n):
+        groups[root(i)].append(i)
+    return [members for members in groups.values() if len(members) > 1]
+
+def keeper(episodes: list) -> int:
+    """Position of the episode a cluster keeps: podcasts first, then earliest imported."""
+    return min(range(len(episodes)), key=lambda k: (not episodes[k][0].startswith("podcast"), episodes[k][1]))
+
+def groups(cluster: list, episodes: list, signatures: "np.ndarray", min_jaccard: float):
+    """
+    Yield (keeper, [(member, jaccard), ...]) for a cluster. Union-find chains
+    A~B~C even when A and C are far apart, so only members close enough to
+    the keeper join it; the rest are grouped again around a keeper of their own.
+    """
+    while len(cluster) > 1:
+        keep = cluster[keeper([episodes[m] for m in cluster])]
+        close, rest = [], []
+        for m in cluster:
+            if m != keep:
+                jaccard = estimated_jaccard(signatures, keep, m)
+                (close if jaccard >= min_jaccard else rest).append((m, jaccard))
+        if close:
+            yield keep, close
+        cluster = [m for m, _ in rest]
+
+def find_duplicates(conn, min_jaccard: float = MIN_JACCARD, min_shingles: int = MIN_SHINGLES) -> tuple[list, list]:
+    """
+    (transcript_duplicates rows, report clusters) for every transcript with
+    at least `min_shingles` shingles.
+    """
+    hasher = MinHasher()
+    episodes, signatures = [], []
+    with phase("signatures"):
+        for episode_id, content, rowid in conn.execute(f"""
+            SELECT t.episode_id, {transcript_codec.text_sql(conn)}, e.rowid
+            FROM transcripts t JOIN episodes e ON e.id = t.episode_id
+        """):
+            shingles = hasher.shingles(content or "")
+            if len(shingles) < min_shingles:
+                continue
+            episodes.append((episode_id, rowid))
+            signatures.append(hasher.signature(shingles))
+    signatures = np.array(signatures, dtype=np.uint64).reshape(len(episodes), NUM_PERM)
+    print(f"Signed {len(episodes)} transcripts")
+
+    with phase("lsh"):
+        candidates = candidate_pairs(signatures, BANDS, ROWS)
+        pairs = [(i, j) for i, j in candidates if estimated_jaccard(signatures, i, j) >= min_jaccard]
+    print(f"LSH candidates: {len(candidates)}, above {min_jaccard:g}: {len(pairs)}")
+
+    rows, report = [], []
+    for cluster in clusters(len(episodes), pairs):
+        for keep, members in groups(cluster, episodes, signatures, min_jaccard):
+            entry = {"keep": episodes[keep][0], "duplicates": []}
+            for m, jaccard in members:
+                rows.append((episodes[m][0], episodes[keep][0], jaccard))
+                entry["duplicates"].append({"episode_id": episodes[m][0], "jaccard": jaccard})
+            report.append(entry)
+
+    return rows, report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--min-jaccard", type=float, default=MIN_JACCARD,
+                        help=f"estimated Jaccard that makes two transcripts duplicates (default: {MIN_JACCARD})")
+    parser.add_argument("--min-shingles", type=int, default=MIN_SHINGLES,
+                        help=f"skip transcripts with fewer distinct 5-word shingles (default: {MIN_SHINGLES})")
+    parser.add_argument("--json", type=Path, help="also write the clusters here")
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ near_duplicates.py needs numpy (pip install numpy)", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.monotonic()
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    conn.executescript(SCHEMA)
+
+    rows, report = find_duplicates(conn, args.min_jaccard, args.min_shingles)
+
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM transcript_duplicates")
+        conn.executemany(
+            "INSERT INTO transcript_duplicates (episode_id, keep_id, jaccard) VALUES (?, ?, ?)", rows
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    titles = dict(conn.execute("SELECT id, title FROM episodes"))
+    conn.close()
+
+    report.sort(key=lambda entry: -len(entry["duplicates"]))
+    for entry in report[:10]:
+        print(f"   {titles.get(entry['keep'], entry['keep'])[:50]}")
+        for dup in entry["duplicates"][:3]:
+            print(f"      ≈ {titles.get(dup['episode_id'], dup['episode_id'])[:45]} (J≈{dup['jaccard']:.2f})")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+    print(f"\n✅ Near-duplicate scan complete!")
+    print(f"   Clusters: {len(report)}")
+    print(f"   Duplicates to fold: {len(rows)}")
+    if args.json:
+        print(f"   Report: {args.json}")
+    print(f"   Took {time.monotonic() - started:.2f}s")
+
+if __name__ == "__main__":
+    with profiled("near_duplicates"):
+        main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Finalize data/swolecast.db for shipping: indexes for the app's
+queries, FTS merges, ANALYZE, page size tuning and VACUUM.
+
+Run it last, after the import/consolidate/fix scripts. It fails if any hot
+query in src/lib/episodes.ts still needs a full table scan or a temp B-tree.
+"""
+
+import argparse
+import re
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from instrumentation import profiled
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+EPISODE_COLUMNS = """id, title, description, published_at, duration_seconds,
+           view_count, like_count, comment_count, thumbnail_url,
+           youtube_url, has_transcript, transcript_word_count"""
+
+# Keep in sync with src/lib/episodes.ts; "?" params are filled from the DB
+HOT_QUERIES = {
+    "getAllEpisodes": f"SELECT {EPISODE_COLUMNS} FROM episodes ORDER BY published_at DESC",
+    "getEpisodeById": f"SELECT {EPISODE_COLUMNS} FROM episodes WHERE id = ?",
+    "getTranscript": "SELECT episode_id, content, word_count FROM transcripts WHERE episode_id = ?",
+    "getRecentEpisodes": f"SELECT {EPISODE_COLUMNS} FROM episodes ORDER BY published_at DESC LIMIT 8",
+    "getEpisodeCount": "SELECT COUNT(*) as count FROM episodes",
+    "getTotalWordCount": "SELECT COALESCE(SUM(transcript_word_count), 0) as total FROM episodes",
+}
+
+# What episodes.ts runs instead once scripts/compress_transcripts.py has added
+# the codec/dict_id columns
+CODEC_QUERIES = {
+    "getTranscript": "SELECT episode_id, content, word_count, codec, dict_id FROM transcripts WHERE episode_id = ?",
+    "getDictionary": "SELECT dict FROM transcript_dicts WHERE id = ?",
+}
+
+# getTranscriptChunks, once scripts/backfill_segments.py has run; every
+# episode page and /api/episodes/[id]/transcript call makes both
+SEGMENT_QUERIES = {
+    "countTranscriptChunks": "SELECT COUNT(*) as total FROM transcript_segments WHERE episode_id = ?",
+    "getTranscriptChunks": """SELECT seq, char_offset, start_seconds, text FROM transcript_segments
+        WHERE episode_id = ? AND seq >= ? ORDER BY seq LIMIT ?""",
+}
+
+# getRelatedEpisodes, once scripts/related_episodes.py has run
+RELATED_QUERIES = {
+    "getRelatedEpisodes": """SELECT e.id, e.title, e.published_at, e.duration_seconds, r.score
+        FROM related_episodes r JOIN episodes e ON e.id = r.related_id
+        WHERE r.episode_id = ? ORDER BY r.rank LIMIT 6""",
+}
+
+# TRANSCRIPT_PAGE_SIZE in src/lib/episodes.ts
+TRANSCRIPT_PAGE_SIZE = 12
+
+# Listing pages walk episodes in published_at order and fetch each row by
+# rowid; copying every column (description included) into the index would
+# store the table twice to save that lookup. transcript_word_count rides
+# along so getTotalWordCount sums the index instead of the table
+INDEXES = {
+    "idx_episodes_published_at":
+        "CREATE INDEX idx_episodes_published_at ON episodes (published_at DESC, transcript_word_count)",
+}
+
+FTS_TABLES = ("transcripts_fts", "segments_fts")
+
+PAGE_SIZES = (4096, 8192, 16384, 32768)
+
+# "SCAN episodes" with no index, or any sort/grouping spilled to a temp B-tree
+BAD_PLAN = re.compile(r"^SCAN \w+$|^SCAN \w+ AS \w+$|TEMP B-TREE")
+
+def hot_queries(conn) -> dict:
+    """HOT_QUERIES as the app runs them against this database's schema."""
+    queries = dict(HOT_QUERIES)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(transcripts)")}
+    if "codec" in columns:
+        queries.update(CODEC_QUERIES)
+    tables = existing_tables(conn)
+    if "transcript_segments" in tables:
+        queries.update(SEGMENT_QUERIES)
+    if "related_episodes" in tables:
+        queries.update(RELATED_QUERIES)
+    return queries
+
+def query_params(conn) -> dict:
+    row = conn.execute("SELECT id FROM episodes ORDER BY published_at DESC LIMIT 1").fetchone()
+    episode_id = row[0] if row else ""
+    params = {
+        "getEpisodeById": (episode_id,),
+        "getTranscript": (episode_id,),
+        "countTranscriptChunks": (episode_id,),
+        # The second page: a range that doesn't start at the first segment
+        "getTranscriptChunks": (episode_id, TRANSCRIPT_PAGE_SIZE, TRANSCRIPT_PAGE_SIZE),
+        "getRelatedEpisodes": (episode_id,),
+    }
+    if "transcript_dicts" in existing_tables(conn):
+        row = conn.execute("SELECT MAX(id) FROM transcript_dicts").fetchone()
+        params["getDictionary"] = (row[0] or 0,)
+    return params
+
+def explain(conn, sql: str, params: tuple) -> list:
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+def check_plans(conn) -> dict:
+    """Query plan per hot query, and the plan steps that break the rules."""
+    params = query_params(conn)
+    report = {}
+    for name, sql in hot_queries(conn).items():
+        plan = explain(conn, sql, params.get(name, ()))
+        report[name] = {"plan": plan, "bad": [step for step in plan if BAD_PLAN.search(step)]}
+    return report
+
+def latencies(conn, runs: int) -> dict:
+    """Median microseconds per hot query, fully fetched."""
+    params = query_params(conn)
+    results = {}
+    for name, sql in hot_queries(conn).items():
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            conn.execute(sql, params.get(name, ())).fetchall()
+            timings.append(time.perf_counter() - started)
+        results[name] = statistics.median(timings) * 1e6
+    return results
+
+def existing_tables(conn) -> set:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+
+def create_indexes(conn):
+    """Create INDEXES, replacing any whose definition has changed since the last run."""
+    for name, sql in INDEXES.items():
+        row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (name,)).fetchone()
+        if row and row[0] == sql:
+            continue
+        if row:
+            conn.execute(f"DROP INDEX {name}")
+        conn.execute(sql)
+
+def tune_page_size(db_path: Path, runs: int) -> tuple[int, dict]:
+    """
+    VACUUM INTO a scratch copy at each candidate page size and keep the
+    smallest file; a tie goes to the faster hot queries.
+    """
+    conn = sqlite3.connect(db_path)
+    trials = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for page_size in PAGE_SIZES:
+            trial_path = Path(tmp) / f"page_{page_size}.db"
+            conn.execute(f"PRAGMA page_size = {page_size}")
+            conn.execute("VACUUM INTO ?", (str(trial_path),))
+            trial = sqlite3.connect(trial_path)
+            trials[page_size] = {
+                "bytes": trial_path.stat().st_size,
+                "micros": sum(latencies(trial, runs).values()),
+            }
+            trial.close()
+            trial_path.unlink()
+    conn.close()
+    best = min(trials, key=lambda size: (trials[size]["bytes"], trials[size]["micros"]))
+    return best, trials
+
+def print_plans(report: dict):
+    for name, entry in report.items():
+        marker = "❌" if entry["bad"] else "✓"
+        print(f"   {marker} {name}: {' | '.join(entry['plan'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="database to optimize in place")
+    parser.add_argument("--page-size", type=int, default=0,
+                        help="page size to use; 0 tries %s and keeps the smallest (default: 0)"
+                             % "/".join(map(str, PAGE_SIZES)))
+    parser.add_argument("--runs", type=int, default=50, help="timed runs per query (default: 50)")
+    parser.add_argument("--check", action="store_true",
+                        help="only check the query plans, don't modify the database")
+    args = parser.parse_args()
+
+    if args.check:
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        report = check_plans(conn)
+        print_plans(report)
+        sys.exit(1 if any(entry["bad"] for entry in report.values()) else 0)
+
+    size_before = args.db.stat().st_size
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    page_size_before = conn.execute("PRAGMA page_size").fetchone()[0]
+    before = latencies(conn, args.runs)
+
+    print("Creating indexes...")
+    create_indexes(conn)
+
+    for table in FTS_TABLES:
+        if table in existing_tables(conn):
+            print(f"Merging {table} segments...")
+            conn.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+    print("Analyzing...")
+    conn.execute("ANALYZE")
+
+    # The page size can only change outside WAL mode; the app opens read-only
+    conn.execute("PRAGMA journal_mode = DELETE")
+    page_size = args.page_size
+    if not page_size:
+        conn.close()
+        print(f"Trying page sizes {', '.join(map(str, PAGE_SIZES))}...")
+        page_size, trials = tune_page_size(args.db, max(5, args.runs // 5))
+        for size, trial in trials.items():
+            chosen = " ← chosen" if size == page_size else ""
+            print(f"   {size:>6}: {trial['bytes'] / 1e6:.2f}MB, {trial['micros']:.0f}µs{chosen}")
+        conn = sqlite3.connect(args.db, isolation_level=None)
+
+    print(f"Vacuuming at page size {page_size}...")
+    conn.execute(f"PRAGMA page_size = {page_size}")
+    conn.execute("VACUUM")
+    conn.execute("PRAGMA optimize")
+
+    after = latencies(conn, args.runs)
+    report = check_plans(conn)
+    conn.close()
+    size_after = args.db.stat().st_size
+
+    print(f"\nQuery plans:")
+    print_plans(report)
+
+    print(f"\n{'query':<22}{'before µs':>12}{'after µs':>12}")
+    for name in after:
+        print(f"{name:<22}{before[name]:>12.1f}{after[name]:>12.1f}")
+
+    print(f"\n✅ Optimized {args.db}")
+    print(f"   Page size: {page_size_before} → {page_size}")
+    print(f"   File size: {size_before / 1e6:.2f}MB → {size_after / 1e6:.2f}MB "
+          f"({100 * (size_after - size_before) / size_before:+.1f}%)")
+    print(f"   Hot queries: {sum(before.values()):.0f}µs → {sum(after.values()):.0f}µs total")
+
+    bad = {name: entry["bad"] for name, entry in report.items() if entry["bad"]}
+    if bad:
+        print(f"\n❌ {len(bad)} queries still scan or sort:", file=sys.stderr)
+        for name, steps in bad.items():
+            print(f"   {name}: {', '.join(steps)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    with profiled("optimize_db"):
+        main()
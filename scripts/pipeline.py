@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Run the data build as a DAG of the scripts/ stages.
+
+Each stage declares its input and output files. A stage is skipped when its
+inputs (and its own script) hash the same as at its last successful run and its
+outputs still exist; stages whose inputs are ready run in parallel. Network
+stages have no input files to hash, so they rerun once their TTL is up.
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from instrumentation import profiled
+
+SCRIPTS_DIR = Path(__file__).parent
+DATA_DIR = SCRIPTS_DIR.parent / "data"
+STREAMS_DIR = SCRIPTS_DIR.parent.parent / "swolecast-streams/public/data"
+STATE_PATH = DATA_DIR / ".pipeline_state.json"
+
+# Keep in sync with the paths at the top of each script
+STAGES = [
+    {
+        "name": "fetch_streams",
+        "script": "fetch_all_streams.py",
+        "inputs": [],
+        "outputs": [DATA_DIR / "youtube_metadata.json"],
+        "network": True,
+        # New uploads only show up by asking again
+        "ttl_hours": 24,
+    },
+    {
+        "name": "rss_durations",
+        "script": "import_rss_durations.py",
+        "inputs": [Path("/tmp/swolecast_rss.xml"), STREAMS_DIR / "podcasts.json"],
+        "outputs": [DATA_DIR / "podcasts_with_duration.json"],
+    },
+    {
+        "name": "match",
+        "script": "match_youtube_podcasts.py",
+        "inputs": [DATA_DIR / "youtube_metadata.json", DATA_DIR / "podcasts_with_duration.json"],
+        "outputs": [DATA_DIR / "matched_episodes.json", DATA_DIR / "match_report.txt"],
+    },
+    {
+        "name": "merge",
+        "script": "merge_duplicates.py",
+        "inputs": [DATA_DIR / "matched_episodes.json"],
+        "outputs": [DATA_DIR / "episodes_final.json"],
+    },
+    {
+        "name": "update_db",
+        "script": "update_db_youtube.py",
+        "inputs": [DATA_DIR / "episodes_final.json"],
+        "outputs": [DATA_DIR / "swolecast.db"],
+    },
+]
+
+
+class FileHashes:
+    """sha256 per file, reusing the stored digest while size and mtime match."""
+
+    def __init__(self, cache: dict):
+        self.cache = cache
+
+    def digest(self, path: Path) -> str | None:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = str(path)
+        cached = self.cache.get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        sha = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        self.cache[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                           "sha256": sha.hexdigest()}
+        return sha.hexdigest()
+
+
+def load_state() -> dict:
+    if STATE_PATH.exists():
+        with open(STATE_PATH) as f:
+            return json.load(f)
+    return {"files": {}, "stages": {}, "ran_at": {}}
+
+
+def save_state(state: dict):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = STATE_PATH.with_suffix(".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    tmp_path.replace(STATE_PATH)
+
+
+def fingerprint(stage: dict, hashes: FileHashes) -> dict:
+    """What a stage's result depends on: its script and every input file."""
+    return {
+        "script": hashes.digest(SCRIPTS_DIR / stage["script"]),
+        "inputs": {str(path): hashes.digest(path) for path in stage["inputs"]},
+    }
+
+
+def expired(stage: dict, state: dict) -> bool:
+    """Whether a stage's TTL (if it has one) has run out since its last successful run."""
+    if "ttl_hours" not in stage:
+        return False
+    ran_at = state.get("ran_at", {}).get(stage["name"])
+    return ran_at is None or time.time() - ran_at >= stage["ttl_hours"] * 3600
+
+
+def row_count(path: Path) -> int | None:
+    """Records in a stage output: list length, episode rows or text lines."""
+    try:
+        if path.suffix == ".json":
+            with open(path) as f:
+                data = json.load(f)
+            return len(data) if isinstance(data, list) else None
+        if path.suffix == ".db":
+            conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+            try:
+                return conn.execute("SELECT COUNT(*) FROM episodes").fetchone()[0]
+            finally:
+                conn.close()
+        with open(path) as f:
+            return sum(1 for _ in f)
+    except (OSError, ValueError, sqlite3.Error):
+        return None
+
+
+def run_stage(stage: dict) -> dict:
+    started = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / stage["script"])],
+        capture_output=True,
+        text=True,
+        cwd=SCRIPTS_DIR.parent
+    )
+    return {
+        "returncode": result.returncode,
+        "output": result.stdout + result.stderr,
+        "seconds": time.monotonic() - started,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fetch", action="store_true",
+                        help="include the YouTube fetch stage (needs network; off by default)")
+    parser.add_argument("--force", action="store_true", help="rerun every stage regardless of hashes")
+    parser.add_argument("--dry-run", action="store_true", help="show what would run without running it")
+    parser.add_argument("-j", "--jobs", type=int, default=4, help="max stages running at once (default: 4)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print each stage's output")
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    state = load_state()
+    hashes = FileHashes(state["files"])
+    stages = [s for s in STAGES if args.fetch or not s.get("network")]
+
+    # A stage depends on whichever stages produce its inputs
+    producers = {str(out): s["name"] for s in stages for out in s["outputs"]}
+    deps = {s["name"]: {producers[str(p)] for p in s["inputs"] if str(p) in producers} for s in stages}
+    by_name = {s["name"]: s for s in stages}
+
+    report = {}
+    done, failed = set(), set()
+    # Dry run: stages that would run, whose outputs downstream can't hash yet
+    would_run = set()
+    running = {}
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        while len(done) + len(failed) < len(stages):
+            for name, stage in by_name.items():
+                if name in done or name in failed or name in {n for n, _ in running.values()}:
+                    continue
+                if deps[name] & failed:
+                    failed.add(name)
+                    report[name] = {"status": "blocked", "seconds": 0.0}
+                    continue
+                if not deps[name] <= done:
+                    continue
+                if deps[name] & would_run:
+                    done.add(name)
+                    would_run.add(name)
+                    report[name] = {"status": "would run", "seconds": 0.0}
+                    continue
+
+                # Ready: hash inputs now, after upstream stages have written them
+                stage_started = time.monotonic()
+                current = fingerprint(stage, hashes)
+                missing = [str(p) for p in stage["inputs"] if current["inputs"][str(p)] is None]
+                if missing:
+                    failed.add(name)
+                    report[name] = {"status": f"missing input {missing[0]}", "seconds": 0.0}
+                    continue
+                up_to_date = (
+                    not args.force
+                    and state["stages"].get(name) == current
+                    and all(out.exists() for out in stage["outputs"])
+                    and not expired(stage, state)
+                )
+                if up_to_date or args.dry_run:
+                    done.add(name)
+                    if not up_to_date:
+                        would_run.add(name)
+                    report[name] = {"status": "up to date" if up_to_date else "would run",
+                                    "seconds": time.monotonic() - stage_started}
+                    continue
+                print(f"▶ {name}")
+                running[pool.submit(run_stage, stage)] = (name, current)
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, current = running.pop(future)
+                result = future.result()
+                if args.verbose or result["returncode"] != 0:
+                    print("\n".join(f"  [{name}] {line}" for line in result["output"].splitlines()))
+                if result["returncode"] != 0:
+                    failed.add(name)
+                    report[name] = {"status": f"FAILED (exit {result['returncode']})",
+                                    "seconds": result["seconds"]}
+                    continue
+                # Record what this run was built from; outputs get hashed when
+                # downstream stages fingerprint their inputs
+                state["stages"][name] = current
+                state.setdefault("ran_at", {})[name] = time.time()
+                done.add(name)
+                report[name] = {"status": "ran", "seconds": result["seconds"]}
+                save_state(state)
+
+    save_state(state)
+
+    print(f"\n{'stage':<16}{'status':<28}{'seconds':>9}{'rows':>8}")
+    for stage in stages:
+        entry = report[stage["name"]]
+        rows = row_count(stage["outputs"][0])
+        print(f"{stage['name']:<16}{entry['status']:<28}{entry['seconds']:>9.2f}{rows if rows is not None else '':>8}")
+    print(f"\nTotal: {time.monotonic() - started:.2f}s")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    with profiled("pipeline"):
+        main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Precompute "related episodes" from TF-IDF similarity of the transcripts.
+
+Builds a sparse TF-IDF matrix from the per-episode term counts that
+scripts/index_terms.py keeps (so nothing is tokenized twice), then finds
+each episode's top-k cosine neighbours a block of rows at a time, so memory
+stays at one block x all episodes however big the archive gets. Results
+replace the related_episodes table, which the episode page reads by primary
+key. Needs numpy and scipy; nothing is downloaded.
+"""
+
+import argparse
+import itertools
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+from instrumentation import phase, profiled
+import term_counts
+
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+except ImportError:
+    np = None
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+TOP_K = 8
+
+# Similarity cells (block rows x episodes) held in memory at once
+BLOCK_CELLS = 16_000_000
+
+# Terms in more than this share of episodes say nothing about any of them
+MAX_DF = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS related_episodes (
+    episode_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    related_id TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (episode_id, rank)
+) WITHOUT ROWID;
+"""
+
+def tfidf_matrix(conn, max_df: float) -> tuple[list, "csr_matrix"]:
+    """
+    (episode ids, L2-normalized TF-IDF rows) from episode_terms. Rows come
+    out in primary key order, which is already CSR order.
+    """
+    lengths = conn.execute(
+        "SELECT episode_id, COUNT(*) FROM episode_terms GROUP BY episode_id ORDER BY episode_id"
+    ).fetchall()
+    episode_ids = [row[0] for row in lengths]
+    indptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum([row[1] for row in lengths], out=indptr[1:])
+    pairs = np.fromiter(
+        itertools.chain.from_iterable(
+            conn.execute("SELECT term_id, count FROM episode_terms ORDER BY episode_id, term_id")
+        ),
+        dtype=np.int64, count=2 * int(indptr[-1])
+    ).reshape(-1, 2)
+
+    # Term ids are sparse; number the columns densely
+    terms, columns = np.unique(pairs[:, 0], return_inverse=True)
+    counts = csr_matrix((pairs[:, 1].astype(np.float32), columns, indptr), shape=(len(episode_ids), len(terms)))
+    del pairs
+
+    n = len(episode_ids)
+    df = np.bincount(counts.indices, minlength=len(terms))
+    # A term in one episode can't make two episodes similar
+    keep = np.flatnonzero((df >= 2) & (df <= max_df * n))
+    counts = counts[:, keep].tocsr()
+
+    counts.data = 1 + np.log(counts.data)
+    idf = (np.log((1 + n) / (1 + df[keep])) + 1).astype(np.float32)
+    counts.data *= idf[counts.indices]
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    counts.data /= np.repeat(norms, np.diff(counts.indptr)).astype(np.float32)
+    return episode_ids, counts
+
+def top_neighbours(matrix, k: int, block_cells: int):
+    """Yield (row, [(column, score), ...]) with the k best-scoring other rows, best first."""
+    n = matrix.shape[0]
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+    transposed = matrix.T.tocsc()
+    block = max(1, block_cells // n)
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        scores = (matrix[start:end] @ transposed).toarray()
+        rows = np.arange(end - start)
+        scores[rows, rows + start] = -1  # never your own neighbour
+        best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        best_scores = scores[rows[:, None], best]
+        order = np.argsort(-best_scores, axis=1)
+        best, best_scores = best[rows[:, None], order], best_scores[rows[:, None], order]
+        for i in range(end - start):
+            yield start + i, [(int(c), float(s)) for c, s in zip(best[i], best_scores[i]) if s > 0]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database")
+    parser.add_argument("--top", type=int, default=TOP_K, help=f"related episodes kept per episode (default: {TOP_K})")
+    parser.add_argument("--max-df", type=float, default=MAX_DF,
+                        help=f"ignore terms in more than this share of episodes (default: {MAX_DF})")
+    parser.add_argument("--block-cells", type=int, default=BLOCK_CELLS,
+                        help=f"similarity scores held in memory at once (default: {BLOCK_CELLS:,})")
+    args = parser.parse_args()
+
+    if np is None:
+        print("❌ related_episodes.py needs numpy and scipy (pip install numpy scipy)", file=sys.stderr)
+        sys.exit(1)
+
+    started = time.monotonic()
+    conn = sqlite3.connect(args.db, isolation_level=None)
+    if not term_counts.has_terms(conn):
+        print("❌ No term counts yet; run scripts/index_terms.py first", file=sys.stderr)
+        sys.exit(1)
+    conn.executescript(SCHEMA)
+
+    with phase("tfidf"):
+        episode_ids, matrix = tfidf_matrix(conn, args.max_df)
+    print(f"TF-IDF: {matrix.shape[0]} episodes x {matrix.shape[1]} terms ({matrix.nnz:,} weights)")
+
+    written = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM related_episodes")
+        with phase("similarity"):
+            for row, neighbours in top_neighbours(matrix, args.top, args.block_cells):
+                conn.executemany(
+                    "INSERT INTO related_episodes (episode_id, rank, related_id, score) VALUES (?, ?, ?, ?)",
+                    ((episode_ids[row], rank, episode_ids[col], score)
+                     for rank, (col, score) in enumerate(neighbours, 1))
+                )
+                written += len(neighbours)
+                if (row + 1) % 2000 == 0:
+                    print(f"  {row + 1}/{len(episode_ids)} episodes")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.close()
+
+    print(f"\n✅ Related episodes ready!")
+    print(f"   Episodes: {len(episode_ids)}")
+    print(f"   Links: {written} (up to {args.top} each)")
+    print(f"   Took {time.monotonic() - started:.2f}s")
+
+if __name__ == "__main__":
+    with profiled("related_episodes"):
+        main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Replay search queries against the archive database and report latency.
+
+Runs the same SQL as searchEpisodes() in src/lib/search.ts, with every sort
+order, on a read-only connection: the segments_fts path when the table
+exists and the legacy transcripts_fts path when that does. Queries come from
+a file (one per line, # for comments) or are generated from player names,
+show topics and the index vocabulary. Exits 1 if any query's p99 is over
+the budget. A query FTS5 rejects (a bare AND/OR/NOT/NEAR, say) is recorded
+as an error with no results, as the app shows it, and the replay goes on.
+"""
+
+import argparse
+import json
+import random
+import re
+import sqlite3
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from instrumentation import profiled
+
+DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
+
+SORTS = ("relevance", "newest", "oldest")
+
+# Keep in sync with src/lib/search.ts
+HITS_PER_EPISODE = 3
+
+ORDER_BY = {
+    "segments": {
+        "relevance": "ORDER BY best.rank",
+        "newest": "ORDER BY e.published_at DESC",
+        "oldest": "ORDER BY e.published_at ASC",
+    },
+    "transcripts": {
+        "relevance": "ORDER BY rank",
+        "newest": "ORDER BY e.published_at DESC",
+        "oldest": "ORDER BY e.published_at ASC",
+    },
+}
+
+SEGMENT_EPISODES = """
+    WITH best AS (
+      SELECT s.episode_id, fts.rowid AS best_rowid, MIN(fts.rank) AS rank
+      FROM segments_fts fts
+      JOIN transcript_segments s ON s.rowid = fts.rowid
+      WHERE segments_fts MATCH ?
+      GROUP BY s.episode_id
+    )
+    SELECT e.id, e.title, e.published_at, e.duration_seconds, e.youtube_url,
+           e.transcript_word_count, best.best_rowid
+    FROM best
+    JOIN episodes e ON e.id = best.episode_id
+    {order_by}
+    LIMIT ?
+"""
+
+SEGMENT_MORE_HITS = """
+    SELECT rowid FROM (
+      SELECT fts.rowid, ROW_NUMBER() OVER (PARTITION BY s.episode_id ORDER BY s.seq) AS n
+      FROM segments_fts fts
+      JOIN transcript_segments s ON s.rowid = fts.rowid
+      WHERE segments_fts MATCH ? AND s.episode_id IN ({ids})
+    )
+    WHERE n <= ?
+"""
+
+SEGMENT_SNIPPETS = """
+    SELECT segments_fts.rowid, s.episode_id, s.seq, s.char_offset,
+           snippet(segments_fts, 0, '|||', '|||', '...', 32) AS snippet
+    FROM segments_fts
+    JOIN transcript_segments s ON s.rowid = segments_fts.rowid
+    WHERE segments_fts MATCH ? AND segments_fts.rowid IN ({rowids})
+    ORDER BY s.seq
+"""
+
+TRANSCRIPT_SEARCH = """
+    SELECT e.id, e.title, e.published_at, e.duration_seconds, e.youtube_url,
+           e.transcript_word_count, t.content
+    FROM transcripts_fts fts
+    JOIN transcripts t ON t.episode_id = fts.episode_id
+    JOIN episodes e ON e.id = fts.episode_id
+    WHERE transcripts_fts MATCH ?
+    {order_by}
+    LIMIT ?
+"""
+
+MATCH_COUNT = {
+    "segments": "SELECT COUNT(*) FROM segments_fts WHERE segments_fts MATCH ?",
+    "transcripts": "SELECT COUNT(*) FROM transcripts_fts WHERE transcripts_fts MATCH ?",
+}
+
+PLAYERS = [
+    "Justin Jefferson", "CeeDee Lamb", "Bijan Robinson", "Christian McCaffrey",
+    "Puka Nacua", "Ja'Marr Chase", "Breece Hall", "Jahmyr Gibbs", "Saquon Barkley",
+    "Josh Allen", "Lamar Jackson", "Travis Kelce", "Tyreek Hill", "Garrett Wilson",
+]
+
+TOPICS = [
+    "waiver wire", "start sit", "sleepers", "best ball", "dynasty rookies",
+    "trade deadline", "DFS", "injury report", "playoff schedule", "draft strategy",
+]
+
+def fts_query(query: str) -> str:
+    """The MATCH expression searchEpisodes() builds: words OR-joined."""
+    return " OR ".join(re.sub(r"[^\w\s]", " ", query, flags=re.ASCII).split())
+
+def search_paths(conn) -> list:
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    return [path for path, table in (("segments", "segments_fts"), ("transcripts", "transcripts_fts"))
+            if table in tables]
+
+def run_segments(conn, match: str, sort: str, limit: int) -> int:
+    episodes = conn.execute(
+        SEGMENT_EPISODES.format(order_by=ORDER_BY["segments"][sort]), (match, limit)
+    ).fetchall()
+    if not episodes:
+        return 0
+    ids = [row[0] for row in episodes]
+    more = conn.execute(
+        SEGMENT_MORE_HITS.format(ids=", ".join("?" * len(ids))), (match, *ids, HITS_PER_EPISODE)
+    ).fetchall()
+    best = [row[6] for row in episodes]
+    rowids = best + [row[0] for row in more if row[0] not in set(best)]
+    conn.execute(SEGMENT_SNIPPETS.format(rowids=", ".join("?" * len(rowids))), (match, *rowids)).fetchall()
+    return len(episodes)
+
+def run_transcripts(conn, match: str, sort: str, limit: int) -> int:
+    rows = conn.execute(
+        TRANSCRIPT_SEARCH.format(order_by=ORDER_BY["transcripts"][sort]), (match, limit)
+    ).fetchall()
+    return len(rows)
+
+RUNNERS = {"segments": run_segments, "transcripts": run_transcripts}
+
+def query_plans(conn, path: str, sort: str, match: str, limit: int) -> list:
+    """EXPLAIN QUERY PLAN for the statement(s) a search runs, one list per statement."""
+    if path == "transcripts":
+        statements = [(TRANSCRIPT_SEARCH.format(order_by=ORDER_BY[path][sort]), (match, limit))]
+    else:
+        statements = [
+            (SEGMENT_EPISODES.format(order_by=ORDER_BY[path][sort]), (match, limit)),
+            (SEGMENT_MORE_HITS.format(ids="?"), (match, "", HITS_PER_EPISODE)),
+            (SEGMENT_SNIPPETS.format(rowids="?"), (match, 0)),
+        ]
+    return [[row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+            for sql, params in statements]
+
+def generated_queries(conn, count: int, seed: int) -> list:
+    """Player names and topics, plus common and rare words from the index."""
+    rng = random.Random(seed)
+    queries = PLAYERS + TOPICS
+    table = "segments_fts" if "segments" in search_paths(conn) else "transcripts_fts"
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE temp.vocab USING fts5vocab(main, {table}, 'row')")
+        terms = [row[0] for row in conn.execute(
+            "SELECT term FROM temp.vocab WHERE length(term) > 3 ORDER BY doc DESC LIMIT 2000"
+        )]
+    except sqlite3.OperationalError:
+        terms = []
+    if terms:
+        common, rare = terms[:100], terms[100:]
+        queries += [rng.choice(common) for _ in range(5)]
+        queries += [rng.choice(rare or common) for _ in range(5)]
+        queries += [" ".join(rng.sample(terms, 3)) for _ in range(5)]
+    rng.shuffle(queries)
+    return queries[:count]
+
+def read_queries(path: Path) -> list:
+    lines = (line.strip() for line in path.read_text().splitlines())
+    return [line for line in lines if line and not line.startswith("#")]
+
+def percentile(timings: list, pct: int) -> float:
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[pct - 1]
+
+def measure(conn, path: str, query: str, sort: str, limit: int, runs: int) -> dict:
+    match = fts_query(query)
+    runner = RUNNERS[path]
+    result = {"path": path, "sort": sort, "query": query, "match": match}
+    try:
+        returned = runner(conn, match, sort, limit)  # warm the page cache
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            runner(conn, match, sort, limit)
+            timings.append((time.perf_counter() - started) * 1000)
+        matched = conn.execute(MATCH_COUNT[path], (match,)).fetchone()[0]
+    except sqlite3.OperationalError as e:
+        # searchEpisodes() catches this too and shows no results
+        return {**result, "error": str(e), "matched": 0, "returned": 0,
+                "p50_ms": None, "p99_ms": None, "max_ms": None, "plans": []}
+    return {
+        **result,
+        "matched": matched,
+        "returned": returned,
+        "p50_ms": percentile(timings, 50),
+        "p99_ms": percentile(timings, 99),
+        "max_ms": max(timings),
+        "plans": query_plans(conn, path, sort, match, limit),
+    }
+
+def distinct_plans(results: list) -> dict:
+    """{(path, sort): [(plans, queries that got them), ...]}, most common plan first."""
+    grouped = {}
+    for result in results:
+        if result["plans"]:
+            plans = grouped.setdefault((result["path"], result["sort"]), {})
+            key = json.dumps(result["plans"])
+            plans.setdefault(key, []).append(result["query"])
+    return {
+        name: sorted(((json.loads(key), queries) for key, queries in plans.items()), key=lambda p: -len(p[1]))
+        for name, plans in grouped.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="archive database (opened read-only)")
+    parser.add_argument("--queries", type=Path, help="query file, one search per line (default: generated)")
+    parser.add_argument("--count", type=int, default=40, help="generated queries (default: 40)")
+    parser.add_argument("--seed", type=int, default=1, help="seed for generated queries (default: 1)")
+    parser.add_argument("--path", choices=["segments", "transcripts"], action="append",
+                        help="search path(s) to replay (default: every one the database has)")
+    parser.add_argument("--sort", choices=SORTS, action="append", help="sort order(s) (default: all)")
+    parser.add_argument("--limit", type=int, default=20, help="results per search (default: 20, as the app)")
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per query and sort (default: 20)")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="p99 budget per search (default: 50)")
+    parser.add_argument("--json", type=Path, help="also write the full report here")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+    available = search_paths(conn)
+    paths = [path for path in (args.path or available) if path in available]
+    if not paths:
+        print(f"❌ {args.db} has no segments_fts or transcripts_fts", file=sys.stderr)
+        sys.exit(1)
+    sorts = args.sort or list(SORTS)
+    queries = read_queries(args.queries) if args.queries else generated_queries(conn, args.count, args.seed)
+
+    results = []
+    print(f"{'path':<12}{'sort':<10}{'query':<28}{'matched':>9}{'rows':>6}{'p50 ms':>9}{'p99 ms':>9}")
+    for path in paths:
+        for sort in sorts:
+            for query in queries:
+                if not fts_query(query):
+                    continue
+                result = measure(conn, path, query, sort, args.limit, args.runs)
+                results.append(result)
+                if "error" in result:
+                    result["over_budget"] = False
+                    print(f"{path:<12}{sort:<10}{query[:27]:<28}{0:>9}{0:>6}   {result['error']}")
+                    continue
+                result["over_budget"] = result["p99_ms"] > args.budget_ms
+                marker = " ❌" if result["over_budget"] else ""
+                print(f"{path:<12}{sort:<10}{query[:27]:<28}{result['matched']:>9}{result['returned']:>6}"
+                      f"{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}{marker}")
+
+    conn.close()
+
+    print("\nQuery plans (identical plans merged):")
+    for (path, sort), plans in distinct_plans(results).items():
+        for statements, plan_queries in plans:
+            example = f", e.g. {plan_queries[0]!r}" if len(plans) > 1 else ""
+            print(f"   {path}/{sort} ({len(plan_queries)} queries{example}):")
+            for i, plan in enumerate(statements, 1):
+                label = "" if len(statements) == 1 else f"#{i} "
+                print(f"      {label}{' | '.join(plan)}")
+
+    over = [result for result in results if result["over_budget"]]
+    failed = [result for result in results if "error" in result]
+    print(f"\n✅ Replayed {len(results)} searches ({len(queries)} queries × {len(sorts)} sorts × {len(paths)} paths)")
+    if failed:
+        print(f"   FTS5 errors: {len(failed)} searches (no results, as in the app)")
+    for path in paths:
+        for sort in sorts:
+            timed = [r for r in results if r["path"] == path and r["sort"] == sort and "error" not in r]
+            p50s = [r["p50_ms"] for r in timed]
+            p99s = [r["p99_ms"] for r in timed]
+            if p50s:
+                print(f"   {path}/{sort}: median p50 {statistics.median(p50s):.2f}ms, worst p99 {max(p99s):.2f}ms")
+
+    if args.json:
+        args.json.write_text(json.dumps({"budget_ms": args.budget_ms, "results": results}, indent=2))
+        print(f"   Report: {args.json}")
+
+    if over:
+        print(f"\n❌ {len(over)} searches over the {args.budget_ms:g}ms budget:", file=sys.stderr)
+        for result in over:
+            print(f"   {result['path']}/{result['sort']} {result['query']!r}: p99 {result['p99_ms']:.2f}ms",
+                  file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    with profiled("search_latency"):
+        main()
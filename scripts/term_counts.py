@@ -0,0 +1,159 @@
+"""Per-episode term counts and per-month totals for "mentions over time".
+
+Each transcript is tokenized once at build time. `episode_terms` keeps how
+often every term occurs in every episode, tagged with the month the episode
+was published, and `term_months` keeps the totals per (term, month), so a
+trend is a range scan of one term's rows instead of an FTS pass over every
+transcript. Triggers on `episode_terms` keep `term_months` in step, so
+recounting one episode touches only that episode's rows.
+
+`term_scans` holds a hash of the text and the month each episode was counted
+with; scripts/index_terms.py recounts an episode only when either changes.
+Deleting a transcript deletes its counts by trigger.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+# Same word rule as the entity gazetteer, so a player's surname counts as a term
+WORD = re.compile(r"[a-z0-9]+")
+
+MONTH = re.compile(r"^(\d{4}-\d{2})")
+
+# Function words and talk-radio filler; they would be most of the rows and
+# never make an interesting trend
+STOPWORDS = frozenset("""
+a about after again all also am an and any are as at back be because been before being
+but by can could did do does doing don down even for from get go going gonna got had has
+have having he her here him his how i if in into is it its just know let like ll me more
+most my no not now of off oh ok okay on one only or other our out over really right s
+said say see she so some still t than that the their them then there these they thing
+think this those through to too uh um up us ve very was way we well were what when where
+which who why will with would yeah yes you your
+""".split())
+
+# Shortest term worth counting; shorter tokens are mostly contractions and numbers
+MIN_LENGTH = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS episode_terms (
+    episode_id TEXT NOT NULL,
+    term_id INTEGER NOT NULL,
+    month TEXT,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (episode_id, term_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS term_months (
+    term_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    episodes INTEGER NOT NULL,
+    PRIMARY KEY (term_id, month)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS term_scans (
+    episode_id TEXT PRIMARY KEY,
+    text_hash TEXT NOT NULL,
+    month TEXT
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS transcripts_terms_ad AFTER DELETE ON transcripts BEGIN
+    DELETE FROM episode_terms WHERE episode_id = old.episode_id;
+    DELETE FROM term_scans WHERE episode_id = old.episode_id;
+END;
+"""
+
+TRIGGERS = {
+    "episode_terms_ai": """
+        CREATE TRIGGER IF NOT EXISTS episode_terms_ai AFTER INSERT ON episode_terms
+        WHEN new.month IS NOT NULL BEGIN
+            INSERT INTO term_months (term_id, month, count, episodes)
+            VALUES (new.term_id, new.month, new.count, 1)
+            ON CONFLICT (term_id, month) DO UPDATE SET
+                count = count + excluded.count, episodes = episodes + 1;
+        END
+    """,
+    "episode_terms_ad": """
+        CREATE TRIGGER IF NOT EXISTS episode_terms_ad AFTER DELETE ON episode_terms
+        WHEN old.month IS NOT NULL BEGIN
+            UPDATE term_months SET count = count - old.count, episodes = episodes - 1
+            WHERE term_id = old.term_id AND month = old.month;
+            DELETE FROM term_months
+            WHERE term_id = old.term_id AND month = old.month AND episodes <= 0;
+        END
+    """,
+}
+
+INSERT_EPISODE_TERM = "INSERT INTO episode_terms (episode_id, term_id, month, count) VALUES (?, ?, ?, ?)"
+
+REBUILD_MONTHS = """
+    INSERT INTO term_months (term_id, month, count, episodes)
+    SELECT term_id, month, SUM(count), COUNT(*) FROM episode_terms
+    WHERE month IS NOT NULL
+    GROUP BY term_id, month
+"""
+
+
+def has_terms(conn) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'term_months'").fetchone()
+    return row is not None
+
+
+def create_schema(conn):
+    conn.executescript(SCHEMA)
+    create_triggers(conn)
+
+
+def create_triggers(conn):
+    for sql in TRIGGERS.values():
+        conn.execute(sql)
+
+
+def drop_triggers(conn):
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def month_of(published_at: str | None) -> str | None:
+    """'YYYY-MM' for an ISO published_at; None for undated (or RSS-format) episodes."""
+    match = MONTH.match(published_at or "")
+    return match.group(1) if match else None
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def count_terms(text: str) -> Counter:
+    """Occurrences of every countable term in a transcript."""
+    counts = Counter(WORD.findall(text.lower()))
+    for term in [term for term in counts if term in STOPWORDS or len(term) < MIN_LENGTH]:
+        del counts[term]
+    return counts
+
+
+class TermIds:
+    """
+    term -> terms.id, adding terms the first time they're seen. Ids are
+    handed out here rather than read back, so use it inside the write
+    transaction that inserts them.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.ids = dict(conn.execute("SELECT term, id FROM terms"))
+        self.next_id = max(self.ids.values(), default=0) + 1
+
+    def lookup(self, terms) -> dict:
+        new = []
+        for term in terms:
+            if term not in self.ids:
+                self.ids[term] = self.next_id
+                new.append((self.next_id, term))
+                self.next_id += 1
+        if new:
+            self.conn.executemany("INSERT INTO terms (id, term) VALUES (?, ?)", new)
+        return self.ids
@@ -0,0 +1,227 @@
+"""Dates from episode titles, for episodes the feeds left undated.
+
+Exact dates ("October 5, 2023", "2023-10-05") win. Failing that, titles that
+name a point in the NFL calendar ("Week 7", "Wild Card", "2024 NFL Draft")
+get an estimate computed from that season's schedule, so a new season needs
+no new tables. All the calendar phrases are found in one pass over the title
+by PhraseMatcher, which gazetteer-style scans can reuse.
+"""
+
+import re
+from functools import lru_cache
+from datetime import date, datetime, timedelta
+
+
+MONTHS = {
+    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'sept': 9,
+    'october': 10, 'oct': 10, 'november': 11, 'nov': 11, 'december': 12, 'dec': 12,
+}
+
+MONTH_DATE = re.compile(
+    r'\b(' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?\s+(\d{1,2})(?:st|nd|rd|th)?,?\s+(\d{4})\b'
+)
+ISO_DATE = re.compile(r'\b(\d{4})-(\d{2})-(\d{2})\b')
+YEAR = re.compile(r'\b(20\d{2})\b')
+YEAR_LED_CONTENT = re.compile(r'\b(20\d{2})\s+(?:dfs|fantasy)\b')
+WORD = re.compile(r'[a-z0-9]+')
+
+REGULAR_SEASON_WEEKS = 18
+
+# Days after the week 18 game for each playoff round (Saturday wild card
+# round through the Super Bowl Sunday)
+POSTSEASON = {
+    'wild card': 9, 'wildcard': 9, 'divisional': 16,
+    'conference': 24, 'championship sunday': 24, 'super bowl': 38,
+}
+
+# phrase -> (rule, value); rules earlier in RULE_ORDER win
+PHRASES = {
+    **{f'week {n}': ('week', n) for n in range(1, REGULAR_SEASON_WEEKS + 1)},
+    **{phrase: ('postseason', days) for phrase, days in POSTSEASON.items()},
+    'dfs': ('season_content', None),
+    'fantasy': ('season_content', None),
+    'nfl draft': ('draft', None),
+    'best ball': ('best_ball', None),
+    'free agency': ('free_agency', None),
+}
+
+RULE_ORDER = ('week', 'postseason', 'season_content', 'draft', 'best_ball', 'free_agency')
+RULE_RANK = {rule: rank for rank, rule in enumerate(RULE_ORDER)}
+
+# Rules dated from the season the title is about, rather than its calendar year
+SEASON_RULES = {'week', 'postseason'}
+
+
+class PhraseMatcher:
+    """
+    Finds whole-word occurrences of a fixed set of phrases in one scan.
+
+    Aho-Corasick in spirit: the phrases go into a word trie, and the trie is
+    compiled into a single regex, so shared prefixes ("week 1", "week 10")
+    are tested once per position and the scan itself runs inside `re`
+    rather than a Python loop. Longer phrases win where they overlap, and
+    case and punctuation between words are ignored ("Wild-Card").
+    """
+
+    def __init__(self, phrases):
+        self.phrases = {}
+        # Matched text -> phrase, so each spelling is normalized only once
+        self.spellings = {}
+        trie = {}
+        for phrase in phrases:
+            words = WORD.findall(phrase.lower())
+            if not words:
+                continue
+            self.phrases.setdefault(" ".join(words), phrase)
+            node = trie
+            for word in words:
+                node = node.setdefault(word, {})
+            node[""] = {}
+        self.pattern = re.compile(r"(?<![a-z0-9])(?:%s)(?![a-z0-9])" % self._trie_regex(trie))
+
+    @classmethod
+    def _trie_regex(cls, node: dict) -> str:
+        branches = []
+        # Longest words first so "week 1" can't stop short of "week 10"
+        for word in sorted((w for w in node if w), key=len, reverse=True):
+            child = node[word]
+            rest = cls._trie_regex(child) if any(child) else ""
+            if rest:
+                optional = "?" if "" in child else ""
+                branches.append(f"{re.escape(word)}(?:[^a-z0-9]+(?:{rest})){optional}")
+            else:
+                branches.append(re.escape(word))
+        return "|".join(branches)
+
+    def phrase(self, found: str) -> str:
+        """The phrase a (lowercased) match of the pattern spells."""
+        phrase = self.spellings.get(found)
+        if phrase is None:
+            phrase = self.spellings[found] = self.phrases[" ".join(WORD.findall(found))]
+        return phrase
+
+    def find(self, text: str):
+        """Yield (start, end, phrase) character spans for each occurrence in `text`."""
+        for match in self.pattern.finditer(text.lower()):
+            yield match.start(), match.end(), self.phrase(match.group())
+
+    def findall(self, text: str) -> list:
+        """The phrases in `text` in order of appearance, without their spans (faster)."""
+        return [self.phrase(found) for found in self.pattern.findall(text.lower())]
+
+
+CALENDAR = PhraseMatcher(PHRASES)
+
+
+def nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    """The nth (1-based; -1 for last) Monday=0..Sunday=6 of a month."""
+    if n > 0:
+        first = date(year, month, 1)
+        return first + timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1))
+    return last - timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def season_opener(season: int) -> date:
+    """Kickoff is the Thursday after Labor Day (the first Monday in September)."""
+    return nth_weekday(season, 9, 0, 1) + timedelta(days=3)
+
+
+def week_date(season: int, week: int) -> date:
+    return season_opener(season) + timedelta(weeks=week - 1)
+
+
+def postseason_date(season: int, days_after_week_18: int) -> date:
+    return week_date(season, REGULAR_SEASON_WEEKS) + timedelta(days=days_after_week_18)
+
+
+def draft_date(year: int) -> date:
+    """Round one is the last Thursday in April."""
+    return nth_weekday(year, 4, 3, -1)
+
+
+def free_agency_date(year: int) -> date:
+    """The new league year opens on the Wednesday in March 12-18."""
+    start = date(year, 3, 12)
+    return start + timedelta(days=(2 - start.weekday()) % 7)
+
+
+@lru_cache(maxsize=None)
+def calendar_date(rule: str, value, year: int) -> str:
+    """YYYY-MM-DD for one calendar rule; a backfill only ever needs a few dozen."""
+    if rule == 'week':
+        return week_date(year, value).isoformat()
+    if rule == 'postseason':
+        return postseason_date(year, value).isoformat()
+    if rule == 'season_content':
+        return date(year, 10, 1).isoformat()
+    if rule == 'draft':
+        return draft_date(year).isoformat()
+    if rule == 'best_ball':
+        return date(year, 6, 1).isoformat()
+    return free_agency_date(year).isoformat()
+
+
+def exact_date(title: str) -> str | None:
+    """A calendar date written out in the title, as YYYY-MM-DD."""
+    match = MONTH_DATE.search(title.lower())
+    if match:
+        try:
+            return date(int(match.group(3)), MONTHS[match.group(1)], int(match.group(2))).isoformat()
+        except ValueError:
+            pass
+    match = ISO_DATE.search(title) if '-' in title else None
+    if match:
+        try:
+            return date(*map(int, match.groups())).isoformat()
+        except ValueError:
+            pass
+    return None
+
+
+def estimated_date(title: str, default_season: int | None = None) -> str | None:
+    """
+    An estimate from the NFL calendar phrases in the title. Week and playoff
+    dates use the first year in the title as the season, else
+    `default_season`; the offseason rules need a year in the title.
+    """
+    title_lower = title.lower()
+    phrases = CALENDAR.findall(title_lower)
+    if not phrases:
+        return None
+    match = YEAR.search(title_lower)
+    year = int(match.group(1)) if match else None
+    season = year or default_season
+
+    best = None
+    for position, phrase in enumerate(phrases):
+        rule, value = PHRASES[phrase]
+        if rule == 'season_content':
+            # "2023 DFS", "2024 Fantasy": the year has to lead the phrase
+            match = YEAR_LED_CONTENT.search(title_lower)
+            when = int(match.group(1)) if match else None
+        else:
+            when = season if rule in SEASON_RULES else year
+        if when:
+            candidate = (RULE_RANK[rule], position, rule, value, when)
+            if best is None or candidate < best:
+                best = candidate
+    if best is None:
+        return None
+    _, _, rule, value, when = best
+    return calendar_date(rule, value, when)
+
+
+def extract_date(title: str, estimate: bool = True, default_season: int | None = None) -> str | None:
+    """The title's own date if it has one, else (with `estimate`) a calendar estimate."""
+    return exact_date(title) or (estimated_date(title, default_season) if estimate else None)
+
+
+def normalize_date(published_at: str) -> str | None:
+    """'Fri, 06 Feb 2026 10:30:00 GMT' (RSS pubDate) as YYYY-MM-DD."""
+    try:
+        return datetime.strptime(published_at, '%a, %d %b %Y %H:%M:%S GMT').strftime('%Y-%m-%d')
+    except (TypeError, ValueError):
+        return None
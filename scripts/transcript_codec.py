@@ -0,0 +1,140 @@
+"""Optional compressed storage for transcripts.content.
+
+A transcript row is either plain text (codec NULL) or a zlib stream
+(codec 'zlib') deflated against a preset dictionary from transcript_dicts,
+trained on the corpus itself. Short transcripts share most of their phrasing
+("you know", player names, show intros), which plain per-row zlib can't see;
+the dictionary gives every row that shared history up front.
+
+zlib rather than zstd because both Python's zlib module and Node's
+zlib.inflateSync({dictionary}) can read it with no extra dependencies.
+
+Compressed rows can't back an external-content FTS index, so
+scripts/compress_transcripts.py drops transcripts_fts and leaves search to
+segments_fts (see transcript_segments.py).
+"""
+
+import sqlite3
+import zlib
+from collections import Counter
+from datetime import datetime
+
+CODEC = "zlib"
+
+# zlib only looks back 32 KiB, so a bigger dictionary is wasted
+DICT_SIZE = 32768
+
+LEVEL = 9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_dicts (
+    id INTEGER PRIMARY KEY,
+    dict BLOB NOT NULL,
+    created_at TEXT
+);
+"""
+
+
+def ensure_schema(conn):
+    """Add the dictionary table and the codec/dict_id columns if missing."""
+    conn.executescript(SCHEMA)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(transcripts)")}
+    if "codec" not in columns:
+        conn.execute("ALTER TABLE transcripts ADD COLUMN codec TEXT")
+    if "dict_id" not in columns:
+        conn.execute("ALTER TABLE transcripts ADD COLUMN dict_id INTEGER")
+
+
+def train_dictionary(texts, size: int = DICT_SIZE, sample_chars: int = 4_000_000) -> bytes:
+    """
+    Build a preset dictionary from the phrases that recur most across the
+    corpus. Phrases are scored by (occurrences x length) and the best ones go
+    last, where deflate can reach them with the shortest distances.
+    """
+    texts = list(texts)
+    budget = sample_chars // max(1, len(texts))
+    counts = Counter()
+    for text in texts:
+        words = text[:budget].split()
+        for n in (3, 4, 6):
+            counts.update(" ".join(words[i:i + n]) for i in range(len(words) - n + 1))
+
+    chosen = []
+    used = 0
+    scored = sorted(
+        ((count * (len(phrase) + 1), phrase) for phrase, count in counts.items() if count > 2),
+        reverse=True
+    )
+    for _, phrase in scored:
+        if used >= size:
+            break
+        if any(phrase in other for other in chosen[-200:]):
+            continue
+        chosen.append(phrase)
+        used += len(phrase) + 1
+
+    dictionary = " ".join(reversed(chosen)).encode("utf-8")
+    return dictionary[-size:]
+
+
+def save_dictionary(conn, dictionary: bytes) -> int:
+    cursor = conn.execute(
+        "INSERT INTO transcript_dicts (dict, created_at) VALUES (?, ?)",
+        (dictionary, datetime.now().isoformat())
+    )
+    return cursor.lastrowid
+
+
+def latest_dictionary(conn) -> tuple[int, bytes] | None:
+    """(id, dictionary) new transcripts should be compressed with, if any."""
+    try:
+        row = conn.execute(
+            "SELECT id, dict FROM transcript_dicts ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+    except sqlite3.OperationalError:  # table not created yet
+        return None
+    return (row[0], row[1]) if row else None
+
+
+def compress(text: str, dictionary: bytes = b"", level: int = LEVEL) -> bytes:
+    if dictionary:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS, 9,
+                                      zlib.Z_DEFAULT_STRATEGY, dictionary)
+    else:
+        compressor = zlib.compressobj(level)
+    return compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+
+def decompress(blob: bytes, dictionary: bytes = b"") -> str:
+    decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+    return (decompressor.decompress(blob) + decompressor.flush()).decode("utf-8")
+
+
+def text_sql(conn) -> str:
+    """
+    SQL expression for the plain text of `transcripts.content`, registering
+    transcript_text() when the table has a codec column.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(transcripts)")}
+    if "codec" not in columns:
+        return "content"
+    register(conn)
+    return "transcript_text(content, codec, dict_id)"
+
+
+def register(conn):
+    """
+    Add a transcript_text(content, codec, dict_id) SQL function that returns
+    the plain text of a row whatever its storage.
+    """
+    dictionaries = {}
+
+    def transcript_text(content, codec, dict_id):
+        if codec != CODEC:
+            return content
+        if dict_id is not None and dict_id not in dictionaries:
+            row = conn.execute("SELECT dict FROM transcript_dicts WHERE id = ?", (dict_id,)).fetchone()
+            dictionaries[dict_id] = row[0]
+        return decompress(content, dictionaries.get(dict_id, b""))
+
+    conn.create_function("transcript_text", 3, transcript_text, deterministic=True)
@@ -0,0 +1,166 @@
+"""Transcripts split into short, individually indexed segments.
+
+Search matches and snippets come from `segments_fts` over `transcript_segments`
+instead of whole transcripts, so a query only ever reads the few hundred bytes
+around each hit and can report several hits per episode. Each segment keeps the
+character offset where it starts in `transcripts.content` and, for transcripts
+with timestamps, the time it starts at. The episode page pages through the
+same rows as transcript chunks.
+
+Segments are written by the import path (and scripts/backfill_segments.py for
+existing databases). Deleting a transcript deletes its segments by trigger, so
+consolidate_episodes.py and INSERT OR REPLACE need no extra bookkeeping.
+"""
+
+import re
+from bisect import bisect_right
+
+# Target segment length in characters; segments end at a sentence or line
+# break when one falls in the last third of the window, else at a space
+SEGMENT_CHARS = 800
+
+SENTENCE_END = re.compile(r"[.!?]\s+|\n+")
+
+# "[1:02:03]" or "(12:34)" anywhere, or a bare "12:34" starting a line
+TIMESTAMP = re.compile(r"[\[(](?:\d{1,2}:)?\d{1,2}:\d{2}[\])]|^(?:\d{1,2}:)?\d{1,2}:\d{2}\b", re.M)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_segments (
+    episode_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    char_offset INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    start_seconds INTEGER,
+    UNIQUE (episode_id, seq)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text,
+    content='transcript_segments',
+    content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS transcripts_segments_ad AFTER DELETE ON transcripts BEGIN
+    DELETE FROM transcript_segments WHERE episode_id = old.episode_id;
+END;
+"""
+
+TRIGGERS = {
+    "segments_fts_ai": """
+        CREATE TRIGGER IF NOT EXISTS segments_fts_ai AFTER INSERT ON transcript_segments BEGIN
+            INSERT INTO segments_fts (rowid, text) VALUES (new.rowid, new.text);
+        END
+    """,
+    "segments_fts_ad": """
+        CREATE TRIGGER IF NOT EXISTS segments_fts_ad AFTER DELETE ON transcript_segments BEGIN
+            INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+        END
+    """,
+    "segments_fts_au": """
+        CREATE TRIGGER IF NOT EXISTS segments_fts_au AFTER UPDATE ON transcript_segments BEGIN
+            INSERT INTO segments_fts (segments_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+            INSERT INTO segments_fts (rowid, text) VALUES (new.rowid, new.text);
+        END
+    """,
+}
+
+INSERT_SEGMENT = """
+    INSERT OR REPLACE INTO transcript_segments (episode_id, seq, char_offset, text, start_seconds)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+def has_segments(conn) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'transcript_segments'"
+    ).fetchone()
+    return row is not None
+
+
+def create_schema(conn):
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+    created = not has_segments(conn)
+    conn.executescript(SCHEMA)
+    # Tables created before timestamps were tracked
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(transcript_segments)")}
+    if "start_seconds" not in columns:
+        conn.execute("ALTER TABLE transcript_segments ADD COLUMN start_seconds INTEGER")
+    if not created and not set(TRIGGERS) <= existing:
+        # Segments written while the triggers were missing (a failed --bulk
+        # import used to drop them for good) never reached the index
+        conn.execute("INSERT INTO segments_fts(segments_fts) VALUES ('rebuild')")
+    create_triggers(conn)
+
+
+def create_triggers(conn):
+    for sql in TRIGGERS.values():
+        conn.execute(sql)
+
+
+def drop_triggers(conn):
+    for name in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def split_segments(content: str, size: int = SEGMENT_CHARS) -> list:
+    """
+    Split a transcript into (char_offset, text) pieces of about `size` chars.
+    Every piece is an exact slice of `content`, minus surrounding whitespace.
+    """
+    segments = []
+    start = 0
+    length = len(content)
+    while start < length:
+        end = min(start + size, length)
+        if end < length:
+            window = content[start + size * 2 // 3:end]
+            breaks = [m.end() for m in SENTENCE_END.finditer(window)]
+            if breaks:
+                end = start + size * 2 // 3 + breaks[-1]
+            else:
+                space = content.rfind(" ", start + 1, end)
+                if space != -1:
+                    end = space + 1
+        text = content[start:end]
+        stripped = text.strip()
+        if stripped:
+            segments.append((start + len(text) - len(text.lstrip()), stripped))
+        start = end
+    return segments
+
+
+def timestamps(content: str) -> tuple[list, list]:
+    """Offsets and times (seconds) of the timestamps in a transcript."""
+    offsets, seconds = [], []
+    for match in TIMESTAMP.finditer(content):
+        total = 0
+        for part in re.findall(r"\d+", match.group()):
+            total = total * 60 + int(part)
+        offsets.append(match.start())
+        seconds.append(total)
+    return offsets, seconds
+
+
+def segment_rows(episode_id: str, content: str, size: int = SEGMENT_CHARS) -> list:
+    """INSERT_SEGMENT parameter tuples for one transcript."""
+    content = content or ""
+    offsets, seconds = timestamps(content)
+    rows = []
+    for seq, (offset, text) in enumerate(split_segments(content, size)):
+        # The last timestamp seen up to its first character, else its own first one
+        i = bisect_right(offsets, offset)
+        if i:
+            start_seconds = seconds[i - 1]
+        elif offsets and offsets[0] < offset + len(text):
+            start_seconds = seconds[0]
+        else:
+            start_seconds = None
+        rows.append((episode_id, seq, offset, text, start_seconds))
+    return rows
+
+
+def write_segments(conn, episode_id: str, content: str) -> int:
+    """Replace the segments of one transcript; returns how many were written."""
+    conn.execute("DELETE FROM transcript_segments WHERE episode_id = ?", (episode_id,))
+    rows = segment_rows(episode_id, content)
+    conn.executemany(INSERT_SEGMENT, rows)
+    return len(rows)
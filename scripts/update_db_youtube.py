@@ -5,6 +5,8 @@ import json
 import sqlite3
 from pathlib import Path
 
+from instrumentation import profiled
+
 EPISODES_PATH = Path(__file__).parent.parent / "data/episodes_final.json"
 DB_PATH = Path(__file__).parent.parent / "data/swolecast.db"
 
@@ -71,4 +73,5 @@ def main():
     conn.close()
 
 if __name__ == "__main__":
-    main()
+    with profiled("update_db_youtube"):
+        main()
@@ -0,0 +1,332 @@
+"""Shared yt-dlp metadata fetching for the YouTube sync scripts.
+
+Every call shells out to the `yt-dlp` found on PATH, so the whole module can be
+exercised offline by putting a fake `yt-dlp` executable first on PATH.
+"""
+
+import json
+import queue
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+YTDLP = "yt-dlp"
+WATCH_URL = "https://www.youtube.com/watch?v={}"
+
+# stderr fragments that mean "try again later" rather than "this video is gone"
+TRANSIENT_ERRORS = (
+    "HTTP Error 429",
+    "HTTP Error 5",
+    "timed out",
+    "Connection reset",
+    "Temporary failure",
+    "Unable to download webpage",
+)
+
+# "ERROR: [youtube] dQw4w9WgXcQ: Video unavailable"
+ERROR_LINE = re.compile(r"^ERROR: \[[^\]]+\] ([\w-]+): (.*)$")
+
+
+class FetchError(Exception):
+    """A failed yt-dlp call; `transient` failures are worth retrying."""
+
+    def __init__(self, message: str, transient: bool):
+        super().__init__(message)
+        self.transient = transient
+
+
+def to_metadata(video_id: str, data: dict) -> dict:
+    """Reduce a yt-dlp --dump-json record to the fields we keep."""
+    return {
+        "id": video_id,
+        "title": data.get("title"),
+        "upload_date": data.get("upload_date"),  # YYYYMMDD format
+        "duration": data.get("duration"),
+        "channel": data.get("channel"),
+        "view_count": data.get("view_count"),
+        "url": WATCH_URL.format(video_id)
+    }
+
+
+def request_video_metadata(video_id: str, timeout: int = 30) -> dict:
+    """Fetch metadata for a single video, raising FetchError on failure."""
+    try:
+        result = subprocess.run(
+            [YTDLP, "--dump-json", WATCH_URL.format(video_id)],
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    except subprocess.TimeoutExpired:
+        raise FetchError(f"yt-dlp timed out after {timeout}s", transient=True)
+
+    if result.returncode != 0:
+        message = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"exit {result.returncode}"
+        transient = any(marker in result.stderr for marker in TRANSIENT_ERRORS)
+        raise FetchError(message, transient=transient)
+
+    try:
+        return to_metadata(video_id, json.loads(result.stdout))
+    except json.JSONDecodeError as e:
+        raise FetchError(f"bad JSON from yt-dlp: {e}", transient=True)
+
+
+def fetch_video_metadata(video_id: str) -> dict | None:
+    """Fetch metadata for a single video."""
+    try:
+        return request_video_metadata(video_id)
+    except Exception as e:
+        print(f"  Error fetching {video_id}: {e}", file=sys.stderr)
+    return None
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `burst` saved."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def fetch_with_retry(video_id: str, bucket: TokenBucket, retries: int = 3,
+                     backoff: float = 1.0, timeout: int = 30) -> dict:
+    """
+    Fetch one video, retrying transient failures with exponential backoff.
+    Returns a result dict: id, metadata, error, attempts, elapsed.
+    """
+    started = time.monotonic()
+    error = None
+    attempts = 0
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        attempts += 1
+        try:
+            metadata = request_video_metadata(video_id, timeout=timeout)
+            return {"id": video_id, "metadata": metadata, "error": None,
+                    "attempts": attempts, "elapsed": time.monotonic() - started}
+        except FetchError as e:
+            error = str(e)
+            if not e.transient or attempt == retries:
+                break
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random() * 0.25))
+        except Exception as e:
+            error = str(e)
+            break
+
+    return {"id": video_id, "metadata": None, "error": error,
+            "attempts": attempts, "elapsed": time.monotonic() - started}
+
+
+def fetch_many(video_ids: list, concurrency: int = 4, rate: float = 2.0,
+               retries: int = 3, backoff: float = 1.0, timeout: int = 30):
+    """
+    Fetch many videos on a thread pool, yielding result dicts as they finish.
+    At most `concurrency` yt-dlp processes run at once and at most `rate` are
+    started per second (rate <= 0 disables the limit).
+    """
+    bucket = TokenBucket(rate, burst=concurrency)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [
+            pool.submit(fetch_with_retry, video_id, bucket, retries, backoff, timeout)
+            for video_id in video_ids
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def fetch_batch(video_ids: list, timeout: int = 30):
+    """
+    Fetch many videos with a single yt-dlp process, yielding result dicts as
+    each --dump-json line arrives. IDs that produce no record are reported
+    individually using the matching ERROR line from stderr.
+    """
+    started = time.monotonic()
+    last = started
+    process = subprocess.Popen(
+        [YTDLP, "--dump-json", "--ignore-errors", *[WATCH_URL.format(v) for v in video_ids]],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+
+    # Drain stderr on the side so a chatty yt-dlp can't block on a full pipe
+    errors = {}
+    def read_stderr():
+        for line in process.stderr:
+            match = ERROR_LINE.match(line.strip())
+            if match:
+                errors[match.group(1)] = line.strip()
+    stderr_reader = threading.Thread(target=read_stderr, daemon=True)
+    stderr_reader.start()
+
+    # The whole batch gets the per-video timeout budget
+    watchdog = threading.Timer(timeout * len(video_ids), process.kill)
+    watchdog.start()
+
+    wanted = set(video_ids)
+    seen = set()
+    try:
+        for line in process.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            video_id = data.get("id")
+            if video_id not in wanted or video_id in seen:
+                continue
+            seen.add(video_id)
+            now = time.monotonic()
+            yield {"id": video_id, "metadata": to_metadata(video_id, data), "error": None,
+                   "attempts": 1, "elapsed": now - last}
+            last = now
+        process.wait()
+    finally:
+        watchdog.cancel()
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        stderr_reader.join(timeout=5)
+
+    timed_out = process.returncode is not None and process.returncode < 0
+    for video_id in video_ids:
+        if video_id in seen:
+            continue
+        error = errors.get(video_id)
+        if error is None:
+            error = "yt-dlp batch timed out" if timed_out else "no record in yt-dlp output"
+        transient = timed_out or any(marker in error for marker in TRANSIENT_ERRORS)
+        yield {"id": video_id, "metadata": None, "error": error, "attempts": 1,
+               "elapsed": time.monotonic() - started, "transient": transient}
+
+
+def fetch_batch_with_retry(video_ids: list, bucket: TokenBucket, retries: int = 3,
+                           backoff: float = 1.0, timeout: int = 30):
+    """
+    Run one batch, re-batching only the IDs that failed transiently.
+    Successes are yielded as they stream in; failures once retries run out.
+    """
+    spent = {}
+    pending = list(video_ids)
+    for attempt in range(retries + 1):
+        bucket.acquire()
+        retry = []
+        for result in fetch_batch(pending, timeout=timeout):
+            attempts, elapsed = spent.get(result["id"], (0, 0.0))
+            result["attempts"] += attempts
+            result["elapsed"] += elapsed
+            transient = result.pop("transient", False)
+            if transient and attempt < retries:
+                spent[result["id"]] = (result["attempts"], result["elapsed"])
+                retry.append(result["id"])
+            else:
+                yield result
+        if not retry:
+            break
+        pending = retry
+        time.sleep(backoff * (2 ** attempt) * (1 + random.random() * 0.25))
+
+
+def fetch_batches(video_ids: list, batch_size: int = 50, concurrency: int = 2,
+                  rate: float = 2.0, retries: int = 3, backoff: float = 1.0,
+                  timeout: int = 30):
+    """
+    Like fetch_many, but each worker hands `batch_size` IDs to one yt-dlp
+    process so interpreter startup is paid once per batch, not per video.
+    Results from all workers are yielded as soon as each record is parsed.
+    """
+    batches = [video_ids[i:i + batch_size] for i in range(0, len(video_ids), batch_size)]
+    bucket = TokenBucket(rate, burst=concurrency)
+    results = queue.Queue()
+
+    def run(batch):
+        try:
+            for result in fetch_batch_with_retry(batch, bucket, retries, backoff, timeout):
+                results.put(result)
+        finally:
+            results.put(None)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(run, batch) for batch in batches]
+        remaining = len(batches)
+        while remaining:
+            result = results.get()
+            if result is None:
+                remaining -= 1
+                continue
+            yield result
+        for future in futures:
+            future.result()
+
+
+def fetch_all(video_ids: list, args):
+    """Dispatch to per-video or batched fetching based on parsed CLI args."""
+    if args.batch_size > 0:
+        return fetch_batches(video_ids, args.batch_size, args.concurrency, args.rate,
+                             args.retries, args.backoff, args.timeout)
+    return fetch_many(video_ids, args.concurrency, args.rate,
+                      args.retries, args.backoff, args.timeout)
+
+
+def timing_stats(results: list, wall_seconds: float) -> dict:
+    """Summarize per-video timings from fetch_many results."""
+    elapsed = sorted(r["elapsed"] for r in results)
+
+    def percentile(p):
+        if not elapsed:
+            return 0.0
+        return elapsed[min(len(elapsed) - 1, int(round(p * (len(elapsed) - 1))))]
+
+    return {
+        "videos": len(results),
+        "ok": sum(1 for r in results if r["metadata"]),
+        "failed": sum(1 for r in results if not r["metadata"]),
+        "retried": sum(1 for r in results if r["attempts"] > 1),
+        "wall_seconds": round(wall_seconds, 2),
+        "p50_seconds": round(percentile(0.50), 2),
+        "p95_seconds": round(percentile(0.95), 2),
+        "max_seconds": round(elapsed[-1], 2) if elapsed else 0.0,
+        "videos_per_second": round(len(results) / wall_seconds, 2) if wall_seconds else 0.0,
+    }
+
+
+def add_fetch_arguments(parser):
+    """Register the shared concurrency / rate-limit options on an argparse parser."""
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="max yt-dlp processes running at once (default: 4)")
+    parser.add_argument("--rate", type=float, default=2.0,
+                        help="max yt-dlp calls started per second, 0 for unlimited (default: 2)")
+    parser.add_argument("--retries", type=int, default=3,
+                        help="retries for transient failures (default: 3)")
+    parser.add_argument("--backoff", type=float, default=1.0,
+                        help="base seconds for exponential retry backoff (default: 1)")
+    parser.add_argument("--timeout", type=int, default=30,
+                        help="per-video yt-dlp timeout in seconds (default: 30)")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="IDs per yt-dlp process; 0 spawns one process per video (default: 0)")
+    parser.add_argument("--max-attempts", type=int, default=5,
+                        help="stop retrying a failed video after this many runs (default: 5)")
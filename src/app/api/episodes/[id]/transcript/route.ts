@@ -0,0 +1,25 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { getTranscriptChunks, TRANSCRIPT_PAGE_SIZE } from '@/lib/episodes';
+
+export async function GET(
+  request: NextRequest,
+  props: { params: Promise<{ id: string }> }
+) {
+  const params = await props.params;
+  const searchParams = request.nextUrl.searchParams;
+  const from = Math.max(parseInt(searchParams.get('from') || '0') || 0, 0);
+  const count = Math.min(
+    Math.max(parseInt(searchParams.get('count') || '') || TRANSCRIPT_PAGE_SIZE, 1),
+    100
+  );
+
+  const page = getTranscriptChunks(params.id, from, count);
+  if (!page) {
+    return NextResponse.json({ error: 'Transcript not found' }, { status: 404 });
+  }
+
+  // The database only changes with a deploy
+  return NextResponse.json(page, {
+    headers: { 'Cache-Control': 'public, max-age=3600, s-maxage=86400' },
+  });
+}
@@ -0,0 +1,19 @@
+import { NextRequest, NextResponse } from 'next/server';
+import { getTrend } from '@/lib/trends';
+
+export async function GET(request: NextRequest) {
+  const query = request.nextUrl.searchParams.get('q') || '';
+
+  const trend = getTrend(query);
+  if (!trend) {
+    return NextResponse.json(
+      { error: 'Trends cover single words and player or team names' },
+      { status: 400 }
+    );
+  }
+
+  // The database only changes with a deploy
+  return NextResponse.json(trend, {
+    headers: { 'Cache-Control': 'public, max-age=3600, s-maxage=86400' },
+  });
+}
@@ -1,6 +1,14 @@
 import { notFound } from 'next/navigation';
 import Link from 'next/link';
-import { getEpisodeById, getTranscript, getAllEpisodes } from '@/lib/episodes';
+import TranscriptChunks from '@/components/TranscriptChunks';
+import {
+  getEpisodeById,
+  getTranscript,
+  getTranscriptChunks,
+  getAllEpisodes,
+  getRelatedEpisodes,
+  TRANSCRIPT_PAGE_SIZE,
+} from '@/lib/episodes';
 import { formatDate, formatDuration, formatNumber, getYouTubeId } from '@/lib/utils';
 import type { Metadata } from 'next';
 
@@ -28,8 +36,12 @@ export default async function EpisodePage(props: {
   const episode = getEpisodeById(params.id);
   if (!episode) notFound();
 
-  const transcript = getTranscript(params.id);
+  // Only the first page of segments goes into the static HTML; the rest is
+  // fetched from /api/episodes/[id]/transcript as the reader scrolls
+  const firstPage = getTranscriptChunks(params.id);
+  const transcript = firstPage ? undefined : getTranscript(params.id);
   const youtubeId = getYouTubeId(episode.youtube_url);
+  const related = getRelatedEpisodes(params.id);
 
   return (
     <div className="max-w-4xl mx-auto px-4 py-8">
@@ -98,6 +110,26 @@ export default async function EpisodePage(props: {
       )}
 
       {/* Transcript */}
+      {firstPage && (
+        <div className="mb-8">
+          <div className="flex items-center justify-between mb-4">
+            <h2 className="text-xl font-bold text-white">Full Transcript</h2>
+            {episode.transcript_word_count > 0 && (
+              <span className="text-sm text-[#6A5890]">
+                {formatNumber(episode.transcript_word_count)} words
+              </span>
+            )}
+          </div>
+          <div className="bg-[#1A0E2E] border border-[#2D1B4E] rounded-xl p-6 md:p-8">
+            <TranscriptChunks
+              episodeId={episode.id}
+              initialChunks={firstPage.chunks}
+              total={firstPage.total}
+              pageSize={TRANSCRIPT_PAGE_SIZE}
+            />
+          </div>
+        </div>
+      )}
       {transcript && (
         <div className="mb-8">
           <div className="flex items-center justify-between mb-4">
@@ -114,6 +146,27 @@ export default async function EpisodePage(props: {
         </div>
       )}
 
+      {/* Related Episodes */}
+      {related.length > 0 && (
+        <div className="mb-8">
+          <h2 className="text-xl font-bold text-white mb-4">Related Episodes</h2>
+          <div className="grid gap-3 sm:grid-cols-2">
+            {related.map(rel => (
+              <Link
+                key={rel.id}
+                href={`/episodes/${rel.id}`}
+                className="block p-4 bg-[#1A0E2E] border border-[#2D1B4E] rounded-xl hover:border-cyan-400 transition"
+              >
+                <p className="font-bold text-white leading-snug mb-1">{rel.title}</p>
+                <p className="text-xs text-[#6A5890]">
+                  {[formatDate(rel.published_at), formatDuration(rel.duration_seconds)].filter(Boolean).join(' · ')}
+                </p>
+              </Link>
+            ))}
+          </div>
+        </div>
+      )}
+
       {/* Listen on Spotify */}
       <div className="mb-8 p-5 bg-[#1A0E2E] border border-[#2D1B4E] rounded-xl">
         <h2 className="text-sm font-bold text-[#B8A9D4] uppercase tracking-wide mb-3">🎧 Listen on Spotify</h2>
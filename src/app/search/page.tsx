@@ -1,6 +1,23 @@
 import Link from 'next/link';
 import { searchEpisodes, SortOrder } from '@/lib/search';
-import { formatDate, formatDuration, highlightText } from '@/lib/utils';
+import { formatDate, formatDuration } from '@/lib/utils';
+
+// Snippets come back with matched terms wrapped in ||| markers
+function Snippet({ text }: { text: string }) {
+  return (
+    <>
+      {text.split('|||').map((part, i) =>
+        i % 2 === 1 ? (
+          <mark key={i} className="bg-cyan-400/30 text-pink-300 rounded px-0.5">
+            {part}
+          </mark>
+        ) : (
+          <span key={i}>{part}</span>
+        )
+      )}
+    </>
+  );
+}
 
 export default async function SearchPage(props: {
   searchParams: Promise<{ q?: string; sort?: string }>;
@@ -87,9 +104,6 @@ export default async function SearchPage(props: {
 
       <div className="space-y-4">
         {results.map(result => {
-          const highlighted = highlightText(result.snippet, query);
-          const parts = highlighted.split('|||');
-
           return (
             <Link key={result.id} href={`/episodes/${result.id}`}>
               <div className="group bg-[#1A0E2E] border border-[#2D1B4E] rounded-xl p-5 hover:border-cyan-400/50 transition-all cursor-pointer mb-4">
@@ -117,16 +131,13 @@ export default async function SearchPage(props: {
                   )}
                 </div>
                 <p className="text-sm text-[#B8A9D4] leading-relaxed">
-                  {parts.map((part, i) =>
-                    i % 2 === 1 ? (
-                      <mark key={i} className="bg-cyan-400/30 text-pink-300 rounded px-0.5">
-                        {part}
-                      </mark>
-                    ) : (
-                      <span key={i}>{part}</span>
-                    )
-                  )}
+                  <Snippet text={result.snippet} />
                 </p>
+                {result.hits.slice(1).map(hit => (
+                  <p key={hit.seq} className="text-sm text-[#8A7AAE] leading-relaxed mt-2 pl-3 border-l-2 border-[#2D1B4E]">
+                    <Snippet text={hit.snippet} />
+                  </p>
+                ))}
               </div>
             </Link>
           );
@@ -0,0 +1,76 @@
+'use client';
+
+import { useState } from 'react';
+import type { TranscriptChunk, TranscriptPage } from '@/lib/db';
+import { formatDuration } from '@/lib/utils';
+
+export default function TranscriptChunks({
+  episodeId,
+  initialChunks,
+  total,
+  pageSize,
+}: {
+  episodeId: string;
+  initialChunks: TranscriptChunk[];
+  total: number;
+  pageSize: number;
+}) {
+  const [chunks, setChunks] = useState(initialChunks);
+  const [loading, setLoading] = useState(false);
+  const [error, setError] = useState(false);
+
+  const hasMore = chunks.length < total;
+
+  const loadMore = async () => {
+    if (loading || !hasMore) return;
+    setLoading(true);
+    setError(false);
+    try {
+      const res = await fetch(
+        `/api/episodes/${encodeURIComponent(episodeId)}/transcript?from=${chunks.length}&count=${pageSize}`
+      );
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
+      const page = (await res.json()) as TranscriptPage;
+      setChunks(prev => [...prev, ...page.chunks.filter(c => c.seq >= prev.length)]);
+    } catch {
+      setError(true);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Fetch the next page as the reader nears the bottom of the scroll box
+  const handleScroll = (e: React.UIEvent<HTMLDivElement>) => {
+    const el = e.currentTarget;
+    if (el.scrollHeight - el.scrollTop - el.clientHeight < 400) {
+      loadMore();
+    }
+  };
+
+  return (
+    <div
+      onScroll={handleScroll}
+      className="text-[#D4C4F0] leading-relaxed whitespace-pre-wrap text-sm md:text-base max-h-[600px] overflow-y-auto pr-2"
+    >
+      {chunks.map(chunk => (
+        <p key={chunk.seq} className="mb-3">
+          {chunk.start_seconds !== null && (
+            <span className="text-xs text-[#6A5890] font-mono mr-2">
+              {formatDuration(chunk.start_seconds) || '0:00'}
+            </span>
+          )}
+          {chunk.text}
+        </p>
+      ))}
+      {hasMore && (
+        <button
+          onClick={loadMore}
+          disabled={loading}
+          className="w-full text-sm py-2 rounded-lg bg-[#1E1335] text-[#B8A9D4] hover:text-cyan-300 border border-[#3D2663] hover:border-cyan-400/30 transition disabled:opacity-50"
+        >
+          {loading ? 'Loading…' : error ? 'Couldn’t load more — try again' : `Load more (${chunks.length}/${total})`}
+        </button>
+      )}
+    </div>
+  );
+}
@@ -11,6 +11,18 @@ export function getDb(): Database.Database {
   return db;
 }
 
+const tables = new Map<string, boolean>();
+
+// Optional tables only exist once the matching scripts/ step has run
+export function hasTable(name: string): boolean {
+  let exists = tables.get(name);
+  if (exists === undefined) {
+    exists = getDb().prepare('SELECT 1 FROM sqlite_master WHERE name = ?').get(name) !== undefined;
+    tables.set(name, exists);
+  }
+  return exists;
+}
+
 // Types
 export interface Episode {
   id: string;
@@ -33,6 +45,35 @@ export interface Transcript {
   word_count: number;
 }
 
+export interface TranscriptChunk {
+  seq: number;
+  char_offset: number;
+  start_seconds: number | null;
+  text: string;
+}
+
+export interface TranscriptPage {
+  episode_id: string;
+  total: number;
+  from: number;
+  chunks: TranscriptChunk[];
+}
+
+export interface RelatedEpisode {
+  id: string;
+  title: string;
+  published_at: string | null;
+  duration_seconds: number | null;
+  // Cosine similarity of the two transcripts' TF-IDF vectors, 0-1
+  score: number;
+}
+
+export interface SearchHit {
+  seq: number;
+  char_offset: number;
+  snippet: string;
+}
+
 export interface SearchResult {
   id: string;
   title: string;
@@ -40,7 +81,10 @@ export interface SearchResult {
   duration_seconds: number | null;
   youtube_url: string | null;
   transcript_word_count: number;
+  // Matched terms are wrapped in ||| markers
   snippet: string;
+  // Further matches within the episode (segment search only)
+  hits: SearchHit[];
 }
 
 export interface Highlight {
@@ -52,3 +96,19 @@ export interface Highlight {
   tags: string[];
   timestamp_seconds?: number;
 }
+
+export interface TrendPoint {
+  // 'YYYY-MM' for months, 'YYYY' for seasons
+  period: string;
+  count: number;
+  episodes: number;
+}
+
+export interface Trend {
+  query: string;
+  // Player/team mentions (scripts/index_entities.py) or a single word (scripts/index_terms.py)
+  kind: 'entity' | 'term';
+  name: string;
+  months: TrendPoint[];
+  seasons: TrendPoint[];
+}
@@ -1,4 +1,8 @@
-import { getDb, Episode, Transcript } from './db';
+import { inflateSync } from 'zlib';
+import { getDb, hasTable, Episode, RelatedEpisode, Transcript, TranscriptChunk, TranscriptPage } from './db';
+
+// Transcript segments per page of the episode transcript
+export const TRANSCRIPT_PAGE_SIZE = 12;
 
 export function getAllEpisodes(): Episode[] {
   const db = getDb();
@@ -22,13 +26,92 @@ export function getEpisodeById(id: string): Episode | undefined {
   `).get(id) as Episode | undefined;
 }
 
+// Preset dictionaries for compressed transcripts, by transcript_dicts.id
+const dictionaries = new Map<number, Buffer>();
+
+function getDictionary(dictId: number): Buffer {
+  let dictionary = dictionaries.get(dictId);
+  if (!dictionary) {
+    const row = getDb().prepare('SELECT dict FROM transcript_dicts WHERE id = ?').get(dictId) as { dict: Buffer };
+    dictionary = row.dict;
+    dictionaries.set(dictId, dictionary);
+  }
+  return dictionary;
+}
+
+let hasCodec: boolean | null = null;
+
+// Only databases run through scripts/compress_transcripts.py have codec/dict_id
+function transcriptsHaveCodec(): boolean {
+  if (hasCodec === null) {
+    const columns = getDb().prepare('PRAGMA table_info(transcripts)').all() as { name: string }[];
+    hasCodec = columns.some(column => column.name === 'codec');
+  }
+  return hasCodec;
+}
+
 export function getTranscript(episodeId: string): Transcript | undefined {
   const db = getDb();
-  return db.prepare(`
-    SELECT episode_id, content, word_count
+  if (!transcriptsHaveCodec()) {
+    return db.prepare(`
+      SELECT episode_id, content, word_count
+      FROM transcripts
+      WHERE episode_id = ?
+    `).get(episodeId) as Transcript | undefined;
+  }
+
+  const row = db.prepare(`
+    SELECT episode_id, content, word_count, codec, dict_id
     FROM transcripts
     WHERE episode_id = ?
-  `).get(episodeId) as Transcript | undefined;
+  `).get(episodeId) as
+    | { episode_id: string; content: string | Buffer; word_count: number; codec: string | null; dict_id: number | null }
+    | undefined;
+  if (!row) return undefined;
+
+  let content = row.content as string;
+  if (row.codec === 'zlib') {
+    const options = row.dict_id !== null ? { dictionary: getDictionary(row.dict_id) } : {};
+    content = inflateSync(row.content as Buffer, options).toString('utf8');
+  }
+  return { episode_id: row.episode_id, content, word_count: row.word_count };
+}
+
+// Reads a range of transcript_segments, so no full transcript is loaded;
+// undefined when the database has no segments for the episode
+export function getTranscriptChunks(
+  episodeId: string,
+  from: number = 0,
+  count: number = TRANSCRIPT_PAGE_SIZE
+): TranscriptPage | undefined {
+  if (!hasTable('transcript_segments')) return undefined;
+  const db = getDb();
+  const { total } = db.prepare(
+    'SELECT COUNT(*) as total FROM transcript_segments WHERE episode_id = ?'
+  ).get(episodeId) as { total: number };
+  if (total === 0) return undefined;
+
+  const chunks = db.prepare(`
+    SELECT seq, char_offset, start_seconds, text
+    FROM transcript_segments
+    WHERE episode_id = ? AND seq >= ?
+    ORDER BY seq
+    LIMIT ?
+  `).all(episodeId, from, count) as TranscriptChunk[];
+  return { episode_id: episodeId, total, from, chunks };
+}
+
+// Precomputed by scripts/related_episodes.py; empty until that has run
+export function getRelatedEpisodes(episodeId: string, limit: number = 6): RelatedEpisode[] {
+  if (!hasTable('related_episodes')) return [];
+  return getDb().prepare(`
+    SELECT e.id, e.title, e.published_at, e.duration_seconds, r.score
+    FROM related_episodes r
+    JOIN episodes e ON e.id = r.related_id
+    WHERE r.episode_id = ?
+    ORDER BY r.rank
+    LIMIT ?
+  `).all(episodeId, limit) as RelatedEpisode[];
 }
 
 export function getRecentEpisodes(limit: number = 8): Episode[] {
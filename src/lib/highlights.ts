@@ -1,7 +1,7 @@
-import { Highlight } from './db';
+import { getDb, hasTable, Highlight } from './db';
 
-// Sample highlights for the "Best Of" page
-// These will be replaced with AI-curated content later
+// Sample highlights for the "Best Of" page, shown until
+// scripts/mine_highlights.py has filled the highlights table
 const SAMPLE_HIGHLIGHTS: Highlight[] = [
   {
     id: '1',
@@ -56,10 +56,67 @@ const SAMPLE_HIGHLIGHTS: Highlight[] = [
 const HOSTS = ['Dave', 'Davis', 'Pete', 'Dan'];
 const ALL_TAGS = [...new Set(SAMPLE_HIGHLIGHTS.flatMap(h => h.tags))].sort();
 
+// Shown, and filtered on, as the host of quotes nobody could be credited
+// with (no host label nearby); stored as a NULL host
+const UNATTRIBUTED = 'Swolecast';
+
+const BEST_OF_LIMIT = 60;
+
+interface HighlightRow {
+  id: string;
+  quote: string;
+  episode_id: string;
+  episode_title: string;
+  host: string | null;
+  tags: string | null;
+  timestamp_seconds: number | null;
+}
+
+function minedHighlights(where: string[], params: (string | number)[], limit: number): Highlight[] {
+  const rows = getDb().prepare(`
+    SELECT CAST(h.id AS TEXT) AS id, h.quote, h.episode_id, e.title AS episode_title,
+           h.host, h.timestamp_seconds,
+           (SELECT group_concat(tag) FROM highlight_tags WHERE highlight_id = h.id) AS tags
+    FROM highlights h
+    JOIN episodes e ON e.id = h.episode_id
+    ${where.length ? `WHERE ${where.join(' AND ')}` : ''}
+    ORDER BY h.score DESC
+    LIMIT ?
+  `).all(...params, limit) as HighlightRow[];
+  return rows.map(row => ({
+    id: row.id,
+    quote: row.quote,
+    episode_id: row.episode_id,
+    episode_title: row.episode_title,
+    host: row.host || UNATTRIBUTED,
+    tags: row.tags ? row.tags.split(',').sort() : [],
+    timestamp_seconds: row.timestamp_seconds ?? undefined,
+  }));
+}
+
 export function getHighlights(options?: {
   host?: string;
   tag?: string;
 }): Highlight[] {
+  if (hasTable('highlights')) {
+    const where: string[] = [];
+    const params: string[] = [];
+    if (options?.host) {
+      // idx_highlights_host is (host, score DESC), already in page order
+      if (options.host === UNATTRIBUTED) {
+        where.push('h.host IS NULL');
+      } else {
+        where.push('h.host = ?');
+        params.push(options.host);
+      }
+    }
+    if (options?.tag) {
+      where.push('h.id IN (SELECT highlight_id FROM highlight_tags WHERE tag = ?)');
+      params.push(options.tag);
+    }
+    return minedHighlights(where, params, BEST_OF_LIMIT);
+  }
+
   let results = [...SAMPLE_HIGHLIGHTS];
 
   if (options?.host) {
@@ -74,13 +131,29 @@ export function getHighlights(options?: {
 }
 
 export function getHosts(): string[] {
+  if (hasTable('highlights')) {
+    const db = getDb();
+    const rows = db.prepare(
+      'SELECT DISTINCT host FROM highlights WHERE host IS NOT NULL ORDER BY host'
+    ).all() as { host: string }[];
+    const hosts = rows.map(row => row.host);
+    if (db.prepare('SELECT 1 FROM highlights WHERE host IS NULL LIMIT 1').get()) {
+      hosts.push(UNATTRIBUTED);
+    }
+    return hosts;
+  }
   return HOSTS;
 }
 
 export function getAllTags(): string[] {
+  if (hasTable('highlights')) {
+    const rows = getDb().prepare('SELECT DISTINCT tag FROM highlight_tags ORDER BY tag').all() as { tag: string }[];
+    return rows.map(row => row.tag);
+  }
   return ALL_TAGS;
 }
 
 export function getFeaturedHighlights(limit: number = 3): Highlight[] {
+  if (hasTable('highlights')) return minedHighlights([], [], limit);
   return SAMPLE_HIGHLIGHTS.slice(0, limit);
 }
@@ -1,4 +1,8 @@
-import { getDb, SearchResult } from './db';
+import { getDb, hasTable, SearchHit, SearchResult } from './db';
+import { highlightText } from './utils';
+
+// Matches shown per episode when searching transcript segments
+const HITS_PER_EPISODE = 3;
 
 function extractSnippet(content: string, query: string, contextChars: number = 150): string {
   const lowerContent = content.toLowerCase();
@@ -31,20 +35,101 @@ function extractSnippet(content: string, query: string, contextChars: number = 1
 
 export type SortOrder = 'relevance' | 'newest' | 'oldest';
 
-export function searchEpisodes(query: string, limit: number = 20, sort: SortOrder = 'relevance'): SearchResult[] {
-  if (!query || query.trim().length === 0) return [];
+type EpisodeRow = Omit<SearchResult, 'snippet' | 'hits'>;
 
+function searchSegments(ftsQuery: string, limit: number, sort: SortOrder): SearchResult[] {
   const db = getDb();
 
-  // FTS5 query - escape special characters and build search terms
-  const cleanQuery = query
-    .replace(/[^\w\s]/g, ' ')
-    .trim()
-    .split(/\s+/)
-    .filter(t => t.length > 0)
-    .join(' OR ');
+  let orderBy = 'ORDER BY best.rank';
+  if (sort === 'newest') {
+    orderBy = 'ORDER BY e.published_at DESC';
+  } else if (sort === 'oldest') {
+    orderBy = 'ORDER BY e.published_at ASC';
+  }
 
-  if (!cleanQuery) return [];
+  // Episodes ranked by their best-matching segment (MIN picks that row's rowid)
+  const episodes = db.prepare(`
+    WITH best AS (
+      SELECT s.episode_id, fts.rowid AS best_rowid, MIN(fts.rank) AS rank
+      FROM segments_fts fts
+      JOIN transcript_segments s ON s.rowid = fts.rowid
+      WHERE segments_fts MATCH ?
+      GROUP BY s.episode_id
+    )
+    SELECT
+      e.id,
+      e.title,
+      e.published_at,
+      e.duration_seconds,
+      e.youtube_url,
+      e.transcript_word_count,
+      best.best_rowid
+    FROM best
+    JOIN episodes e ON e.id = best.episode_id
+    ${orderBy}
+    LIMIT ?
+  `).all(ftsQuery, limit) as (EpisodeRow & { best_rowid: number })[];
+
+  if (episodes.length === 0) return [];
+
+  // Best segment first, then the earliest other matches in each episode
+  const ids = episodes.map(e => e.id);
+  const more = db.prepare(`
+    SELECT rowid FROM (
+      SELECT fts.rowid, ROW_NUMBER() OVER (PARTITION BY s.episode_id ORDER BY s.seq) AS n
+      FROM segments_fts fts
+      JOIN transcript_segments s ON s.rowid = fts.rowid
+      WHERE segments_fts MATCH ? AND s.episode_id IN (${ids.map(() => '?').join(', ')})
+    )
+    WHERE n <= ?
+  `).pluck().all(ftsQuery, ...ids, HITS_PER_EPISODE) as number[];
+
+  const best = new Set(episodes.map(e => e.best_rowid));
+  const rowids = [...best, ...more.filter(rowid => !best.has(rowid))];
+
+  // snippet() only runs for the handful of segments actually shown
+  const hitRows = db.prepare(`
+    SELECT
+      segments_fts.rowid,
+      s.episode_id,
+      s.seq,
+      s.char_offset,
+      snippet(segments_fts, 0, '|||', '|||', '...', 32) AS snippet
+    FROM segments_fts
+    JOIN transcript_segments s ON s.rowid = segments_fts.rowid
+    WHERE segments_fts MATCH ? AND segments_fts.rowid IN (${rowids.map(() => '?').join(', ')})
+    ORDER BY s.seq
+  `).all(ftsQuery, ...rowids) as (SearchHit & { rowid: number; episode_id: string })[];
+
+  const hitsByEpisode = new Map<string, SearchHit[]>();
+  for (const row of hitRows) {
+    const hit = { seq: row.seq, char_offset: row.char_offset, snippet: row.snippet };
+    const hits = hitsByEpisode.get(row.episode_id) || [];
+    if (best.has(row.rowid)) {
+      hits.unshift(hit);
+    } else {
+      hits.push(hit);
+    }
+    hitsByEpisode.set(row.episode_id, hits);
+  }
+
+  return episodes.map(row => {
+    const hits = (hitsByEpisode.get(row.id) || []).slice(0, HITS_PER_EPISODE);
+    return {
+      id: row.id,
+      title: row.title,
+      published_at: row.published_at,
+      duration_seconds: row.duration_seconds,
+      youtube_url: row.youtube_url,
+      transcript_word_count: row.transcript_word_count,
+      snippet: hits.length > 0 ? hits[0].snippet : '',
+      hits,
+    };
+  });
+}
+
+function searchTranscripts(ftsQuery: string, query: string, limit: number, sort: SortOrder): SearchResult[] {
+  const db = getDb();
 
   // Determine sort order
   let orderBy = 'ORDER BY rank';
@@ -54,33 +139,57 @@ export function searchEpisodes(query: string, limit: number = 20, sort: SortOrde
     orderBy = 'ORDER BY e.published_at ASC';
   }
 
-  try {
-    const rows = db.prepare(`
-      SELECT
-        e.id,
-        e.title,
-        e.published_at,
-        e.duration_seconds,
-        e.youtube_url,
-        e.transcript_word_count,
-        t.content
-      FROM transcripts_fts fts
-      JOIN transcripts t ON t.episode_id = fts.episode_id
-      JOIN episodes e ON e.id = fts.episode_id
-      WHERE transcripts_fts MATCH ?
-      ${orderBy}
-      LIMIT ?
-    `).all(cleanQuery, limit) as (SearchResult & { content: string })[];
-
-    return rows.map(row => ({
+  const rows = db.prepare(`
+    SELECT
+      e.id,
+      e.title,
+      e.published_at,
+      e.duration_seconds,
+      e.youtube_url,
+      e.transcript_word_count,
+      t.content
+    FROM transcripts_fts fts
+    JOIN transcripts t ON t.episode_id = fts.episode_id
+    JOIN episodes e ON e.id = fts.episode_id
+    WHERE transcripts_fts MATCH ?
+    ${orderBy}
+    LIMIT ?
+  `).all(ftsQuery, limit) as (SearchResult & { content: string })[];
+
+  return rows.map(row => {
+    const snippet = highlightText(extractSnippet(row.content, query), query);
+    return {
       id: row.id,
       title: row.title,
       published_at: row.published_at,
       duration_seconds: row.duration_seconds,
       youtube_url: row.youtube_url,
       transcript_word_count: row.transcript_word_count,
-      snippet: extractSnippet(row.content, query),
-    }));
+      snippet,
+      hits: [],
+    };
+  });
+}
+
+export function searchEpisodes(query: string, limit: number = 20, sort: SortOrder = 'relevance'): SearchResult[] {
+  if (!query || query.trim().length === 0) return [];
+
+  // FTS5 query - escape special characters and build search terms
+  const cleanQuery = query
+    .replace(/[^\w\s]/g, ' ')
+    .trim()
+    .split(/\s+/)
+    .filter(t => t.length > 0)
+    .join(' OR ');
+
+  if (!cleanQuery) return [];
+
+  try {
+    // Databases built before scripts/backfill_segments.py only have transcripts_fts
+    if (hasTable('segments_fts')) {
+      return searchSegments(cleanQuery, limit, sort);
+    }
+    return searchTranscripts(cleanQuery, query, limit, sort);
   } catch {
     // FTS query parse errors - return empty
     return [];
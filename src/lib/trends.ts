@@ -0,0 +1,73 @@
+import { getDb, hasTable, Trend, TrendPoint } from './db';
+
+// Same normalization as scripts/entities.py and scripts/term_counts.py
+function normalize(query: string): string {
+  return (query.toLowerCase().match(/[a-z0-9]+/g) || []).join(' ');
+}
+
+// Seasons run from the new league year in March through the Super Bowl
+function seasonOf(month: string): string {
+  const year = parseInt(month.slice(0, 4));
+  return String(parseInt(month.slice(5, 7)) >= 3 ? year : year - 1);
+}
+
+function bySeason(months: TrendPoint[]): TrendPoint[] {
+  const seasons = new Map<string, TrendPoint>();
+  for (const point of months) {
+    const period = seasonOf(point.period);
+    const season = seasons.get(period) || { period, count: 0, episodes: 0 };
+    season.count += point.count;
+    season.episodes += point.episodes;
+    seasons.set(period, season);
+  }
+  return [...seasons.values()];
+}
+
+function entityTrend(alias: string): { name: string; months: TrendPoint[] } | null {
+  const db = getDb();
+  const entity = db.prepare(`
+    SELECT e.id, e.name FROM entity_aliases a
+    JOIN entities e ON e.id = a.entity_id
+    WHERE a.alias = ?
+  `).get(alias) as { id: number; name: string } | undefined;
+  if (!entity) return null;
+
+  const months = db.prepare(`
+    SELECT substr(e.published_at, 1, 7) AS period,
+           COUNT(*) AS count, COUNT(DISTINCT m.episode_id) AS episodes
+    FROM entity_mentions m
+    JOIN episodes e ON e.id = m.episode_id
+    WHERE m.entity_id = ? AND e.published_at GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]*'
+    GROUP BY period
+    ORDER BY period
+  `).all(entity.id) as TrendPoint[];
+  return { name: entity.name, months };
+}
+
+function termTrend(term: string): TrendPoint[] {
+  return getDb().prepare(`
+    SELECT m.month AS period, m.count, m.episodes
+    FROM term_months m
+    JOIN terms t ON t.id = m.term_id
+    WHERE t.term = ?
+    ORDER BY m.month
+  `).all(term) as TrendPoint[];
+}
+
+// Mentions per month and per season of a player/team (any alias) or a single
+// word; null when the query is neither or the index hasn't been built
+export function getTrend(query: string): Trend | null {
+  const normalized = normalize(query);
+  if (!normalized) return null;
+
+  if (hasTable('entity_mentions')) {
+    const entity = entityTrend(normalized);
+    if (entity) {
+      return { query, kind: 'entity', ...entity, seasons: bySeason(entity.months) };
+    }
+  }
+
+  if (!hasTable('term_months') || normalized.includes(' ')) return null;
+  const months = termTrend(normalized);
+  return { query, kind: 'term', name: normalized, months, seasons: bySeason(months) };
+}
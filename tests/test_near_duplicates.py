@@ -0,0 +1,47 @@
+"""Regression tests for scripts/near_duplicates.py."""
+
+import sqlite3
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import near_duplicates
+
+
+def archive(transcripts: dict) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    conn.executescript("""
+        CREATE TABLE episodes (id TEXT PRIMARY KEY, title TEXT);
+        CREATE TABLE transcripts (episode_id TEXT PRIMARY KEY, content TEXT, word_count INTEGER);
+    """)
+    for episode_id, content in transcripts.items():
+        conn.execute("INSERT INTO episodes (id, title) VALUES (?, ?)", (episode_id, episode_id))
+        conn.execute("INSERT INTO transcripts (episode_id, content, word_count) VALUES (?, ?, ?)",
+                     (episode_id, content, len(content.split())))
+    conn.executescript(near_duplicates.SCHEMA)
+    return conn
+
+
+@unittest.skipIf(near_duplicates.np is None, "needs numpy")
+class FindDuplicatesTest(unittest.TestCase):
+    def test_placeholder_transcripts_are_not_duplicates(self):
+        conn = archive({
+            "vid0": "[Music]",
+            "vid1": "[Music]",
+            "vid2": "[Music] [Applause]",
+            "vid3": "[Music] [Applause]",
+        })
+        rows, report = near_duplicates.find_duplicates(conn)
+        self.assertEqual(rows, [])
+        self.assertEqual(report, [])
+
+    def test_long_copies_are_still_duplicates(self):
+        text = " ".join(f"word{i}" for i in range(200))
+        conn = archive({"vid0": text, "podcast-1": text, "vid1": "[Music]", "vid2": "[Music]"})
+        rows, _ = near_duplicates.find_duplicates(conn)
+        self.assertEqual([(row[0], row[1]) for row in rows], [("vid0", "podcast-1")])
+
+
+if __name__ == "__main__":
+    unittest.main()